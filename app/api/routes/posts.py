@@ -6,21 +6,43 @@ CRUD Endpoints für Posts mit Relationships zu Users.
 
 import datetime
 import math
-from enum import StrEnum, Enum
-from time import perf_counter
+from enum import StrEnum
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func
-from sqlalchemy.orm import selectinload, joinedload
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, or_, update
+from sqlalchemy.orm.exc import StaleDataError
 from sqlmodel import Session, select, asc, desc
 
-from app.database import get_session
-from app.models import Post, PostCreate, PostRead, PostReadWithAuthor, PostUpdate, User
-from app.models.post import PaginatedPostResponse
+from app.core.bulk import BULK_CHUNK_SIZE, BULK_MAX_ITEMS, BulkBody, BulkPayload, chunked, insert_returning_ids
+from app.core.cache import cached, response_cache
+from app.core.etag import check_if_match, none_match, not_modified, post_etag
+from app.core.export import EXPORT_RESPONSES, ExportFormatEnum, export_response, stream_export
+from app.core.loading import LoadingStrategyEnum, plan_loading
+from app.core.multiget import IDS_DESCRIPTION, check_ids, id_filter, in_requested_order, parse_ids, set_missing_header
+from app.core.pagination import PaginationModeEnum, paginate_keyset, set_cursor_headers
+from app.core.projection import FieldSet, json_response
+from app.core.search import render_hits, search_statement
+from app.core.serialization import POST_PAGE_WITH_AUTHORS_SERIALIZER, POST_WITH_AUTHOR_LIST_SERIALIZER
+from app.database import get_read_session, get_session, read_engine_for
+from app.models import BulkCreateResult, BulkItemError, IdsRequest, Post, PostCreate, PostRead, PostReadWithAuthor, PostUpdate, User
+from app.models.post import (
+    PaginatedPostResponse,
+    PostBatchResponse,
+    PostBulkUpdate,
+    PostBulkUpdateResult,
+    PostFilter,
+    PostPageWithAuthors,
+    PostSearchResponse,
+)
 
 router = APIRouter()
 
+# Felder für ?fields= in den Listen-Endpunkten
+POST_FIELDS = FieldSet(Post, PostRead)
+FIELDS_DESCRIPTION = "Komma-getrennte Felder, z.B. id,title,created_at (Default: alle)"
+
 
 class SortByEnum(StrEnum):
     created_at = "created_at"
@@ -33,10 +55,168 @@ class OrderEnum(StrEnum):
     desc = "desc"
 
 
-class LoadingStrategyEnum(str, Enum):
-    lazy = "lazy"
-    selectin = "selectin"
-    joined = "joined"
+class AuthorShapeEnum(StrEnum):
+    embedded = "embedded"
+    normalized = "normalized"
+
+
+def build_filter_statement(
+        base_statement,
+        published: bool | None,
+        user_id: int | None,
+        title: str | None
+):
+    """Wendet die Post-Filter (published, user_id, title) auf ein Statement an."""
+    if published is not None:
+        base_statement = base_statement.where(Post.published == published)
+    if user_id is not None:
+        base_statement = base_statement.where(Post.user_id == user_id)
+    if title is not None:
+        base_statement = base_statement.where(Post.title.ilike(f"%{title}%"))
+    return base_statement
+
+
+def bulk_update_values(request: PostBulkUpdate) -> dict:
+    """
+    Prüft einen ``PATCH /posts/bulk``-Request und liefert die zu setzenden Spalten.
+
+    Raises:
+        HTTPException 400: Nicht genau eins von ids/filter, leerer Filter oder leeres Update
+        HTTPException 413: Mehr als BULK_MAX_ITEMS IDs
+        HTTPException 422: ``null`` für eine Spalte, die nicht NULL sein darf
+    """
+    if (request.ids is None) == (request.filter is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Entweder ids oder filter angeben"
+        )
+    if request.filter is not None and not request.filter.model_dump(exclude_none=True):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="filter braucht mindestens ein Kriterium (sonst würden alle Posts geändert)"
+        )
+    if request.ids is not None and len(request.ids) > BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Maximal {BULK_MAX_ITEMS} IDs pro Request"
+        )
+    values = request.update.model_dump(exclude_unset=True)
+    if not values:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="update enthält keine Felder"
+        )
+    # Explizites null käme sonst erst als IntegrityError aus dem UPDATE
+    not_nullable = [
+        name for name, value in values.items()
+        if value is None and not Post.__table__.c[name].nullable
+    ]
+    if not_nullable:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"update: {', '.join(not_nullable)} darf nicht null sein"
+        )
+    return values
+
+
+def post_filter_criteria(post_filter: PostFilter):
+    """WHERE-Bedingung eines ``PostFilter`` (wie ``build_filter_statement``)."""
+    return build_filter_statement(select(Post.id), **post_filter.model_dump()).whereclause
+
+
+def bulk_update_statement(values: dict, *criteria):
+    """
+    ``UPDATE posts SET ..., version = version + 1 WHERE <criteria> AND
+    <ändert etwas> RETURNING id``.
+
+    Ein UPDATE per Kriterium zählt die Version nicht selbst hoch (nur der
+    Unit of Work tut das) - ohne ``version + 1`` blieben ETags und
+    Optimistic Locking auf dem alten Stand. Posts, die schon so in der
+    Datenbank stehen, werden nicht geschrieben.
+    """
+    return (
+        update(Post)
+        .where(*criteria, or_(*(getattr(Post, column).is_distinct_from(value) for column, value in values.items())))
+        .values(**values, version=Post.version + 1)
+        .returning(Post.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def bulk_filter_chunk(post_filter: PostFilter, after_id: int, size: int):
+    """Nächster Block IDs (nach ``after_id``), auf die der Filter passt."""
+    return (
+        select(Post.id)
+        .where(post_filter_criteria(post_filter), Post.id > after_id)
+        .order_by(Post.id)
+        .limit(size)
+    )
+
+
+def invalidate_posts(post_ids: list[int]):
+    """Response-Cache für geänderte Posts und alle Listen invalidieren."""
+    if post_ids:
+        response_cache.invalidate("posts", *(f"post:{post_id}" for post_id in post_ids))
+
+
+def build_export_statement(
+        fields: list[str],
+        published: bool | None,
+        user_id: int | None,
+        title: str | None,
+        sort_by: SortByEnum,
+        order: OrderEnum
+):
+    """Export-Abfrage: gewählte Spalten, Post-Filter, stabile Sortierung (``sort_by``, id)."""
+    statement = build_filter_statement(POST_FIELDS.select(fields), published, user_id, title)
+    direction = asc if order == OrderEnum.asc else desc
+    return statement.order_by(direction(getattr(Post, sort_by)), direction(Post.id))
+
+
+def authors_page(posts: list[Post], *, page_size: int, next_cursor: str | None, prev_cursor: str | None) -> Response:
+    """``PostPageWithAuthors`` als JSON: jeder Author nur einmal, Posts verweisen per ``user_id``."""
+    return Response(
+        content=POST_PAGE_WITH_AUTHORS_SERIALIZER.dump({
+            "items": posts,
+            "authors": {str(post.author.id): post.author for post in posts},
+            "page_size": page_size,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
+        }),
+        media_type="application/json"
+    )
+
+
+def select_posts_by_ids(statement, ids: list[int], dialect_name: str):
+    """Schränkt ein Projektions-Statement (mit ``id``) auf ``ids`` ein."""
+    return statement.where(id_filter(Post.id, ids, dialect_name))
+
+
+def fetch_posts_by_ids(session: Session, statement, ids: list[int]) -> tuple[list, list[int]]:
+    """Rows zu ``ids`` in angefragter Reihenfolge plus fehlende IDs."""
+    rows = session.exec(select_posts_by_ids(statement, ids, session.get_bind().dialect.name)).all()
+    return in_requested_order(rows, ids)
+
+
+def paginated_response(
+        items: list[dict],
+        *,
+        page_size: int,
+        total: int | None = None,
+        page: int | None = None,
+        next_cursor: str | None = None,
+        prev_cursor: str | None = None
+) -> Response:
+    """``PaginatedPostResponse`` als JSON, mit bereits projizierten Items."""
+    return json_response({
+        "items": items,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": math.ceil(total / page_size) if total is not None else None,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+    })
 
 
 @router.post(
@@ -77,75 +257,208 @@ def create_post(
     session.add(db_post)
     session.commit()
     session.refresh(db_post)
+    response_cache.invalidate("posts")
     
     return db_post
 
 
+@router.post(
+    "/bulk",
+    response_model=BulkCreateResult,
+    status_code=status.HTTP_201_CREATED,
+    summary="Viele Posts erstellen",
+    description="Erstellt viele Posts auf einmal aus einem JSON-Array oder NDJSON-Stream.",
+    openapi_extra=BulkBody.openapi(PostCreate)
+)
+def create_posts_bulk(
+    payload: Annotated[BulkPayload, Depends(BulkBody(PostCreate))],
+    session: Annotated[Session, Depends(get_session)]
+):
+    """
+    Erstellt viele Posts mit wenigen Round Trips (z.B. für nächtliche Importe).
+    
+    Pro Block von Einträgen: eine Query prüft alle Autoren auf einmal,
+    ein mehrzeiliges ``INSERT ... RETURNING id`` legt die Posts an,
+    danach ein COMMIT.
+    
+    Returns:
+        BulkCreateResult: Anzahl, neue IDs und Fehler pro Eintrag
+        (ungültige Einträge oder nicht existierende Autoren)
+    """
+    errors = list(payload.errors)
+    ids = []
+    now = datetime.datetime.now(datetime.UTC)
+    
+    for chunk in chunked(payload.items):
+        # Eine Query für alle Autoren des Blocks
+        author_ids = {post.user_id for _, post in chunk}
+        existing_authors = set(session.exec(select(User.id).where(User.id.in_(author_ids))).all())
+        
+        rows = []
+        for index, post in chunk:
+            if post.user_id in existing_authors:
+                rows.append({**post.model_dump(), "created_at": now})
+            else:
+                errors.append(BulkItemError(index=index, detail=f"User mit ID {post.user_id} nicht gefunden"))
+        if not rows:
+            continue
+        
+        new_ids = insert_returning_ids(session, Post, rows)
+        session.commit()
+        ids.extend(new_ids)
+    
+    if ids:
+        response_cache.invalidate("posts")
+    
+    errors.sort(key=lambda error: error.index)
+    return BulkCreateResult(created=len(ids), ids=ids, errors=errors)
+
+
 @router.get(
     "/",
     response_model=list[PostRead],
     summary="Alle Posts abrufen",
     description="Gibt eine Liste aller Posts zurück mit Pagination."
 )
+@cached(list[PostRead], tags=lambda params, posts: ["posts"])
 def get_posts(
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     skip: int = Query(default=0, ge=0, description="Anzahl zu überspringender Posts"),
-    limit: int = Query(default=20, ge=1, le=100, description="Max. Anzahl zurückzugebender Posts")
+    limit: int = Query(default=20, ge=1, le=100, description="Max. Anzahl zurückzugebender Posts"),
+    cursor: str | None = Query(default=None, description="Cursor aus X-Next-Cursor/X-Prev-Cursor (ersetzt skip)"),
+    pagination: PaginationModeEnum = Query(default=PaginationModeEnum.offset, description="Pagination-Modus"),
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION),
+    ids: str | None = Query(default=None, description=IDS_DESCRIPTION)
 ):
     """
-    Gibt eine Liste aller Posts zurück.
+    Gibt eine Liste aller Posts zurück (sortiert nach ID).
     
     Parameters:
         - **skip**: Anzahl zu überspringender Posts (für Pagination)
         - **limit**: Maximale Anzahl zurückzugebender Posts (1-100)
+        - **cursor**: Cursor für Keyset-Pagination (aktiviert den Cursor-Modus)
+        - **pagination**: offset oder cursor
+        - **fields**: Nur diese Felder laden und zurückgeben (z.B. ohne ``content``)
+        - **ids**: Nur diese Posts, in dieser Reihenfolge (ohne Pagination)
+    
+    Im Cursor-Modus stehen die Cursor für die Nachbarseiten in den
+    Response-Headern ``X-Next-Cursor`` und ``X-Prev-Cursor``. Mit ``ids``
+    stehen nicht gefundene IDs im Header ``X-Missing-Ids``.
+    
+    Gelesen werden nur die Spalten der Felder, als Rows ohne ORM-Objekte
+    (siehe ``app/core/projection.py``).
+    
+    Returns:
+        list[PostRead]: Liste von Posts (bzw. die gewählten Felder)
+    """
+    selected = POST_FIELDS.parse(fields)
+    statement = POST_FIELDS.select(selected, "id")
+
+    if ids is not None:
+        rows, missing = fetch_posts_by_ids(session, statement, parse_ids(ids))
+        result = json_response(POST_FIELDS.rows(rows, selected))
+        set_missing_header(result, missing)
+        return result
+
+    if cursor is not None or pagination == PaginationModeEnum.cursor:
+        page = paginate_keyset(
+            session,
+            statement,
+            sort_column=Post.id,
+            id_column=Post.id,
+            descending=False,
+            limit=limit,
+            cursor=cursor
+        )
+        result = json_response(POST_FIELDS.rows(page.items, selected))
+        set_cursor_headers(result, page)
+        return result
+
+    rows = session.exec(statement.order_by(Post.id).offset(skip).limit(limit)).all()
+    return json_response(POST_FIELDS.rows(rows, selected))
+
+
+@router.post(
+    "/batch",
+    response_model=PostBatchResponse,
+    summary="Posts zu einer ID-Liste abrufen",
+    description="Lädt alle angefragten Posts mit einer Query, in angefragter Reihenfolge, und meldet fehlende IDs."
+)
+def get_posts_batch(
+    request: IdsRequest,
+    session: Session = Depends(get_read_session),
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION)
+):
+    """
+    Wie ``GET /posts?ids=...``, aber mit den IDs im Body - für lange Listen.
     
     Returns:
-        list[PostRead]: Liste von Posts
+        PostBatchResponse: Gefundene Posts (bzw. die gewählten Felder) und fehlende IDs
     """
-    statement = select(Post).offset(skip).limit(limit)
-    posts = session.exec(statement).all()
-    return posts
+    selected = POST_FIELDS.parse(fields)
+    rows, missing = fetch_posts_by_ids(session, POST_FIELDS.select(selected, "id"), check_ids(request.ids))
+    return json_response({"items": POST_FIELDS.rows(rows, selected), "missing": missing})
 
 
 @router.get(
     "/with-authors",
-    response_model=list[PostReadWithAuthor],
+    response_model=list[PostReadWithAuthor] | PostPageWithAuthors,
     summary="Posts mit Authors abrufen",
-    description="Gibt eine Liste aller Posts zurück mit vollständigen Author-Informationen."
+    description="Gibt eine Seite Posts mit Author-Informationen zurück (Cursor-Pagination)."
 )
 def get_posts_with_authors(
-        session: Session = Depends(get_session),
-        strategy: LoadingStrategyEnum = Query(default=LoadingStrategyEnum.selectin,
-                                              description="Laden-Strategie für Relationships")
+        response: Response,
+        session: Session = Depends(get_read_session),
+        strategy: LoadingStrategyEnum = Query(default=LoadingStrategyEnum.auto,
+                                              description="Laden-Strategie für Relationships (auto = nach Seitengröße)"),
+        limit: int = Query(default=50, ge=1, le=500, description="Max. Anzahl Posts pro Seite"),
+        cursor: str | None = Query(default=None, description="Cursor der Nachbarseite"),
+        shape: AuthorShapeEnum = Query(default=AuthorShapeEnum.embedded,
+                                       description="embedded (Author in jedem Post) oder normalized (authors-Map)")
 ):
     """
-        Lädt alle Posts mit ihren Authors.
+        Lädt eine Seite Posts (sortiert nach ID) mit ihren Authors.
 
-        Unterstützt drei Loading-Strategien:
-        - lazy: Default Lazy Loading (N+1 Problem)
+        Unterstützt vier Loading-Strategien:
+        - auto: joined für kleine, selectin für große Seiten (``app/core/loading.py``)
+        - lazy: Laden beim ersten Zugriff (pro Request gebündelt, mit BATCH_LOADING=False N+1)
         - selectin: Optimiert mit selectinload() (2 Queries)
         - joined: Optimiert mit joinedload() (1 Query)
-    """
-
-    start = perf_counter()
 
-    statement = select(Post)
+        Antwortformen:
+        - embedded: Liste von ``PostReadWithAuthor``, Cursor in den Headern
+          ``X-Next-Cursor`` und ``X-Prev-Cursor``
+        - normalized: ``PostPageWithAuthors`` - jeder Author einmal in
+          ``authors``, Cursor im Body
 
-    if strategy == LoadingStrategyEnum.selectin:
-        statement = statement.options(selectinload(Post.author))
-    elif strategy == LoadingStrategyEnum.joined:
-        statement = statement.options(joinedload(Post.author))
+        Anzahl und Dauer der Queries stehen in den Response-Headern
+        ``X-DB-Queries`` und ``Server-Timing``.
+    """
 
-    posts = session.exec(statement).all()
+    plan = plan_loading(Post, PostReadWithAuthor, expected_rows=limit, strategy=strategy)
+    statement = select(Post).options(*plan.options)
+
+    page = paginate_keyset(
+        session,
+        statement,
+        sort_column=Post.id,
+        id_column=Post.id,
+        descending=False,
+        limit=limit,
+        cursor=cursor
+    )
 
-    for post in posts:
+    for post in page.items:
         _ = post.author
 
-    end = perf_counter()
+    if shape == AuthorShapeEnum.normalized:
+        result = authors_page(page.items, page_size=limit, next_cursor=page.next_cursor, prev_cursor=page.prev_cursor)
+        result.headers["X-Loading-Strategy"] = plan.header()
+        return result
 
-    print(f'Strategy: {strategy} - Dauer: {end - start:.4f} Sekunden, Posts: {len(posts)}')
-
-    return posts
+    set_cursor_headers(response, page)
+    response.headers["X-Loading-Strategy"] = plan.header()
+    return POST_WITH_AUTHOR_LIST_SERIALIZER.respond(page.items, headers=response.headers)
 
 
 @router.get(
@@ -154,15 +467,20 @@ def get_posts_with_authors(
     summary="Posts filtern",
     description="Gibt eine Liste von Posts zurück, die mehreren Filtern entsprechen."
 )
+@cached(PaginatedPostResponse, tags=lambda params, page: ["posts"])
 def filter_posts(
-        session: Session = Depends(get_session),
+        session: Session = Depends(get_read_session),
         published: bool | None = Query(default=None, description="Ist veröffentlicht?"),
         user_id: int | None = Query(default=None, description="User-ID"),
         title: str | None = Query(default=None, description="Titel enthält..."),
         sort_by: SortByEnum = Query(default=SortByEnum.created_at, description="Sortieren nach"),
         order: OrderEnum = Query(default=OrderEnum.desc, description="Sortierreihenfolge"),
         page: int = Query(default=1, ge=1, description="Seite (ab 1)"),
-        page_size: int = Query(default=10, ge=1, le=100, description="Anzahl Posts pro Seite")
+        page_size: int = Query(default=10, ge=1, le=100, description="Anzahl Posts pro Seite"),
+        cursor: str | None = Query(default=None, description="Cursor aus next_cursor/prev_cursor (ersetzt page)"),
+        pagination: PaginationModeEnum = Query(default=PaginationModeEnum.offset, description="Pagination-Modus"),
+        include_total: bool | None = Query(default=None, description="Gesamtanzahl zählen? (Default: nur im Offset-Modus)"),
+        fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION)
 ):
     """
     Filtert Posts anhand verschiedener Kriterien mit Pagination.
@@ -173,53 +491,164 @@ def filter_posts(
         - **title**: Titel enthält diesen String (case-insensitive)
         - **sort_by**: Sortierfeld (created_at, title, id)
         - **order**: Sortierreihenfolge (asc, desc)
-        - **page**: Seitennummer (ab 1)
+        - **page**: Seitennummer (ab 1, nur Offset-Modus)
         - **page_size**: Anzahl Posts pro Seite (1-100)
+        - **cursor**: Cursor für Keyset-Pagination (aktiviert den Cursor-Modus)
+        - **pagination**: offset (page-basiert) oder cursor (Keyset)
+        - **include_total**: Gesamtanzahl per COUNT ermitteln
+        - **fields**: Nur diese Felder der Items laden und zurückgeben
+
+    Im Cursor-Modus wird nach ``sort_by`` plus ``Post.id`` als Tiebreaker
+    sortiert; tiefe Seiten kosten dadurch so viel wie die erste.
+    Die Items werden als Rows ohne ORM-Objekte gelesen.
 
     Returns:
         PaginatedPostResponse: Posts mit Pagination-Informationen
     """
 
-    def build_filter_statement(
-            base_statement,
-            published: bool | None,
-            user_id: int | None,
-            title: str | None
-    ):
-        """Wendet Filter auf ein Statement an."""
-        if published is not None:
-            base_statement = base_statement.where(Post.published == published)
-        if user_id is not None:
-            base_statement = base_statement.where(Post.user_id == user_id)
-        if title is not None:
-            base_statement = base_statement.where(Post.title.ilike(f"%{title}%"))
-        return base_statement
-
-    statement = select(Post)
+    def count_posts() -> int:
+        count_statement = select(func.count(Post.id))
+        count_statement = build_filter_statement(count_statement, published, user_id, title)
+        return session.exec(count_statement).one()
+
+    selected = POST_FIELDS.parse(fields)
+    # Sortierspalte und ID braucht die Keyset-Pagination für den Cursor
+    statement = POST_FIELDS.select(selected, sort_by, "id")
 
     statement = build_filter_statement(statement, published, user_id, title)
 
+    if cursor is not None or pagination == PaginationModeEnum.cursor:
+        cursor_page = paginate_keyset(
+            session,
+            statement,
+            sort_column=getattr(Post, sort_by),
+            id_column=Post.id,
+            descending=order == OrderEnum.desc,
+            limit=page_size,
+            cursor=cursor,
+            scope={"published": published, "user_id": user_id, "title": title}
+        )
+        return paginated_response(
+            POST_FIELDS.rows(cursor_page.items, selected),
+            page_size=page_size,
+            total=count_posts() if include_total else None,
+            next_cursor=cursor_page.next_cursor,
+            prev_cursor=cursor_page.prev_cursor
+        )
+
     if order == OrderEnum.asc:
-        statement = statement.order_by(asc(getattr(Post, sort_by)))
+        statement = statement.order_by(asc(getattr(Post, sort_by)), asc(Post.id))
     else:
-        statement = statement.order_by(desc(getattr(Post, sort_by)))
+        statement = statement.order_by(desc(getattr(Post, sort_by)), desc(Post.id))
 
     skip = (page - 1) * page_size
 
     statement = statement.offset(skip).limit(page_size)
-    posts = session.exec(statement).all()
+    rows = session.exec(statement).all()
+
+    return paginated_response(
+        POST_FIELDS.rows(rows, selected),
+        page_size=page_size,
+        total=count_posts() if include_total is not False else None,
+        page=page
+    )
+
+
+@router.get(
+    "/search",
+    response_model=PostSearchResponse,
+    summary="Posts durchsuchen",
+    description="Volltextsuche über Titel und Inhalt, sortiert nach Relevanz."
+)
+def search_posts(
+        session: Session = Depends(get_read_session),
+        q: str = Query(min_length=1, max_length=200, description="Suchbegriffe"),
+        published: bool | None = Query(default=None, description="Ist veröffentlicht?"),
+        user_id: int | None = Query(default=None, description="User-ID"),
+        page_size: int = Query(default=20, ge=1, le=100, description="Anzahl Treffer pro Seite"),
+        cursor: str | None = Query(default=None, description="Cursor aus next_cursor/prev_cursor")
+):
+    """
+    Durchsucht Titel und Inhalt aller Posts.
+
+    Parameters:
+        - **q**: Suchbegriffe (alle müssen vorkommen; PostgreSQL versteht
+          zusätzlich "Phrasen", ``or`` und ``-ausschließen``)
+        - **published**: Ist der Post veröffentlicht?
+        - **user_id**: ID des Autors
+        - **page_size**: Anzahl Treffer pro Seite (1-100)
+        - **cursor**: Cursor für die nächste/vorherige Seite
+
+    Treffer im Titel zählen mehr als im Inhalt. Die Suche nutzt den
+    Volltext-Index (PostgreSQL: GIN auf tsvector, SQLite: FTS5) statt
+    ``ILIKE '%...%'`` über die ganze Tabelle.
 
-    count_statement = select(func.count(Post.id))
-    count_statement = build_filter_statement(count_statement, published, user_id, title)
-    total = session.exec(count_statement).one()
-    total_pages = math.ceil(total / page_size)
+    Returns:
+        PostSearchResponse: Treffer mit Rang und Hervorhebungen
+    """
+    search = search_statement(session.get_bind().dialect.name, q)
+    if search is None:
+        return PostSearchResponse(items=[], page_size=page_size)
+
+    statement, rank = search
+    statement = build_filter_statement(statement, published, user_id, title=None)
+
+    page = paginate_keyset(
+        session,
+        statement,
+        sort_column=rank,
+        id_column=Post.id,
+        descending=True,
+        limit=page_size,
+        cursor=cursor,
+        scope={"q": q, "published": published, "user_id": user_id}
+    )
 
-    return PaginatedPostResponse(
-        items=posts,
-        total=total,
-        page=page,
+    return PostSearchResponse(
+        items=render_hits(page.items),
         page_size=page_size,
-        total_pages=total_pages
+        next_cursor=page.next_cursor,
+        prev_cursor=page.prev_cursor
+    )
+
+
+@router.get(
+    "/export",
+    summary="Posts exportieren",
+    description="Streamt alle Posts, die den Filtern entsprechen, als NDJSON oder CSV.",
+    response_class=StreamingResponse,
+    responses=EXPORT_RESPONSES
+)
+def export_posts(
+        request: Request,
+        published: bool | None = Query(default=None, description="Ist veröffentlicht?"),
+        user_id: int | None = Query(default=None, description="User-ID"),
+        title: str | None = Query(default=None, description="Titel enthält..."),
+        sort_by: SortByEnum = Query(default=SortByEnum.id, description="Sortieren nach"),
+        order: OrderEnum = Query(default=OrderEnum.asc, description="Sortierreihenfolge"),
+        fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION),
+        export_format: ExportFormatEnum = Query(default=ExportFormatEnum.ndjson, alias="format",
+                                                description="ndjson (eine JSON-Zeile pro Post) oder csv")
+):
+    """
+    Exportiert Posts als Stream - für Analysen statt tausender Seiten-Requests.
+
+    Parameters:
+        - **published**, **user_id**, **title**: wie bei ``/posts/filtered``
+        - **sort_by**, **order**: Sortierung (Default: id aufsteigend)
+        - **fields**: Nur diese Spalten exportieren
+        - **format**: ndjson oder csv (mit Kopfzeile)
+
+    Die Zeilen kommen blockweise über einen serverseitigen Cursor,
+    der Speicherbedarf bleibt unabhängig von der Anzahl Posts konstant
+    (siehe ``app/core/export.py``).
+    """
+    selected = POST_FIELDS.parse(fields)
+    statement = build_export_statement(selected, published, user_id, title, sort_by, order)
+    return export_response(
+        stream_export(read_engine_for(request), statement, selected, export_format),
+        export_format,
+        "posts"
     )
 
 
@@ -229,15 +658,26 @@ def filter_posts(
     summary="Post mit Author-Details abrufen",
     description="Gibt einen einzelnen Post mit vollständigen Author-Informationen zurück."
 )
+@cached(PostReadWithAuthor, tags=lambda params, post: [f"post:{post.id}", f"user:{post.user_id}"])
 def get_post(
     post_id: int,
-    session: Session = Depends(get_session)
+    response: Response,
+    session: Session = Depends(get_read_session),
+    if_none_match: str | None = Header(default=None, description="ETag einer früheren Antwort (304, falls unverändert)")
 ):
     """
     Gibt einen Post mit Author-Details zurück.
     
     Parameters:
         - **post_id**: ID des Posts
+        - **If-None-Match**: ETag aus einer früheren Antwort
+    
+    Die Antwort trägt ein ``ETag`` (Post-Version plus Autor-Version).
+    Schickt der Client es als ``If-None-Match`` zurück und hat sich
+    nichts geändert, kommt ``304 Not Modified`` ohne Body.
+    
+    Der Author wird gleich mitgeladen (Strategie aus ``plan_loading``,
+    für ein einzelnes Objekt ein JOIN) statt per Lazy Load.
     
     Returns:
         PostReadWithAuthor: Post mit eingebetteten User-Daten
@@ -245,16 +685,97 @@ def get_post(
     Raises:
         404: Post mit der angegebenen ID existiert nicht
     """
-    db_post = session.get(Post, post_id)
+    plan = plan_loading(Post, PostReadWithAuthor, expected_rows=1)
+    db_post = session.get(Post, post_id, options=plan.options)
     if not db_post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Post mit ID {post_id} nicht gefunden"
         )
     
+    etag = post_etag(db_post, db_post.author)
+    if none_match(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["X-Loading-Strategy"] = plan.header()
+    
     return db_post
 
 
+@router.patch(
+    "/bulk",
+    response_model=PostBulkUpdateResult,
+    summary="Posts gesammelt ändern",
+    description="Ändert viele Posts (per IDs oder Filter) mit einem UPDATE statt einem PATCH pro Post."
+)
+def update_posts_bulk(
+    request: PostBulkUpdate,
+    session: Annotated[Session, Depends(get_session)]
+):
+    """
+    Ändert alle Posts zu ``ids`` bzw. ``filter`` mit ``update``,
+    z.B. "alle Entwürfe von User 5 veröffentlichen":
+    ``{"filter": {"user_id": 5, "published": false}, "update": {"published": true}}``.
+
+    Ein set-basiertes ``UPDATE ... RETURNING id`` statt Lesen, Ändern und
+    Schreiben pro Post. Mit ``chunk_size`` blockweise (je ein UPDATE und
+    COMMIT), damit Zeilensperren nur kurz gehalten werden - ``ids``
+    werden immer in Blöcken von höchstens ``chunk_size`` bzw. 1.000
+    geschrieben. Bei einem Fehler bleiben schon committete Blöcke bestehen.
+
+    Jeder geänderte Post bekommt eine neue ``version`` (neues ETag).
+
+    Returns:
+        PostBulkUpdateResult: Anzahl und IDs der geänderten Posts
+
+    Raises:
+        400: Nicht genau eins von ids/filter, leerer Filter oder leeres Update
+        413: Zu viele IDs
+    """
+    values = bulk_update_values(request)
+    dialect_name = session.get_bind().dialect.name
+    updated: list[int] = []
+
+    if request.ids is not None:
+        ids = list(dict.fromkeys(request.ids))
+        missing = []
+        for chunk in chunked(ids, request.chunk_size or BULK_CHUNK_SIZE):
+            existing = set(session.exec(select(Post.id).where(id_filter(Post.id, chunk, dialect_name))).all())
+            missing.extend(post_id for post_id in chunk if post_id not in existing)
+            written = session.execute(bulk_update_statement(values, id_filter(Post.id, chunk, dialect_name))).scalars().all()
+            session.commit()
+            invalidate_posts(written)
+            updated.extend(written)
+        return PostBulkUpdateResult(
+            updated=len(updated), ids=updated, unchanged=len(ids) - len(updated) - len(missing), missing=missing
+        )
+
+    criteria = post_filter_criteria(request.filter)
+    if request.chunk_size is None:
+        updated = session.execute(bulk_update_statement(values, criteria)).scalars().all()
+        session.commit()
+        invalidate_posts(updated)
+        return PostBulkUpdateResult(updated=len(updated), ids=updated)
+
+    # Keyset über die ID: Posts, die nach dem Update nicht mehr passen, verschieben nichts
+    after_id = 0
+    while True:
+        chunk = session.exec(bulk_filter_chunk(request.filter, after_id, request.chunk_size)).all()
+        if not chunk:
+            break
+        # Filter erneut prüfen - der Post kann sich seit dem SELECT geändert haben
+        written = session.execute(
+            bulk_update_statement(values, criteria, id_filter(Post.id, chunk, dialect_name))
+        ).scalars().all()
+        session.commit()
+        invalidate_posts(written)
+        updated.extend(written)
+        if len(chunk) < request.chunk_size:
+            break
+        after_id = chunk[-1]
+    return PostBulkUpdateResult(updated=len(updated), ids=updated)
+
+
 @router.patch(
     "/{post_id}",
     response_model=PostRead,
@@ -264,7 +785,9 @@ def get_post(
 def update_post(
     post_id: int,
     post_update: PostUpdate,
-    session: Annotated[Session, Depends(get_session)]
+    response: Response,
+    session: Annotated[Session, Depends(get_session)],
+    if_match: str | None = Header(default=None, description="ETag aus GET /posts/{post_id} (Optimistic Locking)")
 ):
     """
     Aktualisiert einen Post (Partial Update).
@@ -277,12 +800,18 @@ def update_post(
         - **title**: Neuer Titel (optional)
         - **content**: Neuer Inhalt (optional)
         - **published**: Neuer Status (optional)
+        - **If-Match**: ETag des zuletzt gelesenen Stands
+    
+    Mit ``If-Match`` wird nur gespeichert, wenn der Post seitdem nicht
+    geändert wurde. Die Antwort enthält das neue ``ETag``.
     
     Returns:
         PostRead: Der aktualisierte Post
     
     Raises:
         404: Post mit der angegebenen ID existiert nicht
+        409: Post wurde parallel geändert (ohne If-Match)
+        412: If-Match passt nicht zum aktuellen Stand
     """
     db_post = session.get(Post, post_id)
     if not db_post:
@@ -290,14 +819,25 @@ def update_post(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Post mit ID {post_id} nicht gefunden"
         )
+    check_if_match(if_match, post_etag(db_post, db_post.author))
     
     # Nur übergebene Felder aktualisieren
     post_data = post_update.model_dump(exclude_unset=True)
 
     db_post.sqlmodel_update(post_data)
     
-    session.commit()
+    try:
+        session.commit()
+    except StaleDataError:
+        # Das UPDATE prüft die gelesene Version - ein paralleler Request war schneller
+        session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED if if_match else status.HTTP_409_CONFLICT,
+            detail=f"Post mit ID {post_id} wurde parallel geändert - neu laden und erneut versuchen"
+        )
     session.refresh(db_post)
+    response_cache.invalidate(f"post:{post_id}", "posts")
+    response.headers["ETag"] = post_etag(db_post, db_post.author)
     
     return db_post
 
@@ -323,6 +863,7 @@ def delete_post(
     
     Raises:
         404: Post mit der angegebenen ID existiert nicht
+        409: Post wurde parallel geändert
     """
     db_post = session.get(Post, post_id)
     if not db_post:
@@ -332,6 +873,15 @@ def delete_post(
         )
     
     session.delete(db_post)
-    session.commit()
+    try:
+        session.commit()
+    except StaleDataError:
+        # DELETE prüft die Version mit (version_id_col)
+        session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Post mit ID {post_id} wurde parallel geändert - neu laden und erneut versuchen"
+        )
+    response_cache.invalidate(f"post:{post_id}", "posts")
     
     return None
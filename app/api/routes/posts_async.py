@@ -0,0 +1,464 @@
+"""
+Post API Routes (async)
+=======================
+Async-Varianten der Post-Endpunkte für ``DB_ASYNC=True``.
+
+Gleiche Pfade, Parameter und Response-Modelle wie in ``posts.py``,
+aber mit ``AsyncSession``: Während eine Query läuft, ist der
+Event-Loop frei für andere Requests (kein Threadpool-Worker blockiert).
+
+Wichtig: Lazy Loading ist im async Kontext nicht erlaubt - Relationships
+müssen explizit geladen werden (selectinload/joinedload oder refresh).
+"""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.exc import StaleDataError
+from sqlmodel import select, asc, desc
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.routes.posts import (
+    FIELDS_DESCRIPTION,
+    POST_FIELDS,
+    AuthorShapeEnum,
+    OrderEnum,
+    SortByEnum,
+    authors_page,
+    build_export_statement,
+    build_filter_statement,
+    bulk_filter_chunk,
+    bulk_update_statement,
+    bulk_update_values,
+    invalidate_posts,
+    paginated_response,
+    post_filter_criteria,
+    select_posts_by_ids,
+)
+from app.core.bulk import BULK_CHUNK_SIZE, chunked
+from app.core.cache import cached, response_cache
+from app.core.dataloader import load_related_async
+from app.core.etag import check_if_match, none_match, not_modified, post_etag
+from app.core.export import EXPORT_RESPONSES, ExportFormatEnum, export_response, stream_export_async
+from app.core.loading import LoadingStrategyEnum, plan_loading
+from app.core.multiget import IDS_DESCRIPTION, check_ids, id_filter, in_requested_order, parse_ids, set_missing_header
+from app.core.pagination import PaginationModeEnum, paginate_keyset_async, set_cursor_headers
+from app.core.projection import json_response
+from app.core.serialization import POST_WITH_AUTHOR_LIST_SERIALIZER
+from app.database import async_read_engine_for, get_async_read_session, get_async_session
+from app.models import IdsRequest, Post, PostCreate, PostRead, PostReadWithAuthor, PostUpdate, User
+from app.models.post import (
+    PaginatedPostResponse,
+    PostBatchResponse,
+    PostBulkUpdate,
+    PostBulkUpdateResult,
+    PostPageWithAuthors,
+)
+
+router = APIRouter()
+
+
+async def fetch_posts_by_ids(session: AsyncSession, statement, ids: list[int]) -> tuple[list, list[int]]:
+    """Async-Variante von ``posts.fetch_posts_by_ids``."""
+    rows = (await session.exec(select_posts_by_ids(statement, ids, session.bind.dialect.name))).all()
+    return in_requested_order(rows, ids)
+
+
+@router.post(
+    "/",
+    response_model=PostRead,
+    status_code=status.HTTP_201_CREATED,
+    summary="Post erstellen",
+    description="Erstellt einen neuen Post für einen bestimmten User."
+)
+async def create_post(
+    post: PostCreate,
+    session: Annotated[AsyncSession, Depends(get_async_session)]
+):
+    """Async-Variante von ``posts.create_post``."""
+    db_user = await session.get(User, post.user_id)
+    if not db_user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User mit ID {post.user_id} nicht gefunden"
+        )
+
+    db_post = Post.model_validate(post)
+    session.add(db_post)
+    await session.commit()
+    await session.refresh(db_post)
+    response_cache.invalidate("posts")
+
+    return db_post
+
+
+@router.get(
+    "/",
+    response_model=list[PostRead],
+    summary="Alle Posts abrufen",
+    description="Gibt eine Liste aller Posts zurück mit Pagination."
+)
+@cached(list[PostRead], tags=lambda params, posts: ["posts"])
+async def get_posts(
+    session: AsyncSession = Depends(get_async_read_session),
+    skip: int = Query(default=0, ge=0, description="Anzahl zu überspringender Posts"),
+    limit: int = Query(default=20, ge=1, le=100, description="Max. Anzahl zurückzugebender Posts"),
+    cursor: str | None = Query(default=None, description="Cursor aus X-Next-Cursor/X-Prev-Cursor (ersetzt skip)"),
+    pagination: PaginationModeEnum = Query(default=PaginationModeEnum.offset, description="Pagination-Modus"),
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION),
+    ids: str | None = Query(default=None, description=IDS_DESCRIPTION)
+):
+    """Async-Variante von ``posts.get_posts``."""
+    selected = POST_FIELDS.parse(fields)
+    statement = POST_FIELDS.select(selected, "id")
+
+    if ids is not None:
+        rows, missing = await fetch_posts_by_ids(session, statement, parse_ids(ids))
+        result = json_response(POST_FIELDS.rows(rows, selected))
+        set_missing_header(result, missing)
+        return result
+
+    if cursor is not None or pagination == PaginationModeEnum.cursor:
+        page = await paginate_keyset_async(
+            session,
+            statement,
+            sort_column=Post.id,
+            id_column=Post.id,
+            descending=False,
+            limit=limit,
+            cursor=cursor
+        )
+        result = json_response(POST_FIELDS.rows(page.items, selected))
+        set_cursor_headers(result, page)
+        return result
+
+    rows = (await session.exec(statement.order_by(Post.id).offset(skip).limit(limit))).all()
+    return json_response(POST_FIELDS.rows(rows, selected))
+
+
+@router.post(
+    "/batch",
+    response_model=PostBatchResponse,
+    summary="Posts zu einer ID-Liste abrufen",
+    description="Lädt alle angefragten Posts mit einer Query, in angefragter Reihenfolge, und meldet fehlende IDs."
+)
+async def get_posts_batch(
+    request: IdsRequest,
+    session: AsyncSession = Depends(get_async_read_session),
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION)
+):
+    """Async-Variante von ``posts.get_posts_batch``."""
+    selected = POST_FIELDS.parse(fields)
+    rows, missing = await fetch_posts_by_ids(session, POST_FIELDS.select(selected, "id"), check_ids(request.ids))
+    return json_response({"items": POST_FIELDS.rows(rows, selected), "missing": missing})
+
+
+@router.get(
+    "/with-authors",
+    response_model=list[PostReadWithAuthor] | PostPageWithAuthors,
+    summary="Posts mit Authors abrufen",
+    description="Gibt eine Seite Posts mit Author-Informationen zurück (Cursor-Pagination)."
+)
+async def get_posts_with_authors(
+        response: Response,
+        session: AsyncSession = Depends(get_async_read_session),
+        strategy: LoadingStrategyEnum = Query(default=LoadingStrategyEnum.auto,
+                                              description="Laden-Strategie für Relationships (auto = nach Seitengröße)"),
+        limit: int = Query(default=50, ge=1, le=500, description="Max. Anzahl Posts pro Seite"),
+        cursor: str | None = Query(default=None, description="Cursor der Nachbarseite"),
+        shape: AuthorShapeEnum = Query(default=AuthorShapeEnum.embedded,
+                                       description="embedded (Author in jedem Post) oder normalized (authors-Map)")
+):
+    """
+    Async-Variante von ``posts.get_posts_with_authors``.
+
+    ``lazy`` läuft per ``run_sync`` (siehe ``load_related_async``) -
+    gebündelt wie in der sync Route, mit ``BATCH_LOADING=False`` N+1.
+    """
+    plan = plan_loading(Post, PostReadWithAuthor, expected_rows=limit, strategy=strategy)
+    statement = select(Post).options(*plan.options)
+
+    page = await paginate_keyset_async(
+        session,
+        statement,
+        sort_column=Post.id,
+        id_column=Post.id,
+        descending=False,
+        limit=limit,
+        cursor=cursor
+    )
+
+    if plan.lazy:
+        await load_related_async(session, page.items, plan.lazy)
+
+    if shape == AuthorShapeEnum.normalized:
+        result = authors_page(page.items, page_size=limit, next_cursor=page.next_cursor, prev_cursor=page.prev_cursor)
+        result.headers["X-Loading-Strategy"] = plan.header()
+        return result
+
+    set_cursor_headers(response, page)
+    response.headers["X-Loading-Strategy"] = plan.header()
+    return POST_WITH_AUTHOR_LIST_SERIALIZER.respond(page.items, headers=response.headers)
+
+
+@router.get(
+    "/filtered",
+    response_model=PaginatedPostResponse,
+    summary="Posts filtern",
+    description="Gibt eine Liste von Posts zurück, die mehreren Filtern entsprechen."
+)
+@cached(PaginatedPostResponse, tags=lambda params, page: ["posts"])
+async def filter_posts(
+        session: AsyncSession = Depends(get_async_read_session),
+        published: bool | None = Query(default=None, description="Ist veröffentlicht?"),
+        user_id: int | None = Query(default=None, description="User-ID"),
+        title: str | None = Query(default=None, description="Titel enthält..."),
+        sort_by: SortByEnum = Query(default=SortByEnum.created_at, description="Sortieren nach"),
+        order: OrderEnum = Query(default=OrderEnum.desc, description="Sortierreihenfolge"),
+        page: int = Query(default=1, ge=1, description="Seite (ab 1)"),
+        page_size: int = Query(default=10, ge=1, le=100, description="Anzahl Posts pro Seite"),
+        cursor: str | None = Query(default=None, description="Cursor aus next_cursor/prev_cursor (ersetzt page)"),
+        pagination: PaginationModeEnum = Query(default=PaginationModeEnum.offset, description="Pagination-Modus"),
+        include_total: bool | None = Query(default=None, description="Gesamtanzahl zählen? (Default: nur im Offset-Modus)"),
+        fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION)
+):
+    """Async-Variante von ``posts.filter_posts``."""
+
+    async def count_posts() -> int:
+        count_statement = select(func.count(Post.id))
+        count_statement = build_filter_statement(count_statement, published, user_id, title)
+        return (await session.exec(count_statement)).one()
+
+    selected = POST_FIELDS.parse(fields)
+    statement = build_filter_statement(POST_FIELDS.select(selected, sort_by, "id"), published, user_id, title)
+
+    if cursor is not None or pagination == PaginationModeEnum.cursor:
+        cursor_page = await paginate_keyset_async(
+            session,
+            statement,
+            sort_column=getattr(Post, sort_by),
+            id_column=Post.id,
+            descending=order == OrderEnum.desc,
+            limit=page_size,
+            cursor=cursor,
+            scope={"published": published, "user_id": user_id, "title": title}
+        )
+        return paginated_response(
+            POST_FIELDS.rows(cursor_page.items, selected),
+            page_size=page_size,
+            total=await count_posts() if include_total else None,
+            next_cursor=cursor_page.next_cursor,
+            prev_cursor=cursor_page.prev_cursor
+        )
+
+    if order == OrderEnum.asc:
+        statement = statement.order_by(asc(getattr(Post, sort_by)), asc(Post.id))
+    else:
+        statement = statement.order_by(desc(getattr(Post, sort_by)), desc(Post.id))
+
+    statement = statement.offset((page - 1) * page_size).limit(page_size)
+    rows = (await session.exec(statement)).all()
+
+    return paginated_response(
+        POST_FIELDS.rows(rows, selected),
+        page_size=page_size,
+        total=await count_posts() if include_total is not False else None,
+        page=page
+    )
+
+
+@router.get(
+    "/export",
+    summary="Posts exportieren",
+    description="Streamt alle Posts, die den Filtern entsprechen, als NDJSON oder CSV.",
+    response_class=StreamingResponse,
+    responses=EXPORT_RESPONSES
+)
+async def export_posts(
+        request: Request,
+        published: bool | None = Query(default=None, description="Ist veröffentlicht?"),
+        user_id: int | None = Query(default=None, description="User-ID"),
+        title: str | None = Query(default=None, description="Titel enthält..."),
+        sort_by: SortByEnum = Query(default=SortByEnum.id, description="Sortieren nach"),
+        order: OrderEnum = Query(default=OrderEnum.asc, description="Sortierreihenfolge"),
+        fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION),
+        export_format: ExportFormatEnum = Query(default=ExportFormatEnum.ndjson, alias="format",
+                                                description="ndjson (eine JSON-Zeile pro Post) oder csv")
+):
+    """Async-Variante von ``posts.export_posts`` (Server-Cursor über asyncpg)."""
+    selected = POST_FIELDS.parse(fields)
+    statement = build_export_statement(selected, published, user_id, title, sort_by, order)
+    return export_response(
+        stream_export_async(async_read_engine_for(request), statement, selected, export_format),
+        export_format,
+        "posts"
+    )
+
+
+@router.get(
+    "/{post_id}",
+    response_model=PostReadWithAuthor,
+    summary="Post mit Author-Details abrufen",
+    description="Gibt einen einzelnen Post mit vollständigen Author-Informationen zurück."
+)
+@cached(PostReadWithAuthor, tags=lambda params, post: [f"post:{post.id}", f"user:{post.user_id}"])
+async def get_post(
+    post_id: int,
+    response: Response,
+    session: AsyncSession = Depends(get_async_read_session),
+    if_none_match: str | None = Header(default=None, description="ETag einer früheren Antwort (304, falls unverändert)")
+):
+    """
+    Async-Variante von ``posts.get_post``.
+
+    Der Author muss mitgeladen werden, da ein Lazy Load während der
+    Serialisierung async nicht möglich ist (``lazy`` nur per ``run_sync``).
+    """
+    plan = plan_loading(Post, PostReadWithAuthor, expected_rows=1)
+    statement = select(Post).where(Post.id == post_id).options(*plan.options)
+    db_post = (await session.exec(statement)).first()
+    if not db_post:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Post mit ID {post_id} nicht gefunden"
+        )
+    if plan.lazy:
+        await load_related_async(session, [db_post], plan.lazy)
+
+    etag = post_etag(db_post, db_post.author)
+    if none_match(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["X-Loading-Strategy"] = plan.header()
+
+    return db_post
+
+
+@router.patch(
+    "/bulk",
+    response_model=PostBulkUpdateResult,
+    summary="Posts gesammelt ändern",
+    description="Ändert viele Posts (per IDs oder Filter) mit einem UPDATE statt einem PATCH pro Post."
+)
+async def update_posts_bulk(
+    request: PostBulkUpdate,
+    session: Annotated[AsyncSession, Depends(get_async_session)]
+):
+    """Async-Variante von ``posts.update_posts_bulk``."""
+    values = bulk_update_values(request)
+    dialect_name = session.bind.dialect.name
+    updated: list[int] = []
+
+    if request.ids is not None:
+        ids = list(dict.fromkeys(request.ids))
+        missing = []
+        for chunk in chunked(ids, request.chunk_size or BULK_CHUNK_SIZE):
+            existing = set((await session.exec(select(Post.id).where(id_filter(Post.id, chunk, dialect_name)))).all())
+            missing.extend(post_id for post_id in chunk if post_id not in existing)
+            written = (await session.execute(
+                bulk_update_statement(values, id_filter(Post.id, chunk, dialect_name))
+            )).scalars().all()
+            await session.commit()
+            invalidate_posts(written)
+            updated.extend(written)
+        return PostBulkUpdateResult(
+            updated=len(updated), ids=updated, unchanged=len(ids) - len(updated) - len(missing), missing=missing
+        )
+
+    criteria = post_filter_criteria(request.filter)
+    if request.chunk_size is None:
+        updated = (await session.execute(bulk_update_statement(values, criteria))).scalars().all()
+        await session.commit()
+        invalidate_posts(updated)
+        return PostBulkUpdateResult(updated=len(updated), ids=updated)
+
+    after_id = 0
+    while True:
+        chunk = (await session.exec(bulk_filter_chunk(request.filter, after_id, request.chunk_size))).all()
+        if not chunk:
+            break
+        written = (await session.execute(
+            bulk_update_statement(values, criteria, id_filter(Post.id, chunk, dialect_name))
+        )).scalars().all()
+        await session.commit()
+        invalidate_posts(written)
+        updated.extend(written)
+        if len(chunk) < request.chunk_size:
+            break
+        after_id = chunk[-1]
+    return PostBulkUpdateResult(updated=len(updated), ids=updated)
+
+
+@router.patch(
+    "/{post_id}",
+    response_model=PostRead,
+    summary="Post aktualisieren",
+    description="Aktualisiert einen bestehenden Post. user_id kann nicht geändert werden."
+)
+async def update_post(
+    post_id: int,
+    post_update: PostUpdate,
+    response: Response,
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    if_match: str | None = Header(default=None, description="ETag aus GET /posts/{post_id} (Optimistic Locking)")
+):
+    """Async-Variante von ``posts.update_post``."""
+    db_post = await session.get(Post, post_id, options=[selectinload(Post.author)])
+    if not db_post:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Post mit ID {post_id} nicht gefunden"
+        )
+    check_if_match(if_match, post_etag(db_post, db_post.author))
+
+    post_data = post_update.model_dump(exclude_unset=True)
+    db_post.sqlmodel_update(post_data)
+
+    try:
+        await session.commit()
+    except StaleDataError:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED if if_match else status.HTTP_409_CONFLICT,
+            detail=f"Post mit ID {post_id} wurde parallel geändert - neu laden und erneut versuchen"
+        )
+    await session.refresh(db_post)
+    response_cache.invalidate(f"post:{post_id}", "posts")
+    response.headers["ETag"] = post_etag(db_post, db_post.author)
+
+    return db_post
+
+
+@router.delete(
+    "/{post_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Post löschen",
+    description="Löscht einen Post permanent aus der Datenbank."
+)
+async def delete_post(
+    post_id: int,
+    session: Annotated[AsyncSession, Depends(get_async_session)]
+):
+    """Async-Variante von ``posts.delete_post``."""
+    db_post = await session.get(Post, post_id)
+    if not db_post:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Post mit ID {post_id} nicht gefunden"
+        )
+
+    await session.delete(db_post)
+    try:
+        await session.commit()
+    except StaleDataError:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Post mit ID {post_id} wurde parallel geändert - neu laden und erneut versuchen"
+        )
+    response_cache.invalidate(f"post:{post_id}", "posts")
+
+    return None
@@ -0,0 +1,383 @@
+"""
+Product API Routes
+==================
+Produktkatalog: CRUD, SKU-Lookup, gefilterte Listen mit Cursor-Pagination
+und Bulk-Upsert für den Katalog-Abgleich.
+
+Der stündliche Abgleich mit mehreren Millionen SKUs läuft über
+``PUT /products/bulk``: pro Block ein einziges
+``INSERT ... ON CONFLICT (sku) DO UPDATE`` statt Lesen, Vergleichen und
+Schreiben pro Objekt. Unveränderte Produkte werden dabei gar nicht
+geschrieben (``WHERE ... IS DISTINCT FROM``) - keine neuen
+Zeilenversionen, kein unnötiger WAL, weniger Arbeit für VACUUM.
+
+``GET /products/sku/{sku}`` läuft über den prozess-lokalen SKU-Cache
+(``app/core/sku_cache.py``); alle Schreib-Routen invalidieren ihn.
+
+Indizes (siehe ``migrations/versions/0005_product_indexes.py``):
+``(price, id)`` für Preisbereich und Sortierung, dasselbe partiell
+``WHERE in_stock`` für lieferbare Produkte, UNIQUE auf ``sku``.
+"""
+
+import datetime
+from enum import StrEnum
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import Boolean, literal_column, or_
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from app.api.routes.posts import OrderEnum
+from app.core.bulk import BulkBody, BulkPayload, chunked, dialect_insert
+from app.core.config import settings
+from app.core.pagination import paginate_keyset, set_cursor_headers
+from app.core.projection import FieldSet, json_response
+from app.core.serialization import PRODUCT_SERIALIZER
+from app.core.sku_cache import sku_cache
+from app.database import get_read_session, get_session
+from app.models import BulkItemError, BulkUpsertResult, Product, ProductCreate, ProductRead, ProductUpdate
+
+
+router = APIRouter(
+    prefix="/products",
+    tags=["Products"]
+)
+
+# Felder für ?fields= in der Liste
+PRODUCT_FIELDS = FieldSet(Product, ProductRead)
+
+# Spalten, die der Upsert bei vorhandener SKU überschreibt
+UPSERT_COLUMNS = ("name", "description", "price", "in_stock")
+
+
+class ProductSortEnum(StrEnum):
+    id = "id"
+    price = "price"
+
+
+def build_product_filter(
+        base_statement,
+        min_price: float | None,
+        max_price: float | None,
+        in_stock: bool | None
+):
+    """Wendet die Produkt-Filter (Preisbereich, in_stock) auf ein Statement an."""
+    if min_price is not None:
+        base_statement = base_statement.where(Product.price >= min_price)
+    if max_price is not None:
+        base_statement = base_statement.where(Product.price <= max_price)
+    if in_stock is not None:
+        base_statement = base_statement.where(Product.in_stock == in_stock)
+    return base_statement
+
+
+def _not_found(product_id: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Produkt mit ID {product_id} nicht gefunden"
+    )
+
+
+def _sku_conflict(sku: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Produkt mit SKU '{sku}' existiert bereits"
+    )
+
+
+@router.post(
+    "/",
+    response_model=ProductRead,
+    status_code=status.HTTP_201_CREATED,
+    summary="Produkt erstellen",
+    description="Legt ein neues Produkt an."
+)
+def create_product(
+    product: ProductCreate,
+    session: Session = Depends(get_session)
+):
+    """
+    Legt ein Produkt an.
+
+    Raises:
+        HTTPException 409: SKU ist schon vergeben
+    """
+    if session.exec(select(Product.id).where(Product.sku == product.sku)).first() is not None:
+        raise _sku_conflict(product.sku)
+
+    db_product = Product.model_validate(product)
+    session.add(db_product)
+    try:
+        session.commit()
+    except IntegrityError:
+        # Parallel mit derselben SKU angelegt
+        session.rollback()
+        raise _sku_conflict(product.sku)
+    session.refresh(db_product)
+
+    return db_product
+
+
+@router.put(
+    "/bulk",
+    response_model=BulkUpsertResult,
+    summary="Produkte abgleichen (Upsert)",
+    description="Legt Produkte an oder aktualisiert sie anhand der SKU - JSON-Array oder NDJSON-Stream.",
+    openapi_extra=BulkBody.openapi(ProductCreate)
+)
+def upsert_products_bulk(
+    payload: BulkPayload = Depends(BulkBody(ProductCreate)),
+    session: Session = Depends(get_session)
+):
+    """
+    Upsert vieler Produkte über die SKU (Katalog-Abgleich).
+
+    Pro Block von Einträgen genau ein Statement:
+    ``INSERT ... ON CONFLICT (sku) DO UPDATE SET ... WHERE <geändert>
+    RETURNING sku, <neu angelegt?>``, danach ein COMMIT. Neue SKUs werden
+    angelegt, vorhandene nur geschrieben, wenn sich Name, Beschreibung,
+    Preis oder Lagerstatus geändert haben.
+
+    Mehrfach vorkommende SKUs im selben Request werden (ab dem zweiten
+    Vorkommen) als Fehler gemeldet - ein Statement darf dieselbe Zeile
+    nicht zweimal ändern.
+
+    Returns:
+        BulkUpsertResult: Angelegt, aktualisiert, unverändert und Fehler pro Eintrag
+    """
+    dialect_name = session.get_bind().dialect.name
+    insert = dialect_insert(dialect_name)
+    errors = list(payload.errors)
+    inserted = updated = unchanged = 0
+    seen_skus = set()
+    now = datetime.datetime.now(datetime.UTC)
+    # Angelegt oder aktualisiert? PostgreSQL: xmax ist 0 für frisch eingefügte
+    # Zeilen. Sonst: created_at dieses Requests - ein Update setzt es nie.
+    was_inserted = (
+        literal_column("xmax = 0", Boolean) if dialect_name == "postgresql"
+        else Product.created_at == now
+    ).label("inserted")
+
+    for chunk in chunked(payload.items):
+        rows = []
+        for index, product in chunk:
+            if product.sku in seen_skus:
+                errors.append(BulkItemError(index=index, detail=f"SKU '{product.sku}' kommt im Request mehrfach vor"))
+                continue
+            seen_skus.add(product.sku)
+            rows.append({**product.model_dump(), "created_at": now})
+        if not rows:
+            continue
+
+        statement = insert(Product)
+        statement = statement.on_conflict_do_update(
+            index_elements=[Product.sku],
+            set_={**{column: statement.excluded[column] for column in UPSERT_COLUMNS}, "updated_at": now},
+            # Unveränderte Zeilen nicht anfassen (und nicht zurückgeben)
+            where=or_(*(
+                getattr(Product, column).is_distinct_from(statement.excluded[column])
+                for column in UPSERT_COLUMNS
+            ))
+        ).returning(Product.sku, was_inserted)
+
+        # Zurück kommen nur geschriebene Zeilen - unveränderte fehlen
+        written = session.execute(statement, rows).all()
+        session.commit()
+        updated_skus = [row.sku for row in written if not row.inserted]
+        sku_cache.invalidate(*updated_skus)
+
+        inserted += len(written) - len(updated_skus)
+        updated += len(updated_skus)
+        unchanged += len(rows) - len(written)
+
+    errors.sort(key=lambda error: error.index)
+    return BulkUpsertResult(inserted=inserted, updated=updated, unchanged=unchanged, errors=errors)
+
+
+@router.get(
+    "/",
+    response_model=list[ProductRead],
+    summary="Produkte abrufen",
+    description="Gibt Produkte gefiltert nach Preisbereich und Lagerstatus zurück (Cursor-Pagination)."
+)
+def get_products(
+    session: Session = Depends(get_read_session),
+    min_price: float | None = Query(default=None, ge=0, description="Mindestpreis (inklusive)"),
+    max_price: float | None = Query(default=None, ge=0, description="Höchstpreis (inklusive)"),
+    in_stock: bool | None = Query(default=None, description="Nur lieferbare/nicht lieferbare Produkte"),
+    sort_by: ProductSortEnum = Query(default=ProductSortEnum.id, description="Sortieren nach"),
+    order: OrderEnum = Query(default=OrderEnum.asc, description="Sortierreihenfolge"),
+    limit: int = Query(default=50, ge=1, le=500, description="Max. Anzahl Produkte pro Seite"),
+    cursor: str | None = Query(default=None, description="Cursor aus X-Next-Cursor/X-Prev-Cursor"),
+    fields: str | None = Query(default=None, description="Komma-getrennte Felder, z.B. id,sku,price (Default: alle)")
+):
+    """
+    Gibt eine Seite Produkte zurück.
+
+    Parameters:
+        - **min_price** / **max_price**: Preisbereich (inklusive)
+        - **in_stock**: Lagerstatus
+        - **sort_by** / **order**: Sortierung (id oder price)
+        - **limit**: Produkte pro Seite (1-500)
+        - **cursor**: Cursor für die Nachbarseite
+        - **fields**: Nur diese Felder laden und zurückgeben
+
+    Die Cursor für die Nachbarseiten stehen in den Response-Headern
+    ``X-Next-Cursor`` und ``X-Prev-Cursor``. ``in_stock=true`` mit
+    Preisbereich nutzt den partiellen Index auf lieferbare Produkte.
+
+    Raises:
+        HTTPException 400: min_price größer als max_price
+    """
+    if min_price is not None and max_price is not None and min_price > max_price:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="min_price darf nicht größer als max_price sein"
+        )
+
+    selected = PRODUCT_FIELDS.parse(fields)
+    statement = build_product_filter(
+        PRODUCT_FIELDS.select(selected, sort_by.value, "id"), min_price, max_price, in_stock
+    )
+    page = paginate_keyset(
+        session,
+        statement,
+        sort_column=getattr(Product, sort_by),
+        id_column=Product.id,
+        descending=order == OrderEnum.desc,
+        limit=limit,
+        cursor=cursor,
+        scope={"min_price": min_price, "max_price": max_price, "in_stock": in_stock}
+    )
+    result = json_response(PRODUCT_FIELDS.rows(page.items, selected))
+    set_cursor_headers(result, page)
+    return result
+
+
+@router.get(
+    "/sku/{sku}",
+    response_model=ProductRead,
+    summary="Produkt per SKU abrufen",
+    description="Sucht ein Produkt über seine SKU (Unique-Index)."
+)
+def get_product_by_sku(
+    sku: str,
+    session: Session = Depends(get_session)
+):
+    """
+    Gibt das Produkt mit der SKU zurück - bei einem Treffer im SKU-Cache
+    ohne Datenbank-Zugriff.
+
+    Fehlgriffe lesen vom Primary: Ein Replica könnte direkt nach einer
+    Invalidierung noch den alten Stand liefern, der dann im Cache bliebe.
+
+    Raises:
+        HTTPException 404: Keine Produkt mit dieser SKU
+    """
+    if settings.SKU_CACHE_ENABLED and (body := sku_cache.get(sku)) is not None:
+        return Response(content=body, media_type="application/json")
+
+    generation = sku_cache.generation
+    db_product = session.exec(select(Product).where(Product.sku == sku)).first()
+    if not db_product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Produkt mit SKU '{sku}' nicht gefunden"
+        )
+    body = PRODUCT_SERIALIZER.dump(db_product)
+    if settings.SKU_CACHE_ENABLED:
+        sku_cache.put(sku, body, generation)
+    return Response(content=body, media_type="application/json")
+
+
+@router.get(
+    "/{product_id}",
+    response_model=ProductRead,
+    summary="Produkt abrufen",
+    description="Gibt ein einzelnes Produkt zurück."
+)
+def get_product(
+    product_id: int,
+    session: Session = Depends(get_read_session)
+):
+    """
+    Gibt ein Produkt zurück.
+
+    Raises:
+        HTTPException 404: Produkt existiert nicht
+    """
+    db_product = session.get(Product, product_id)
+    if not db_product:
+        raise _not_found(product_id)
+    return db_product
+
+
+@router.patch(
+    "/{product_id}",
+    response_model=ProductRead,
+    summary="Produkt aktualisieren",
+    description="Aktualisiert ein Produkt teilweise (Partial Update)."
+)
+def update_product(
+    product_id: int,
+    product_update: ProductUpdate,
+    session: Session = Depends(get_session)
+):
+    """
+    Aktualisiert die übergebenen Felder eines Produkts und setzt ``updated_at``.
+
+    Raises:
+        HTTPException 404: Produkt existiert nicht
+        HTTPException 409: Neue SKU ist schon vergeben
+    """
+    db_product = session.get(Product, product_id)
+    if not db_product:
+        raise _not_found(product_id)
+
+    old_sku = db_product.sku
+    update_data = product_update.model_dump(exclude_unset=True)
+    if "sku" in update_data:
+        existing = session.exec(
+            select(Product.id).where(Product.sku == update_data["sku"], Product.id != product_id)
+        ).first()
+        if existing is not None:
+            raise _sku_conflict(update_data["sku"])
+
+    for key, value in update_data.items():
+        setattr(db_product, key, value)
+    db_product.updated_at = datetime.datetime.now(datetime.UTC)
+
+    try:
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        raise _sku_conflict(update_data["sku"])
+    session.refresh(db_product)
+    sku_cache.invalidate(old_sku, db_product.sku)
+
+    return db_product
+
+
+@router.delete(
+    "/{product_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Produkt löschen",
+    description="Löscht ein Produkt permanent."
+)
+def delete_product(
+    product_id: int,
+    session: Session = Depends(get_session)
+):
+    """
+    Löscht ein Produkt.
+
+    Raises:
+        HTTPException 404: Produkt existiert nicht
+    """
+    db_product = session.get(Product, product_id)
+    if not db_product:
+        raise _not_found(product_id)
+    sku = db_product.sku
+    session.delete(db_product)
+    session.commit()
+    sku_cache.invalidate(sku)
@@ -0,0 +1,99 @@
+"""
+System API Routes
+=================
+Betriebs-Endpunkte (Pool-Zustand, Response-Cache, Loading-Strategien usw.) für Monitoring und Tuning.
+"""
+
+from fastapi import APIRouter, Query, Request
+
+from app.core.cache import response_cache
+from app.core.loading import compare_strategies
+from app.core.pool import pool_status
+from app.core.sku_cache import sku_cache
+from app.database import named_engines
+
+
+router = APIRouter(
+    prefix="/system",
+    tags=["System"]
+)
+
+
+@router.get(
+    "/pool",
+    summary="Connection-Pool-Statistiken",
+    description="Zeigt Größe, Auslastung, Overflow und Checkout-Wartezeiten der Connection-Pools."
+)
+def get_pool_stats():
+    """
+    Gibt den Zustand aller Connection-Pools dieses Prozesses zurück.
+    
+    Hinweis: Mit mehreren uvicorn-Workern hat jeder Prozess seinen
+    eigenen Pool - die Werte gelten nur für den antwortenden Worker.
+    
+    Returns:
+        dict: Pool-Kennzahlen je Engine (checked_out, overflow, Wartezeiten, ...)
+    """
+    return {name: pool_status(engine) for name, engine in named_engines().items()}
+
+
+@router.get(
+    "/cache",
+    summary="Response-Cache-Statistiken",
+    description="Zeigt Treffer, Fehlgriffe, Verdrängungen und Füllstand des Response-Caches."
+)
+def get_cache_stats():
+    """
+    Gibt die Kennzahlen des Response-Caches zurück.
+    
+    Zum Dimensionieren: Viele ``evictions`` bei niedriger ``hit_ratio``
+    sprechen für mehr CACHE_MAX_ENTRIES/CACHE_MAX_BYTES, viele
+    ``expirations`` für eine längere CACHE_TTL_SECONDS.
+    Die Zähler gelten (wie beim Pool) nur für den antwortenden Worker.
+    
+    Returns:
+        dict: Zähler, Hit-Ratio und Füllstand
+    """
+    return response_cache.status()
+
+
+@router.get(
+    "/sku-cache",
+    summary="SKU-Cache-Statistiken",
+    description="Zeigt Treffer, Fehlgriffe, Invalidierungen und Füllstand des SKU-Caches."
+)
+def get_sku_cache_stats():
+    """
+    Gibt die Kennzahlen des SKU-Caches (``GET /products/sku/{sku}``) zurück.
+    
+    ``clears`` zählt komplette Leerungen - u.a. nach jedem Verbindungsabbruch
+    des LISTEN-Threads. Die Zähler gelten nur für den antwortenden Worker.
+    
+    Returns:
+        dict: Zähler, Hit-Ratio und Füllstand
+    """
+    return sku_cache.status()
+
+
+@router.get(
+    "/loading",
+    summary="Loading-Strategien vergleichen",
+    description="Führt einen GET-Request mit jeder Loading-Strategie aus und vergleicht Queries, Zeilen und Laufzeit."
+)
+async def get_loading_comparison(
+    request: Request,
+    path: str = Query(description="API-Pfad inkl. Query-String, z.B. /api/v1/posts/with-authors?limit=100"),
+    repeat: int = Query(default=3, ge=1, le=20, description="Wiederholungen pro Strategie (Median)")
+):
+    """
+    Vergleicht lazy, selectin und joined für einen Request.
+    
+    Der Request läuft in-process, ohne Response-Cache und mit erzwungener
+    Strategie für alle Relationships (siehe ``app/core/loading.py``).
+    ``rows`` ist nur auf PostgreSQL aussagekräftig (SQLite meldet keine
+    Zeilenzahlen für SELECTs), ``bytes`` ist die Größe der Antwort.
+    
+    Returns:
+        dict: Kennzahlen pro Strategie und die schnellste als ``recommended``
+    """
+    return await compare_strategies(request.app, path, repeat)
@@ -12,17 +12,28 @@ Demonstriert:
 """
 
 import datetime
-from time import perf_counter
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select, SQLModel, desc, Field
 
-from app.database import get_session
-from app.models.user import User, UserCreate, UserRead, UserUpdate, UserStats
+from app.api.routes.posts import FIELDS_DESCRIPTION, POST_FIELDS
+from app.core.bulk import BulkBody, BulkPayload, chunked, insert_returning_ids
+from app.core.cache import cached, response_cache
+from app.core.etag import check_if_match, none_match, not_modified, user_etag
+from app.core.export import EXPORT_RESPONSES, ExportFormatEnum, export_response, stream_export
+from app.core.multiget import IDS_DESCRIPTION, check_ids, id_filter, in_requested_order, parse_ids, set_missing_header
+from app.core.pagination import PaginationModeEnum, paginate_keyset, set_cursor_headers
+from app.core.projection import FieldSet, json_response
+from app.core.serialization import USER_BATCH_SERIALIZER, USER_LIST_SERIALIZER
+from app.database import get_read_session, get_session, read_engine_for
+from app.models.user import User, UserBatchResponse, UserCreate, UserRead, UserUpdate, UserStats
 from app.models.post import Post, PostRead
+from app.models.bulk import BulkCreateResult, BulkItemError, IdsRequest
 
 
 # Router erstellen mit Prefix und Tags für Swagger UI
@@ -31,6 +42,20 @@ router = APIRouter(
     tags=["Users"]
 )
 
+# Felder für ?fields= beim Export
+USER_FIELDS = FieldSet(User, UserRead)
+
+
+def select_users_by_ids(ids: list[int], dialect_name: str):
+    """Ein SELECT für alle ``ids`` (Reihenfolge: siehe ``in_requested_order``)."""
+    return select(User).where(id_filter(User.id, ids, dialect_name))
+
+
+def fetch_users_by_ids(session: Session, ids: list[int]) -> tuple[list[User], list[int]]:
+    """User zu ``ids`` in angefragter Reihenfolge plus fehlende IDs."""
+    users = session.exec(select_users_by_ids(ids, session.get_bind().dialect.name)).all()
+    return in_requested_order(users, ids)
+
 
 @router.post(
     "/",
@@ -80,6 +105,80 @@ def create_user(
 
 
 
+@router.post(
+    "/bulk",
+    response_model=BulkCreateResult,
+    status_code=status.HTTP_201_CREATED,
+    summary="Viele User erstellen",
+    description="Erstellt viele User auf einmal aus einem JSON-Array oder NDJSON-Stream.",
+    openapi_extra=BulkBody.openapi(UserCreate)
+)
+def create_users_bulk(
+    payload: BulkPayload = Depends(BulkBody(UserCreate)),
+    session: Session = Depends(get_session)
+):
+    """
+    Erstellt viele User mit wenigen Round Trips.
+    
+    Pro Block von Einträgen gibt es genau eine Query für bereits
+    vergebene Emails und ein mehrzeiliges ``INSERT ... RETURNING id``.
+    Jeder Block wird einzeln committet, damit Transaktionen kurz bleiben.
+    
+    Ungültige Einträge und doppelte Emails (im Request oder in der
+    Datenbank) werden übersprungen und mit ihrem Index gemeldet.
+    
+    Args:
+        payload: Geparster Body (Content-Type application/json oder application/x-ndjson)
+        session: Datenbank-Session (wird automatisch injiziert)
+    
+    Returns:
+        BulkCreateResult: Anzahl, neue IDs und Fehler pro Eintrag
+    """
+    errors = list(payload.errors)
+    ids = []
+    seen_emails = set()
+    now = datetime.datetime.now(datetime.UTC)
+    
+    for chunk in chunked(payload.items):
+        candidates = []
+        for index, user in chunk:
+            if user.email in seen_emails:
+                errors.append(BulkItemError(index=index, detail=f"Email '{user.email}' kommt im Request mehrfach vor"))
+                continue
+            seen_emails.add(user.email)
+            candidates.append((index, user))
+        
+        # Eine Query für alle Emails des Blocks
+        existing_emails = set(session.exec(
+            select(User.email).where(User.email.in_([user.email for _, user in candidates]))
+        ).all())
+        
+        rows = []
+        for index, user in candidates:
+            if user.email in existing_emails:
+                errors.append(BulkItemError(index=index, detail=f"User with email '{user.email}' already exists"))
+            else:
+                rows.append((index, {**user.model_dump(), "created_at": now}))
+        if not rows:
+            continue
+        
+        try:
+            new_ids = insert_returning_ids(session, User, [row for _, row in rows])
+            session.commit()
+        except IntegrityError:
+            # z.B. parallel angelegte Email - der ganze Block wird verworfen
+            session.rollback()
+            errors.extend(
+                BulkItemError(index=index, detail="Konflikt beim Einfügen (Email inzwischen vergeben?)")
+                for index, _ in rows
+            )
+            continue
+        ids.extend(new_ids)
+    
+    errors.sort(key=lambda error: error.index)
+    return BulkCreateResult(created=len(ids), ids=ids, errors=errors)
+
+
 @router.get(
     "/",
     response_model=list[UserRead],
@@ -87,9 +186,11 @@ def create_user(
     description="Ruft eine Liste aller User ab mit optionaler Pagination."
 )
 def get_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    session: Session = Depends(get_session)
+    ids: str | None = Query(default=None, description=IDS_DESCRIPTION),
+    session: Session = Depends(get_read_session)
 ):
     """
     Ruft eine Liste aller User ab.
@@ -97,40 +198,73 @@ def get_users(
     Args:
         skip: Anzahl der zu überspringenden Einträge (für Pagination)
         limit: Maximale Anzahl der zurückzugebenden Einträge
+        ids: Nur diese User, in dieser Reihenfolge (eine Query statt
+            ``GET /users/{id}`` pro User); fehlende IDs im Header
+            ``X-Missing-Ids``
         session: Datenbank-Session (wird automatisch injiziert)
     
     Returns:
         list[UserRead]: Liste aller User
     """
+    if ids is not None:
+        users, missing = fetch_users_by_ids(session, parse_ids(ids))
+        set_missing_header(response, missing)
+        return USER_LIST_SERIALIZER.respond(users, headers=response.headers)
     
     # Alle User mit Pagination abrufen
     statement = select(User).offset(skip).limit(limit)
     users = session.exec(statement).all()
     
-    return users
+    return USER_LIST_SERIALIZER.respond(users)
+
+
+@router.post(
+    "/batch",
+    response_model=UserBatchResponse,
+    summary="User zu einer ID-Liste abrufen",
+    description="Lädt alle angefragten User mit einer Query, in angefragter Reihenfolge, und meldet fehlende IDs."
+)
+def get_users_batch(
+    request: IdsRequest,
+    session: Session = Depends(get_read_session)
+):
+    """
+    Wie ``GET /users?ids=...``, aber mit den IDs im Body - für lange Listen.
+    
+    Returns:
+        UserBatchResponse: Gefundene User und fehlende IDs
+    """
+    users, missing = fetch_users_by_ids(session, check_ids(request.ids))
+    return USER_BATCH_SERIALIZER.respond({"items": users, "missing": missing})
 
 
 @router.get(
     "/stats",
     response_model=list[UserStats],
     summary="User-Statistiken abrufen",
-    description="Gibt alle User mit Anzahl ihrer Posts zurück."
+    description="Gibt die User mit den meisten Posts zurück (Top-N, Cursor-Pagination)."
 )
 def get_user_stats(
-    session: Session = Depends(get_session)
+    response: Response,
+    session: Session = Depends(get_read_session),
+    limit: int = Query(default=100, ge=1, le=1000, description="Max. Anzahl User pro Seite"),
+    cursor: str | None = Query(default=None, description="Cursor aus X-Next-Cursor/X-Prev-Cursor")
 ):
     """
-    Gibt alle User mit Anzahl ihrer Posts zurück.
+    Gibt User sortiert nach Anzahl ihrer Posts zurück (absteigend).
 
     Parameters:
         - **session**: Datenbank-Session (wird automatisch injiziert)
+        - **limit**: Einträge pro Seite (1-1000)
+        - **cursor**: Cursor für die nächste/vorherige Seite
+
+    Die Cursor für die Nachbarseiten stehen in den Response-Headern
+    ``X-Next-Cursor`` und ``X-Prev-Cursor``.
 
     Returns:
         list[UserStats]: Liste von User-Statistiken
     """
 
-    t0 = perf_counter()
-
     # # Weg 1: Relationship nutzen (ineffizient bei vielen Usern)
     # users = session.exec(select(User)).all()
     # user_stats = []
@@ -143,26 +277,75 @@ def get_user_stats(
     #         post_count=post_count
     #     ))
 
-    # Weg 2: Query mit JOIN und COUNT (effizienter bei vielen Usern)
-    statement = (
-        select(User.id, User.name, User.email, func.count(Post.id).label("post_count"))
-        .join(Post, isouter=True)
-        .group_by(User.id)
-        .order_by(desc("post_count"))
+    # # Weg 2: Query mit JOIN und COUNT (Full Scan beider Tabellen bei jedem Aufruf)
+    # statement = (
+    #     select(User.id, User.name, User.email, func.count(Post.id).label("post_count"))
+    #     .join(Post, isouter=True)
+    #     .group_by(User.id)
+    #     .order_by(desc("post_count"))
+    # )
+
+    # Weg 3: Denormalisierter Zähler users.post_count (per Trigger gepflegt)
+    # Top-N kommt direkt aus dem Index (post_count, id) - kein JOIN, kein Scan
+    statement = select(User.id, User.name, User.email, User.post_count)
+    page = paginate_keyset(
+        session,
+        statement,
+        sort_column=User.post_count,
+        id_column=User.id,
+        descending=True,
+        limit=limit,
+        cursor=cursor
     )
-    user_stats = [
+    set_cursor_headers(response, page)
+
+    return [
         UserStats(
             id=row.id,
             username=row.name,
             email=row.email,
             post_count=row.post_count
         )
-        for row in session.exec(statement).all()
+        for row in page.items
     ]
 
-    print(f"Query-Dauer: {perf_counter() - t0:.2f} Sekunden")
 
-    return user_stats
+@router.get(
+    "/export",
+    summary="User exportieren",
+    description="Streamt alle User als NDJSON oder CSV.",
+    response_class=StreamingResponse,
+    responses=EXPORT_RESPONSES
+)
+def export_users(
+    request: Request,
+    is_active: bool | None = Query(default=None, description="Nur aktive/inaktive User"),
+    fields: str | None = Query(default=None, description="Komma-getrennte Felder, z.B. id,email (Default: alle)"),
+    export_format: ExportFormatEnum = Query(default=ExportFormatEnum.ndjson, alias="format",
+                                            description="ndjson (eine JSON-Zeile pro User) oder csv")
+):
+    """
+    Exportiert User (sortiert nach ID) als Stream.
+    
+    Args:
+        request: Für die Wahl von Replica oder Primary
+        is_active: Optionaler Filter
+        fields: Nur diese Spalten exportieren
+        export_format: ndjson oder csv (mit Kopfzeile)
+    
+    Returns:
+        StreamingResponse: Blockweise per serverseitigem Cursor gelesen,
+        konstanter Speicher (siehe ``app/core/export.py``)
+    """
+    selected = USER_FIELDS.parse(fields)
+    statement = USER_FIELDS.select(selected).order_by(User.id)
+    if is_active is not None:
+        statement = statement.where(User.is_active == is_active)
+    return export_response(
+        stream_export(read_engine_for(request), statement, selected, export_format),
+        export_format,
+        "users"
+    )
 
 
 @router.get(
@@ -171,9 +354,12 @@ def get_user_stats(
     summary="User nach ID abrufen",
     description="Ruft einen einzelnen User anhand seiner ID ab."
 )
+@cached(UserRead, tags=lambda params, user: [f"user:{user.id}"])
 def get_user(
     user_id: int,
-    session: Session = Depends(get_session)
+    response: Response,
+    session: Session = Depends(get_read_session),
+    if_none_match: str | None = Header(default=None, description="ETag einer früheren Antwort (304, falls unverändert)")
 ):
     """
     Ruft einen User anhand seiner ID ab.
@@ -181,6 +367,7 @@ def get_user(
     Args:
         user_id: Die ID des Users
         session: Datenbank-Session (wird automatisch injiziert)
+        if_none_match: ETag einer früheren Antwort - unverändert -> 304 ohne Body
     
     Returns:
         UserRead: Der gefundene User
@@ -198,6 +385,11 @@ def get_user(
             detail=f"User with id {user_id} not found"
         )
     
+    etag = user_etag(user)
+    if none_match(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    
     return user
 
 
@@ -211,7 +403,9 @@ def get_user(
 def update_user(
     user_id: int,
     user_update: UserUpdate,
-    session: Session = Depends(get_session)
+    response: Response,
+    session: Session = Depends(get_session),
+    if_match: str | None = Header(default=None, description="ETag aus GET /users/{user_id} (Optimistic Locking)")
 ):
     """
     Aktualisiert einen User teilweise.
@@ -223,23 +417,27 @@ def update_user(
         user_id: Die ID des zu aktualisierenden Users
         user_update: UserUpdate Modell mit zu ändernden Feldern
         session: Datenbank-Session (wird automatisch injiziert)
+        if_match: ETag des zuletzt gelesenen Stands - nur speichern, wenn unverändert
     
     Returns:
-        UserRead: Der aktualisierte User
+        UserRead: Der aktualisierte User (neues ETag im Header)
     
     Raises:
         HTTPException 404: Wenn User nicht gefunden wurde
         HTTPException 409: Wenn neue Email bereits existiert
+        HTTPException 412: Wenn If-Match nicht zum aktuellen Stand passt
     """
     
-    # User aus Datenbank abrufen
-    db_user = session.get(User, user_id)
+    # User aus Datenbank abrufen - mit If-Match gesperrt (FOR UPDATE),
+    # damit zwischen Prüfung und COMMIT niemand dazwischen schreibt
+    db_user = session.get(User, user_id, with_for_update=if_match is not None)
     
     if not db_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"User with id {user_id} not found"
         )
+    check_if_match(if_match, user_etag(db_user))
     
     # Nur gesetzte Felder extrahieren (exclude_unset=True)
     update_data = user_update.model_dump(exclude_unset=True)
@@ -269,6 +467,9 @@ def update_user(
     # In Datenbank speichern (session.add() nicht nötig, da Objekt bereits getrackt wird)
     session.commit()
     session.refresh(db_user)
+    # Auch Post-Details (eingebetteter Author) hängen am Tag user:<id>
+    response_cache.invalidate(f"user:{user_id}")
+    response.headers["ETag"] = user_etag(db_user)
     
     return db_user
 
@@ -313,6 +514,7 @@ def delete_user(
     # User löschen (session.delete() funktioniert wie session.add() - Objekt wird getrackt)
     session.delete(db_user)
     session.commit()
+    response_cache.invalidate(f"user:{user_id}")
 
 
 
@@ -324,20 +526,29 @@ def delete_user(
 )
 def get_user_posts(
     user_id: int,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     skip: int = Query(default=0, ge=0, description="Anzahl zu überspringender Posts"),
-    limit: int = Query(default=20, ge=1, le=100, description="Max. Anzahl zurückzugebender Posts")
+    limit: int = Query(default=20, ge=1, le=100, description="Max. Anzahl zurückzugebender Posts"),
+    cursor: str | None = Query(default=None, description="Cursor aus X-Next-Cursor/X-Prev-Cursor (ersetzt skip)"),
+    pagination: PaginationModeEnum = Query(default=PaginationModeEnum.offset, description="Pagination-Modus"),
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION)
 ):
     """
-    Gibt alle Posts eines Users zurück.
+    Gibt alle Posts eines Users zurück (sortiert nach ID).
     
     Parameters:
         - **user_id**: ID des Users
         - **skip**: Anzahl zu überspringender Posts (für Pagination)
         - **limit**: Maximale Anzahl zurückzugebender Posts (1-100)
+        - **cursor**: Cursor für Keyset-Pagination (aktiviert den Cursor-Modus)
+        - **pagination**: offset oder cursor
+        - **fields**: Nur diese Felder laden und zurückgeben (z.B. ohne ``content``)
+    
+    Im Cursor-Modus stehen die Cursor für die Nachbarseiten in den
+    Response-Headern ``X-Next-Cursor`` und ``X-Prev-Cursor``.
     
     Returns:
-        list[PostRead]: Liste von Posts des Users
+        list[PostRead]: Liste von Posts des Users (bzw. die gewählten Felder)
     
     Raises:
         404: User mit der angegebenen ID existiert nicht
@@ -350,10 +561,28 @@ def get_user_posts(
             detail=f"User with id {user_id} not found"
         )
     
-    # Posts des Users abrufen
-    statement = select(Post).where(Post.user_id == user_id).offset(skip).limit(limit)
-    posts = session.exec(statement).all()
+    # Posts des Users abrufen - nur die gewählten Spalten, ohne ORM-Objekte
+    selected = POST_FIELDS.parse(fields)
+    statement = POST_FIELDS.select(selected, "id").where(Post.user_id == user_id)
+
+    if cursor is not None or pagination == PaginationModeEnum.cursor:
+        page = paginate_keyset(
+            session,
+            statement,
+            sort_column=Post.id,
+            id_column=Post.id,
+            descending=False,
+            limit=limit,
+            cursor=cursor,
+            scope={"user_id": user_id}
+        )
+        result = json_response(POST_FIELDS.rows(page.items, selected))
+        set_cursor_headers(result, page)
+        return result
+
+    statement = statement.order_by(Post.id).offset(skip).limit(limit)
+    rows = session.exec(statement).all()
     
-    return posts
+    return json_response(POST_FIELDS.rows(rows, selected))
     
     # Kein Return bei 204 No Content
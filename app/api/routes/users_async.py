@@ -0,0 +1,326 @@
+"""
+User API Routes (async)
+=======================
+Async-Varianten der User-Endpunkte für ``DB_ASYNC=True``.
+
+Gleiche Pfade, Parameter und Response-Modelle wie in ``users.py``,
+aber mit ``AsyncSession`` statt blockierender Session.
+"""
+
+import datetime
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.routes.posts import FIELDS_DESCRIPTION, POST_FIELDS
+from app.api.routes.users import USER_FIELDS, select_users_by_ids
+from app.core.cache import cached, response_cache
+from app.core.etag import check_if_match, none_match, not_modified, user_etag
+from app.core.export import EXPORT_RESPONSES, ExportFormatEnum, export_response, stream_export_async
+from app.core.multiget import IDS_DESCRIPTION, check_ids, in_requested_order, parse_ids, set_missing_header
+from app.core.pagination import PaginationModeEnum, paginate_keyset_async, set_cursor_headers
+from app.core.projection import json_response
+from app.core.serialization import USER_BATCH_SERIALIZER, USER_LIST_SERIALIZER
+from app.database import async_read_engine_for, get_async_read_session, get_async_session
+from app.models.bulk import IdsRequest
+from app.models.user import User, UserBatchResponse, UserCreate, UserRead, UserUpdate, UserStats
+from app.models.post import Post, PostRead
+
+
+router = APIRouter(
+    prefix="/users",
+    tags=["Users"]
+)
+
+
+async def fetch_users_by_ids(session: AsyncSession, ids: list[int]) -> tuple[list[User], list[int]]:
+    """Async-Variante von ``users.fetch_users_by_ids``."""
+    users = (await session.exec(select_users_by_ids(ids, session.bind.dialect.name))).all()
+    return in_requested_order(users, ids)
+
+
+@router.post(
+    "/",
+    response_model=UserRead,
+    status_code=status.HTTP_201_CREATED,
+    summary="Neuen User erstellen",
+    description="Erstellt einen neuen User in der Datenbank."
+)
+async def create_user(
+    user: UserCreate,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Async-Variante von ``users.create_user``."""
+    existing_user = (await session.exec(
+        select(User).where(User.email == user.email)
+    )).first()
+
+    if existing_user:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"User with email '{user.email}' already exists"
+        )
+
+    db_user = User.model_validate(user)
+
+    session.add(db_user)
+    await session.commit()
+    await session.refresh(db_user)
+
+    return db_user
+
+
+@router.get(
+    "/",
+    response_model=list[UserRead],
+    summary="Alle User abrufen",
+    description="Ruft eine Liste aller User ab mit optionaler Pagination."
+)
+async def get_users(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    ids: str | None = Query(default=None, description=IDS_DESCRIPTION),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    """Async-Variante von ``users.get_users``."""
+    if ids is not None:
+        users, missing = await fetch_users_by_ids(session, parse_ids(ids))
+        set_missing_header(response, missing)
+        return USER_LIST_SERIALIZER.respond(users, headers=response.headers)
+
+    statement = select(User).offset(skip).limit(limit)
+    users = (await session.exec(statement)).all()
+
+    return USER_LIST_SERIALIZER.respond(users)
+
+
+@router.post(
+    "/batch",
+    response_model=UserBatchResponse,
+    summary="User zu einer ID-Liste abrufen",
+    description="Lädt alle angefragten User mit einer Query, in angefragter Reihenfolge, und meldet fehlende IDs."
+)
+async def get_users_batch(
+    request: IdsRequest,
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    """Async-Variante von ``users.get_users_batch``."""
+    users, missing = await fetch_users_by_ids(session, check_ids(request.ids))
+    return USER_BATCH_SERIALIZER.respond({"items": users, "missing": missing})
+
+
+@router.get(
+    "/stats",
+    response_model=list[UserStats],
+    summary="User-Statistiken abrufen",
+    description="Gibt die User mit den meisten Posts zurück (Top-N, Cursor-Pagination)."
+)
+async def get_user_stats(
+    response: Response,
+    session: AsyncSession = Depends(get_async_read_session),
+    limit: int = Query(default=100, ge=1, le=1000, description="Max. Anzahl User pro Seite"),
+    cursor: str | None = Query(default=None, description="Cursor aus X-Next-Cursor/X-Prev-Cursor")
+):
+    """Async-Variante von ``users.get_user_stats``."""
+    statement = select(User.id, User.name, User.email, User.post_count)
+    page = await paginate_keyset_async(
+        session,
+        statement,
+        sort_column=User.post_count,
+        id_column=User.id,
+        descending=True,
+        limit=limit,
+        cursor=cursor
+    )
+    set_cursor_headers(response, page)
+
+    return [
+        UserStats(
+            id=row.id,
+            username=row.name,
+            email=row.email,
+            post_count=row.post_count
+        )
+        for row in page.items
+    ]
+
+
+@router.get(
+    "/export",
+    summary="User exportieren",
+    description="Streamt alle User als NDJSON oder CSV.",
+    response_class=StreamingResponse,
+    responses=EXPORT_RESPONSES
+)
+async def export_users(
+    request: Request,
+    is_active: bool | None = Query(default=None, description="Nur aktive/inaktive User"),
+    fields: str | None = Query(default=None, description="Komma-getrennte Felder, z.B. id,email (Default: alle)"),
+    export_format: ExportFormatEnum = Query(default=ExportFormatEnum.ndjson, alias="format",
+                                            description="ndjson (eine JSON-Zeile pro User) oder csv")
+):
+    """Async-Variante von ``users.export_users``."""
+    selected = USER_FIELDS.parse(fields)
+    statement = USER_FIELDS.select(selected).order_by(User.id)
+    if is_active is not None:
+        statement = statement.where(User.is_active == is_active)
+    return export_response(
+        stream_export_async(async_read_engine_for(request), statement, selected, export_format),
+        export_format,
+        "users"
+    )
+
+
+@router.get(
+    "/{user_id}",
+    response_model=UserRead,
+    summary="User nach ID abrufen",
+    description="Ruft einen einzelnen User anhand seiner ID ab."
+)
+@cached(UserRead, tags=lambda params, user: [f"user:{user.id}"])
+async def get_user(
+    user_id: int,
+    response: Response,
+    session: AsyncSession = Depends(get_async_read_session),
+    if_none_match: str | None = Header(default=None, description="ETag einer früheren Antwort (304, falls unverändert)")
+):
+    """Async-Variante von ``users.get_user``."""
+    user = await session.get(User, user_id)
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with id {user_id} not found"
+        )
+
+    etag = user_etag(user)
+    if none_match(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
+    return user
+
+
+@router.patch(
+    "/{user_id}",
+    response_model=UserRead,
+    summary="User aktualisieren",
+    description="Aktualisiert einen User teilweise (Partial Update)."
+)
+async def update_user(
+    user_id: int,
+    user_update: UserUpdate,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session),
+    if_match: str | None = Header(default=None, description="ETag aus GET /users/{user_id} (Optimistic Locking)")
+):
+    """Async-Variante von ``users.update_user``."""
+    db_user = await session.get(User, user_id, with_for_update=if_match is not None)
+
+    if not db_user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with id {user_id} not found"
+        )
+    check_if_match(if_match, user_etag(db_user))
+
+    update_data = user_update.model_dump(exclude_unset=True)
+
+    if "email" in update_data:
+        existing_user = (await session.exec(
+            select(User).where(
+                User.email == update_data["email"],
+                User.id != user_id
+            )
+        )).first()
+
+        if existing_user:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"User with email '{update_data['email']}' already exists"
+            )
+
+    for key, value in update_data.items():
+        setattr(db_user, key, value)
+
+    db_user.updated_at = datetime.datetime.now(datetime.UTC)
+
+    await session.commit()
+    await session.refresh(db_user)
+    # Auch Post-Details (eingebetteter Author) hängen am Tag user:<id>
+    response_cache.invalidate(f"user:{user_id}")
+    response.headers["ETag"] = user_etag(db_user)
+
+    return db_user
+
+
+@router.delete(
+    "/{user_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="User löschen",
+    description="Löscht einen User permanent aus der Datenbank (Hard Delete)."
+)
+async def delete_user(
+    user_id: int,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Async-Variante von ``users.delete_user``."""
+    db_user = await session.get(User, user_id)
+
+    if not db_user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with id {user_id} not found"
+        )
+
+    await session.delete(db_user)
+    await session.commit()
+    response_cache.invalidate(f"user:{user_id}")
+
+
+@router.get(
+    "/{user_id}/posts",
+    response_model=list[PostRead],
+    summary="Posts eines Users abrufen",
+    description="Gibt alle Posts eines bestimmten Users zurück."
+)
+async def get_user_posts(
+    user_id: int,
+    session: AsyncSession = Depends(get_async_read_session),
+    skip: int = Query(default=0, ge=0, description="Anzahl zu überspringender Posts"),
+    limit: int = Query(default=20, ge=1, le=100, description="Max. Anzahl zurückzugebender Posts"),
+    cursor: str | None = Query(default=None, description="Cursor aus X-Next-Cursor/X-Prev-Cursor (ersetzt skip)"),
+    pagination: PaginationModeEnum = Query(default=PaginationModeEnum.offset, description="Pagination-Modus"),
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION)
+):
+    """Async-Variante von ``users.get_user_posts``."""
+    db_user = await session.get(User, user_id)
+    if not db_user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with id {user_id} not found"
+        )
+
+    selected = POST_FIELDS.parse(fields)
+    statement = POST_FIELDS.select(selected, "id").where(Post.user_id == user_id)
+
+    if cursor is not None or pagination == PaginationModeEnum.cursor:
+        page = await paginate_keyset_async(
+            session,
+            statement,
+            sort_column=Post.id,
+            id_column=Post.id,
+            descending=False,
+            limit=limit,
+            cursor=cursor,
+            scope={"user_id": user_id}
+        )
+        result = json_response(POST_FIELDS.rows(page.items, selected))
+        set_cursor_headers(result, page)
+        return result
+
+    statement = statement.order_by(Post.id).offset(skip).limit(limit)
+    return json_response(POST_FIELDS.rows((await session.exec(statement)).all(), selected))
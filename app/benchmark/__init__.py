@@ -0,0 +1,11 @@
+"""
+Benchmark Suite
+===============
+Reproduzierbare Last- und Latenzmessung für alle User- und Post-Endpunkte.
+
+Usage:
+    python -m app.benchmark --users 10000 --output bench/baseline.json
+    python -m app.benchmark --skip-seed --compare bench/baseline.json
+
+Siehe ``python -m app.benchmark --help`` für alle Optionen.
+"""
@@ -0,0 +1,107 @@
+"""
+Benchmark CLI
+=============
+Erzeugt (optional) einen Datensatz, führt alle Szenarien aus und
+speichert/vergleicht die Ergebnisse.
+
+Usage:
+    python -m app.benchmark --url sqlite:///bench.db --users 2000
+    python -m app.benchmark --skip-seed --mode both --concurrency 16 --compare bench/baseline.json
+    python -m app.benchmark --skip-seed --cache --output bench/cached.json
+
+Im Modus ``inprocess`` läuft der Response-Cache nur mit ``--cache`` -
+sonst würden die meisten Szenarien nur Cache-Treffer messen (0 Queries).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark für die User- und Post-Endpunkte.")
+    parser.add_argument("--url", default=None, help="Datenbank-URL (Default: aus Settings)")
+    parser.add_argument("--users", type=int, default=1000, help="Anzahl User beim Seeden")
+    parser.add_argument("--posts-per-user", default="5:10", metavar="MIN:MAX")
+    parser.add_argument("--seed", type=int, default=42, help="Seed für den Datensatz")
+    parser.add_argument("--skip-seed", action="store_true", help="Vorhandene Daten verwenden")
+    parser.add_argument("--mode", choices=["inprocess", "http", "both"], default="inprocess")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="Server für --mode http")
+    parser.add_argument("--requests", type=int, default=200, help="Gemessene Requests pro Szenario")
+    parser.add_argument("--warmup", type=int, default=10, help="Ungemessene Requests vorab")
+    parser.add_argument("--concurrency", type=int, default=8, help="Parallele Requests")
+    parser.add_argument("--scenarios", default="", help="Nur Szenarien, deren Name diesen Text enthält")
+    parser.add_argument("--cache", action="store_true", help="Response-Cache im Modus inprocess aktiv lassen")
+    parser.add_argument("--output", type=Path, default=Path("bench/latest.json"), help="Ergebnis-Datei")
+    parser.add_argument("--compare", type=Path, default=None, help="Baseline zum Vergleichen")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Erlaubte p95-Verschlechterung (0.2 = 20%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    # Vor dem ersten App-Import setzen - die Settings werden beim Import gelesen
+    if args.url:
+        os.environ["DATABASE_URL"] = args.url
+    os.environ.setdefault("DB_ECHO", "False")
+    # Gemessen wird die Arbeit der Endpunkte, nicht der Cache (siehe --cache)
+    if not args.cache:
+        os.environ["CACHE_BACKEND"] = "none"
+
+    from app.benchmark.runner import build_report, compare_reports, run_all, save_report
+    from app.benchmark.scenarios import build_scenarios, load_dataset
+    from app.core.config import settings
+    from app.create_performance_testdata import config_from_args, generate
+    from app.create_performance_testdata import parse_args as generator_args
+    from sqlmodel import create_engine
+
+    url = settings.database_url
+    if not args.skip_seed:
+        generator = generator_args([
+            "--url", url, "--users", str(args.users), "--posts-per-user", args.posts_per_user,
+            "--seed", str(args.seed), "--yes",
+        ])
+        print(f"🌱 Seede {args.users:,} User...")
+        generate(config_from_args(generator), users=args.users, products=0, workers=1)
+
+    dataset = load_dataset(create_engine(url))
+    scenarios = [s for s in build_scenarios(dataset) if args.scenarios in s.name]
+    modes = ["inprocess", "http"] if args.mode == "both" else [args.mode]
+
+    results = {}
+    for mode in modes:
+        print(f"\n🏁 Modus: {mode} ({args.requests} Requests, Parallelität {args.concurrency})")
+        results[mode] = asyncio.run(run_all(
+            scenarios, mode, args.requests, args.concurrency, args.warmup, args.base_url
+        ))
+
+    report = build_report(results, meta={
+        "database": url.split("@")[-1],
+        "users": dataset.user_ids[1] - dataset.user_ids[0] + 1,
+        "posts": dataset.post_count,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        # Nur für inprocess aussagekräftig - im http-Modus zählt die Server-Konfiguration
+        "cache": settings.CACHE_BACKEND,
+        "fast_json": settings.FAST_JSON,
+    })
+    save_report(report, args.output)
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare_reports(baseline, report, args.threshold)
+        if regressions:
+            print("\n❌ Regressionen gefunden:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print("\n✅ Keine Regressionen.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""
+Benchmark-Runner
+================
+Führt Szenarien mit fester Parallelität aus, berechnet Perzentile und
+vergleicht Ergebnisse mit einer gespeicherten JSON-Baseline.
+
+Zwei Modi:
+- ``inprocess``: Requests gehen über ``httpx.ASGITransport`` direkt an die
+  App im selben Prozess - Query-Anzahl und Zeilen werden mitgezählt.
+- ``http``: Requests gehen an einen laufenden Server (``--base-url``),
+  misst zusätzlich Netzwerk und uvicorn. Die Query-Anzahl kommt dort
+  aus dem ``X-DB-Queries``-Header.
+"""
+
+import asyncio
+import datetime
+import json
+import platform
+import statistics
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from time import perf_counter
+
+import httpx
+
+from app.benchmark.scenarios import Scenario
+from app.core.query_stats import collect_queries
+
+
+@dataclass
+class ScenarioResult:
+    """Kennzahlen eines Szenarios in einem Modus."""
+
+    requests: int
+    errors: int
+    concurrency: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    throughput_rps: float
+    queries_per_request: float | None
+    rows_per_request: float | None
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Perzentil per linearer Interpolation (``fraction`` in [0, 1])."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+async def run_scenario(
+        client: httpx.AsyncClient,
+        scenario: Scenario,
+        requests: int,
+        concurrency: int,
+        warmup: int,
+        count_queries: bool
+) -> ScenarioResult:
+    """
+    Führt ein Szenario aus: erst ``warmup`` Aufrufe ohne Messung,
+    dann ``requests`` gemessene Aufrufe mit ``concurrency`` parallel.
+    """
+    if scenario.prepare is not None:
+        await scenario.prepare(client, warmup + requests)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    query_counts: list[int] = []
+    row_counts: list[int] = []
+    errors = 0
+
+    async def call(i: int, measure: bool):
+        nonlocal errors
+        spec = scenario.build(i)
+        async with semaphore:
+            # Jeder Task hat seinen eigenen Context -> eigener Query-Sammler
+            with collect_queries() as stats:
+                start = perf_counter()
+                response = await client.request(spec.method, spec.url, params=spec.params, json=spec.json)
+                elapsed = perf_counter() - start
+        if not measure:
+            return
+        if response.status_code >= 400:
+            errors += 1
+        latencies.append(elapsed)
+        if count_queries:
+            query_counts.append(stats.queries)
+            row_counts.append(stats.rows)
+        elif "X-DB-Queries" in response.headers:
+            # Gegen einen Server zählt dessen Middleware
+            query_counts.append(int(response.headers["X-DB-Queries"]))
+
+    await asyncio.gather(*(call(i, measure=False) for i in range(warmup)))
+
+    wall_start = perf_counter()
+    await asyncio.gather(*(call(warmup + i, measure=True) for i in range(requests)))
+    wall_time = perf_counter() - wall_start
+
+    latencies.sort()
+    return ScenarioResult(
+        requests=requests,
+        errors=errors,
+        concurrency=concurrency,
+        p50_ms=percentile(latencies, 0.50) * 1000,
+        p95_ms=percentile(latencies, 0.95) * 1000,
+        p99_ms=percentile(latencies, 0.99) * 1000,
+        mean_ms=statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        throughput_rps=requests / wall_time if wall_time else 0.0,
+        queries_per_request=statistics.fmean(query_counts) if query_counts else None,
+        rows_per_request=statistics.fmean(row_counts) if row_counts else None,
+    )
+
+
+async def run_all(
+        scenarios: list[Scenario],
+        mode: str,
+        requests: int,
+        concurrency: int,
+        warmup: int,
+        base_url: str
+) -> dict[str, ScenarioResult]:
+    """Führt alle Szenarien nacheinander in einem Modus aus."""
+    if mode == "inprocess":
+        from app.main import app  # erst hier importieren: Settings müssen schon gesetzt sein
+        transport = httpx.ASGITransport(app=app)
+        client = httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None)
+    else:
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=None,
+            limits=httpx.Limits(max_connections=concurrency)
+        )
+
+    results = {}
+    async with client:
+        for scenario in scenarios:
+            result = await run_scenario(
+                client, scenario, requests, concurrency, warmup, count_queries=mode == "inprocess"
+            )
+            results[scenario.name] = result
+            print(
+                f"  {scenario.name:<32} p50 {result.p50_ms:8.2f}ms  p95 {result.p95_ms:8.2f}ms  "
+                f"p99 {result.p99_ms:8.2f}ms  {result.throughput_rps:8.1f} req/s"
+                + (f"  {result.queries_per_request:6.1f} q/req" if result.queries_per_request is not None else "")
+                + (f"  ⚠️ {result.errors} Fehler" if result.errors else "")
+            )
+    return results
+
+
+def build_report(results: dict[str, dict[str, ScenarioResult]], meta: dict) -> dict:
+    """Baut das JSON-Dokument (Metadaten + Ergebnisse je Modus und Szenario)."""
+    return {
+        "meta": {
+            "created_at": datetime.datetime.now(datetime.UTC).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            **meta,
+        },
+        "results": {
+            mode: {name: asdict(result) for name, result in mode_results.items()}
+            for mode, mode_results in results.items()
+        },
+    }
+
+
+def save_report(report: dict, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"💾 Ergebnisse gespeichert: {path}")
+
+
+def _format_queries(value: float | None) -> str:
+    # http-Modus bzw. Server ohne X-DB-Queries: keine Zahl vorhanden
+    return "n/a" if value is None else f"{value:.1f}"
+
+
+def compare_reports(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """
+    Vergleicht zwei Reports und gibt die gefundenen Regressionen zurück.
+
+    Regression = p95 um mehr als ``threshold`` (z.B. 0.2 = 20%) gestiegen,
+    mehr Queries pro Request als vorher, oder neue Fehler.
+    """
+    regressions = []
+    print(f"\n📊 Vergleich mit Baseline vom {baseline['meta'].get('created_at', '?')}")
+    for key in ("database", "users", "posts", "concurrency", "cache", "fast_json"):
+        if baseline["meta"].get(key) != current["meta"].get(key):
+            print(f"  ⚠️  {key} weicht ab: {baseline['meta'].get(key)} -> {current['meta'].get(key)} "
+                  f"(Werte nur bedingt vergleichbar)")
+
+    for mode, scenarios in current["results"].items():
+        for name, result in scenarios.items():
+            old = baseline["results"].get(mode, {}).get(name)
+            if old is None:
+                continue
+            ratio = result["p95_ms"] / old["p95_ms"] if old["p95_ms"] else 1.0
+            marker = "  "
+            if ratio > 1 + threshold:
+                regressions.append(f"{mode}/{name}: p95 {old['p95_ms']:.2f}ms -> {result['p95_ms']:.2f}ms")
+                marker = "❌"
+            elif ratio < 1 - threshold:
+                marker = "✅"
+            if (result["queries_per_request"] or 0) > (old["queries_per_request"] or 0) + 0.5:
+                regressions.append(
+                    f"{mode}/{name}: Queries/Request {_format_queries(old['queries_per_request'])} "
+                    f"-> {_format_queries(result['queries_per_request'])}"
+                )
+                marker = "❌"
+            if result["errors"] > old["errors"]:
+                regressions.append(f"{mode}/{name}: Fehler {old['errors']} -> {result['errors']}")
+                marker = "❌"
+            print(f"  {marker} {mode}/{name:<32} p95 {old['p95_ms']:8.2f}ms -> {result['p95_ms']:8.2f}ms ({ratio:5.2f}x)")
+
+    return regressions
@@ -0,0 +1,186 @@
+"""
+Benchmark-Szenarien
+===================
+Ein Szenario beschreibt, welcher Request bei Aufruf Nummer ``i``
+gesendet wird. IDs werden aus dem vorhandenen Datensatz abgeleitet,
+damit die Requests über die ganze Tabelle streuen. Der Response-Cache
+ist dabei aus (``--cache`` in ``app.benchmark``), sonst messen die
+Listen-Szenarien nur Cache-Treffer.
+"""
+
+import random
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+import httpx
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from app.core.pagination import encode_cursor
+from app.models import Post, User
+
+
+@dataclass
+class RequestSpec:
+    """Ein einzelner HTTP-Request."""
+
+    method: str
+    url: str
+    params: dict | None = None
+    json: object = None
+
+
+@dataclass
+class Scenario:
+    """
+    Ein Benchmark-Szenario.
+
+    Attributes:
+        name: Eindeutiger Name (Schlüssel in der Baseline)
+        build: Erzeugt den Request für Aufruf Nummer ``i``
+        prepare: Optionale Vorbereitung (z.B. Objekte zum Löschen anlegen),
+            bekommt Client und Anzahl der geplanten Aufrufe
+    """
+
+    name: str
+    build: Callable[[int], RequestSpec]
+    prepare: Callable[[httpx.AsyncClient, int], Awaitable[None]] | None = None
+
+
+@dataclass
+class Dataset:
+    """Eckdaten des Datensatzes, aus denen die Szenarien IDs ableiten."""
+
+    user_ids: tuple[int, int]
+    post_ids: tuple[int, int]
+    post_count: int
+    deep_cursor: str | None = None
+    run_id: int = field(default_factory=lambda: random.randrange(1_000_000_000))
+
+
+def load_dataset(engine) -> Dataset:
+    """Liest ID-Bereiche und erzeugt einen Cursor tief in der Post-Liste."""
+    with Session(engine) as session:
+        min_user, max_user = session.exec(select(func.min(User.id), func.max(User.id))).one()
+        min_post, max_post = session.exec(select(func.min(Post.id), func.max(Post.id))).one()
+        post_count = session.exec(select(func.count(Post.id))).one()
+        if not max_user or not max_post:
+            raise SystemExit("❌ Keine Daten vorhanden - ohne --skip-seed starten.")
+
+        # Post an 90% der Liste (Default-Sortierung von /filtered: created_at desc)
+        deep_post = session.exec(
+            select(Post.created_at, Post.id)
+            .order_by(Post.created_at.desc(), Post.id.desc())
+            .offset(int(post_count * 0.9))
+            .limit(1)
+        ).first()
+
+    deep_cursor = None
+    if deep_post is not None:
+        deep_cursor = encode_cursor("created_at", True, deep_post.created_at, deep_post.id)
+
+    return Dataset(
+        user_ids=(min_user, max_user),
+        post_ids=(min_post, max_post),
+        post_count=post_count,
+        deep_cursor=deep_cursor,
+    )
+
+
+def build_scenarios(dataset: Dataset) -> list[Scenario]:
+    """Erzeugt Szenarien für alle Routen aus ``users.py`` und ``posts.py``."""
+    rng = random.Random(0)
+    user_ids = [rng.randint(*dataset.user_ids) for _ in range(1024)]
+    post_ids = [rng.randint(*dataset.post_ids) for _ in range(1024)]
+    deep_page = max(1, dataset.post_count // 10 - 1)
+    run = dataset.run_id
+
+    def user_id(i: int) -> int:
+        return user_ids[i % len(user_ids)]
+
+    def post_id(i: int) -> int:
+        return post_ids[i % len(post_ids)]
+
+    # Objekte, die von den DELETE-Szenarien gelöscht werden
+    deletable_users: list[int] = []
+    deletable_posts: list[int] = []
+
+    async def prepare_users(client: httpx.AsyncClient, count: int):
+        body = [{"name": f"bench_{run}_{i}", "email": f"delete-{run}-{i}@bench.example.com"} for i in range(count)]
+        response = await client.post("/api/v1/users/bulk", json=body)
+        response.raise_for_status()
+        deletable_users[:] = response.json()["ids"]
+
+    async def prepare_posts(client: httpx.AsyncClient, count: int):
+        body = [{"title": f"bench {i}", "content": "x", "user_id": dataset.user_ids[0]} for i in range(count)]
+        response = await client.post("/api/v1/posts/bulk", json=body)
+        response.raise_for_status()
+        deletable_posts[:] = response.json()["ids"]
+
+    return [
+        # Users
+        Scenario("users.create", lambda i: RequestSpec(
+            "POST", "/api/v1/users/", json={"name": f"bench_{i}", "email": f"create-{run}-{i}@bench.example.com"})),
+        Scenario("users.bulk_create_100", lambda i: RequestSpec("POST", "/api/v1/users/bulk", json=[
+            {"name": f"bulk_{i}_{j}", "email": f"bulk-{run}-{i}-{j}@bench.example.com"} for j in range(100)])),
+        Scenario("users.list", lambda i: RequestSpec("GET", "/api/v1/users/", params={"skip": 0, "limit": 100})),
+        Scenario("users.stats", lambda i: RequestSpec("GET", "/api/v1/users/stats")),
+        Scenario("users.get", lambda i: RequestSpec("GET", f"/api/v1/users/{user_id(i)}")),
+        # 100 Authors eines Feeds: ein Request statt 100x users.get
+        Scenario("users.multi_get_100", lambda i: RequestSpec(
+            "GET", "/api/v1/users/", params={"ids": ",".join(str(user_id(i * 100 + j)) for j in range(100))})),
+        Scenario("users.update", lambda i: RequestSpec(
+            "PATCH", f"/api/v1/users/{user_id(i)}", json={"is_active": i % 2 == 0})),
+        Scenario("users.delete", lambda i: RequestSpec("DELETE", f"/api/v1/users/{deletable_users[i]}"),
+                 prepare=prepare_users),
+        Scenario("users.posts", lambda i: RequestSpec("GET", f"/api/v1/users/{user_id(i)}/posts")),
+        Scenario("users.posts_cursor", lambda i: RequestSpec(
+            "GET", f"/api/v1/users/{user_id(i)}/posts", params={"pagination": "cursor"})),
+
+        # Posts
+        Scenario("posts.create", lambda i: RequestSpec(
+            "POST", "/api/v1/posts/", json={"title": f"bench {i}", "content": "x" * 500, "user_id": user_id(i)})),
+        Scenario("posts.bulk_create_100", lambda i: RequestSpec("POST", "/api/v1/posts/bulk", json=[
+            {"title": f"bulk {i} {j}", "content": "x" * 500, "user_id": user_id(i + j)} for j in range(100)])),
+        Scenario("posts.list", lambda i: RequestSpec("GET", "/api/v1/posts/", params={"limit": 100})),
+        Scenario("posts.list_cursor", lambda i: RequestSpec(
+            "GET", "/api/v1/posts/", params={"limit": 100, "pagination": "cursor"})),
+        Scenario("posts.list_fields", lambda i: RequestSpec(
+            "GET", "/api/v1/posts/", params={"limit": 100, "fields": "id,title,created_at"})),
+        *(
+            Scenario(f"posts.with_authors_{strategy}", lambda i, strategy=strategy: RequestSpec(
+                "GET", "/api/v1/posts/with-authors", params={"strategy": strategy}))
+            for strategy in ("auto", "lazy", "selectin", "joined")
+        ),
+        Scenario("posts.with_authors_normalized", lambda i: RequestSpec(
+            "GET", "/api/v1/posts/with-authors", params={"shape": "normalized"})),
+        Scenario("posts.filtered_first_page", lambda i: RequestSpec("GET", "/api/v1/posts/filtered")),
+        Scenario("posts.filtered_deep_page", lambda i: RequestSpec(
+            "GET", "/api/v1/posts/filtered", params={"page": deep_page})),
+        Scenario("posts.filtered_deep_cursor", lambda i: RequestSpec(
+            "GET", "/api/v1/posts/filtered", params={"cursor": dataset.deep_cursor})),
+        Scenario("posts.filtered_title", lambda i: RequestSpec(
+            "GET", "/api/v1/posts/filtered", params={"title": "lorem", "published": True})),
+        Scenario("posts.filtered_user", lambda i: RequestSpec(
+            "GET", "/api/v1/posts/filtered", params={"user_id": user_id(i), "sort_by": "title"})),
+        Scenario("posts.search", lambda i: RequestSpec(
+            "GET", "/api/v1/posts/search", params={"q": "lorem ipsum"})),
+        Scenario("posts.get", lambda i: RequestSpec("GET", f"/api/v1/posts/{post_id(i)}")),
+        # Ein UPDATE für 100 Posts statt 100x posts.update
+        Scenario("posts.bulk_update_100", lambda i: RequestSpec("PATCH", "/api/v1/posts/bulk", json={
+            "ids": [post_id(i * 100 + j) for j in range(100)], "update": {"published": i % 2 == 0}})),
+        Scenario("posts.batch_100", lambda i: RequestSpec(
+            "POST", "/api/v1/posts/batch", json={"ids": [post_id(i * 100 + j) for j in range(100)]})),
+        Scenario("posts.update", lambda i: RequestSpec(
+            "PATCH", f"/api/v1/posts/{post_id(i)}", json={"published": i % 2 == 0})),
+        Scenario("posts.delete", lambda i: RequestSpec("DELETE", f"/api/v1/posts/{deletable_posts[i]}"),
+                 prepare=prepare_posts),
+
+        # Products
+        # Gleiche 1.000 SKUs bei jedem Aufruf: erst Inserts, danach je zur Hälfte Updates/unverändert
+        Scenario("products.bulk_upsert_1000", lambda i: RequestSpec("PUT", "/api/v1/products/bulk", json=[
+            {"name": f"bench {j}", "price": 1 + j % 10 + (i % 2 if j < 500 else 0), "sku": f"BENCH-{run}-{j}"}
+            for j in range(1000)])),
+        Scenario("products.list_price_range", lambda i: RequestSpec(
+            "GET", "/api/v1/products/", params={"min_price": 2, "max_price": 5, "in_stock": True, "sort_by": "price"})),
+    ]
@@ -0,0 +1,133 @@
+"""
+Serialisierungs-Benchmark
+=========================
+Misst nur die JSON-Serialisierung (ohne Datenbank und HTTP) für die
+Response-Modelle der Listen-Endpunkte:
+
+- ``fastapi``: Standardweg von FastAPI (Validierung gegen das
+  ``response_model``, ``jsonable``-Dump, ``json.dumps``)
+- ``typeadapter``: eine Validierung plus ``dump_json`` (Response-Cache)
+- ``compiled``: vorkompilierter Serializer aus ``app.core.serialization``
+  mit orjson (``FAST_JSON=True``)
+
+Die Objekte sind echte ORM-Instanzen (ohne Session), das Ergebnis ist
+also mit den Endpunkten vergleichbar.
+
+Usage:
+    python -m app.benchmark.serialization --rows 100 --repeat 500
+"""
+
+import argparse
+import datetime
+import os
+import sys
+from time import perf_counter
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark der JSON-Serialisierung.")
+    parser.add_argument("--rows", type=int, default=100, help="Objekte pro Antwort (Seitengröße)")
+    parser.add_argument("--repeat", type=int, default=500, help="Serialisierungen pro Variante")
+    return parser.parse_args(argv)
+
+
+def build_posts(rows: int):
+    """``rows`` Posts mit je einem Author (10 Posts pro Author)."""
+    from app.models import Post, User
+
+    now = datetime.datetime(2025, 1, 1, 12, 0, 0)
+    authors = [
+        User(id=i, name=f"User {i}", email=f"user{i}@example.com", is_active=True, created_at=now)
+        for i in range(rows // 10 + 1)
+    ]
+    return [
+        Post(
+            id=i, title=f"Post {i} – Über SQLModel", content="Lorem ipsum dolor sit amet. " * 20,
+            published=i % 2 == 0, created_at=now, user_id=i // 10, author=authors[i // 10]
+        )
+        for i in range(rows)
+    ]
+
+
+def fastapi_path(annotation):
+    """Wie FastAPI eine Antwort mit ``response_model=annotation`` erzeugt."""
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_model_field
+
+    field = create_model_field(name="Response", type_=annotation, mode="serialization")
+    response = JSONResponse(content=None)
+
+    def run(content) -> bytes:
+        # serialize_response ist async, die Arbeit darin aber rein synchron
+        coroutine = serialize_response(field=field, response_content=content, is_coroutine=True)
+        try:
+            coroutine.send(None)
+        except StopIteration as done:
+            return response.render(done.value)
+        raise RuntimeError("serialize_response hat unerwartet gewartet")
+
+    return run
+
+
+def typeadapter_path(annotation):
+    from pydantic import TypeAdapter
+
+    adapter = TypeAdapter(annotation)
+    return lambda content: adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+
+
+def compiled_path(annotation):
+    from app.core.serialization import serializer_for
+
+    return serializer_for(annotation).dump
+
+
+def measure(run, content, repeat: int) -> float:
+    """Median in Millisekunden."""
+    run(content)  # Warmup
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        run(content)
+        timings.append(perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    os.environ["FAST_JSON"] = "True"
+    os.environ.setdefault("DB_ECHO", "False")
+
+    from app.core import serialization
+    from app.models import PostRead, PostReadWithAuthor, UserRead
+
+    if serialization.orjson is None:
+        print("⚠️  orjson nicht installiert - compiled nutzt pydantic_core (uv sync --extra fast-json)")
+
+    posts = build_posts(args.rows)
+    cases = {
+        "list[PostRead]": (list[PostRead], posts),
+        "list[PostReadWithAuthor]": (list[PostReadWithAuthor], posts),
+        "list[UserRead]": (list[UserRead], list({id(post.author): post.author for post in posts}.values())),
+        "PostReadWithAuthor": (PostReadWithAuthor, posts[0]),
+    }
+    paths = {"fastapi": fastapi_path, "typeadapter": typeadapter_path, "compiled": compiled_path}
+
+    print(f"🏁 {args.rows} Zeilen, {args.repeat} Wiederholungen (Median in ms)\n")
+    print(f"{'Modell':<28}" + "".join(f"{name:>14}" for name in paths) + f"{'Speedup':>10}")
+    for label, (annotation, content) in cases.items():
+        runs = {name: build(annotation) for name, build in paths.items()}
+        bodies = {name: run(content) for name, run in runs.items()}
+        if len(set(bodies.values())) != 1:
+            print(f"❌ {label}: Ausgaben unterscheiden sich")
+            return 1
+        timings = {name: measure(run, content, args.repeat) for name, run in runs.items()}
+        speedup = timings["fastapi"] / timings["compiled"]
+        print(f"{label:<28}" + "".join(f"{value:>14.3f}" for value in timings.values()) + f"{speedup:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
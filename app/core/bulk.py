@@ -0,0 +1,215 @@
+"""
+Bulk-Import
+===========
+Hilfsmittel für Bulk-Endpunkte: Request-Body als JSON-Array oder
+NDJSON (eine JSON-Zeile pro Objekt) einlesen und pro Eintrag validieren.
+
+Ungültige Einträge brechen den Import nicht ab, sondern werden mit
+ihrem Index als Fehler gesammelt.
+
+Für Upserts (``INSERT ... ON CONFLICT DO UPDATE``) liefert
+:func:`dialect_insert` das ``insert()`` des jeweiligen Dialekts,
+:func:`insert_returning_ids` legt einen Block mit einem Statement an.
+"""
+
+import json
+from collections.abc import AsyncIterator, Iterator
+from typing import Generic, TypeVar
+
+from fastapi import HTTPException, Request, status
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, SQLModel
+
+from app.models.bulk import BulkItemError
+
+ModelT = TypeVar("ModelT", bound=SQLModel)
+
+# Content-Types, die als NDJSON (JSON Lines) gelesen werden
+NDJSON_CONTENT_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+
+# Obergrenzen pro Request, damit ein einzelner Import den Worker nicht sprengt.
+# Die validierten Einträge liegen bis zum Ende des Imports im Speicher,
+# ein JSON-Array zusätzlich als ganzer Body - größere Importe aufteilen.
+BULK_MAX_ITEMS = 100_000
+BULK_MAX_BYTES = 64 * 1024 * 1024
+
+# Einträge pro Datenbank-Round-Trip (Prüf-Query + INSERT + COMMIT)
+BULK_CHUNK_SIZE = 1_000
+
+
+def format_validation_error(error: ValidationError) -> str:
+    """Fasst die Pydantic-Fehler eines Eintrags in einer Zeile zusammen."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'item'}: {err['msg']}"
+        for err in error.errors()
+    )
+
+
+def _parse_line(index: int, line: bytes) -> object:
+    try:
+        return json.loads(line)
+    except ValueError as exc:
+        return BulkItemError(index=index, detail=f"Ungültiges JSON: {exc}")
+
+
+class BulkPayload(Generic[ModelT]):
+    """Geparster Bulk-Body: gültige Einträge mit Index plus Fehlerliste."""
+
+    def __init__(self, items: list[tuple[int, ModelT]], errors: list[BulkItemError]):
+        self.items = items
+        self.errors = errors
+
+
+class BulkBody:
+    """
+    Dependency, die einen Bulk-Body für ein Create-Modell einliest.
+
+    Als async Dependency liest sie den Body auf dem Event-Loop ein;
+    die eigentliche (sync) Route läuft danach wie gewohnt im Threadpool.
+    NDJSON wird zeilenweise aus dem Stream geparst (kein Roh-Body im
+    Speicher), ein JSON-Array muss komplett gelesen werden. Die gültigen
+    Einträge werden in beiden Fällen gesammelt - siehe BULK_MAX_ITEMS.
+
+    Verwendung:
+    ```python
+    @router.post("/bulk", openapi_extra=BulkBody.openapi(UserCreate))
+    def bulk(payload: BulkPayload = Depends(BulkBody(UserCreate))):
+        ...
+    ```
+    """
+
+    def __init__(self, model: type[SQLModel]):
+        self.model = model
+
+    async def __call__(self, request: Request) -> BulkPayload:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+        items, errors = [], []
+        async for index, raw in self._raw_items(request, content_type):
+            if index >= BULK_MAX_ITEMS:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Maximal {BULK_MAX_ITEMS} Einträge pro Request"
+                )
+            if isinstance(raw, BulkItemError):
+                errors.append(raw)
+                continue
+            try:
+                items.append((index, self.model.model_validate(raw)))
+            except ValidationError as exc:
+                errors.append(BulkItemError(index=index, detail=format_validation_error(exc)))
+
+        return BulkPayload(items, errors)
+
+    @classmethod
+    async def _raw_items(cls, request: Request, content_type: str) -> AsyncIterator[tuple[int, object]]:
+        if content_type in NDJSON_CONTENT_TYPES:
+            async for item in cls._iter_ndjson(cls._iter_body(request)):
+                yield item
+            return
+        body = b"".join([chunk async for chunk in cls._iter_body(request)])
+        for item in cls._iter_json_array(body):
+            yield item
+
+    @staticmethod
+    async def _iter_body(request: Request) -> AsyncIterator[bytes]:
+        """Body-Stream mit Obergrenze BULK_MAX_BYTES."""
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > BULK_MAX_BYTES:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Maximal {BULK_MAX_BYTES // 1024 // 1024} MB pro Request"
+                )
+            yield chunk
+
+    @staticmethod
+    def _iter_json_array(body: bytes) -> Iterator[tuple[int, object]]:
+        try:
+            data = json.loads(body)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Ungültiges JSON: {exc}"
+            ) from exc
+        if not isinstance(data, list):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Erwartet wird ein JSON-Array (oder NDJSON mit Content-Type application/x-ndjson)"
+            )
+        yield from enumerate(data)
+
+    @staticmethod
+    async def _iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, object]]:
+        # Zeile für Zeile aus dem Stream - im Speicher bleibt nur die angefangene Zeile
+        index = 0
+        pending = b""
+        async for chunk in chunks:
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                if not line.strip():
+                    continue
+                yield index, _parse_line(index, line)
+                index += 1
+        if pending.strip():
+            yield index, _parse_line(index, pending)
+
+    @staticmethod
+    def openapi(model: type[SQLModel]) -> dict:
+        """OpenAPI-Beschreibung des Bodys (JSON-Array oder NDJSON) für ``openapi_extra``."""
+        schema = model.model_json_schema()
+        return {
+            "requestBody": {
+                "required": True,
+                "content": {
+                    "application/json": {"schema": {"type": "array", "items": schema}},
+                    "application/x-ndjson": {"schema": schema},
+                },
+            }
+        }
+
+
+def dialect_insert(dialect_name: str):
+    """
+    ``insert()`` mit ``on_conflict_do_update``/``excluded`` für den Dialekt.
+
+    Raises:
+        HTTPException 501: Datenbank kennt kein ``ON CONFLICT``
+    """
+    if dialect_name == "postgresql":
+        return postgresql.insert
+    if dialect_name == "sqlite":
+        return sqlite.insert
+    raise HTTPException(
+        status_code=status.HTTP_501_NOT_IMPLEMENTED,
+        detail=f"Upsert wird für {dialect_name} nicht unterstützt"
+    )
+
+
+def insert_returning_ids(session: Session, model: type[SQLModel], rows: list[dict]) -> list[int]:
+    """
+    Legt ``rows`` an und liefert die neuen IDs in der Reihenfolge von ``rows``.
+
+    - PostgreSQL: ``insertmanyvalues`` - mehrzeilige ``INSERT ... RETURNING``
+      mit garantierter Reihenfolge (``sort_by_parameter_order``).
+    - Andere (SQLite): SQLAlchemy garantiert die Reihenfolge dort nur mit
+      einem INSERT pro Zeile. Stattdessen ein ``INSERT ... VALUES (...),
+      (...) RETURNING id`` für den ganzen Block; die IDs werden aufsteigend
+      in Zeilenreihenfolge vergeben (Schreibzugriffe sind serialisiert),
+      sortiert passen sie also zu ``rows``.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        return list(session.exec(
+            insert(model).returning(model.id, sort_by_parameter_order=True),
+            params=rows
+        ).scalars().all())
+    return sorted(session.exec(insert(model).values(rows).returning(model.id)).scalars().all())
+
+
+def chunked(items: list, size: int = BULK_CHUNK_SIZE) -> Iterator[list]:
+    """Teilt eine Liste in Blöcke fester Größe."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
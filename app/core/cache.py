@@ -0,0 +1,506 @@
+"""
+Response-Cache
+==============
+Cache für fertig serialisierte Antworten häufig gelesener Endpunkte
+(``get_post``, ``get_user``, ``get_posts``, ``filter_posts``).
+
+Schlüssel ist die Route plus die normalisierten Query-/Pfad-Parameter.
+Gespeichert wird der JSON-Body samt gesetzter Header (z.B. Cursor), ein
+Treffer kostet also weder Datenbank noch Pydantic-Serialisierung.
+
+Invalidierung über Tags statt Schlüssel-Listen: Jeder Eintrag merkt sich
+die Version seiner Tags (z.B. ``post:42``, ``user:7``, ``posts``). Ein
+Schreibzugriff setzt die Version seiner Tags neu - alle Einträge mit
+älterer Version gelten ab sofort als Miss und laufen per LRU/TTL aus.
+Fehlt eine Tag-Version (verdrängt oder abgelaufen), ist der Eintrag
+ebenfalls ungültig; im Zweifel wird also neu geladen, nie veraltet
+ausgeliefert.
+
+Backends:
+- ``memory``: LRU im Prozess mit TTL und Grenzen für Anzahl und Bytes.
+  Achtung bei mehreren Workern: Invalidiert wird nur im eigenen
+  Prozess, andere Worker liefern bis zum TTL-Ablauf den alten Stand.
+- ``redis``: gemeinsamer Cache aller Worker. Jeder Client mit
+  ``get``/``set(..., px=, nx=)``/``mget`` funktioniert (redis-py, fakeredis).
+- ``none``: Cache aus.
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from functools import wraps
+from typing import Any, Protocol
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.etag import none_match, not_modified
+from app.core.serialization import serializer_for
+
+logger = logging.getLogger(__name__)
+
+CACHE_EVENTS = ("hits", "misses", "stores", "evictions", "expirations", "invalidations", "errors")
+
+# Header, die zum Body gehören und mitgespeichert werden
+_SKIP_HEADERS = {"content-length", "content-type"}
+
+# Bedingte Request-Header gehören nicht in den Schlüssel (siehe app/core/etag.py)
+_CONDITIONAL_PARAMS = {"if_none_match"}
+
+
+class CacheStats:
+    """Thread-sichere Zähler für Treffer, Fehlgriffe und Verdrängungen."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = dict.fromkeys(CACHE_EVENTS, 0)
+        # Callbacks (event, anzahl), z.B. für Prometheus-Counter
+        self.listeners: list[Callable[[str, int], None]] = []
+
+    def record(self, event: str, count: int = 1):
+        with self._lock:
+            self.counts[event] += count
+        for listener in self.listeners:
+            listener(event, count)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = dict(self.counts)
+        lookups = counts["hits"] + counts["misses"]
+        counts["hit_ratio"] = counts["hits"] / lookups if lookups else 0.0
+        return counts
+
+
+class CacheBackend(Protocol):
+    """Minimale Schnittstelle eines Cache-Backends (Werte sind Bytes)."""
+
+    # True = Aufrufe blockieren (Netzwerk) -> in async Routen im Threadpool ausführen
+    blocking: bool
+
+    def get(self, key: str) -> bytes | None: ...
+
+    def get_many(self, keys: list[str]) -> list[bytes | None]: ...
+
+    def set(self, key: str, value: bytes, ttl: float): ...
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        """Setzt nur, falls ``key`` fehlt (True = gesetzt)."""
+        ...
+
+    def size(self) -> dict: ...
+
+
+class MemoryBackend:
+    """
+    LRU-Cache im Prozess mit TTL.
+
+    Verdrängt die am längsten nicht gelesenen Einträge, sobald
+    ``max_entries`` oder ``max_bytes`` überschritten sind.
+    """
+
+    blocking = False
+
+    def __init__(self, max_entries: int, max_bytes: int, stats: CacheStats):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = stats
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._bytes = 0
+
+    def _lookup(self, key: str, now: float) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= now:
+            del self._entries[key]
+            self._bytes -= len(value)
+            self.stats.record("expirations")
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            return self._lookup(key, time.monotonic())
+
+    def get_many(self, keys: list[str]) -> list[bytes | None]:
+        now = time.monotonic()
+        with self._lock:
+            return [self._lookup(key, now) for key in keys]
+
+    def _store(self, key: str, value: bytes, ttl: float) -> int:
+        # Nur mit gehaltenem Lock aufrufen; liefert die Anzahl Verdrängungen
+        evicted = 0
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old[1])
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._bytes += len(value)
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, (_, dropped) = self._entries.popitem(last=False)
+            self._bytes -= len(dropped)
+            evicted += 1
+        return evicted
+
+    def set(self, key: str, value: bytes, ttl: float):
+        with self._lock:
+            evicted = self._store(key, value, ttl)
+        if evicted:
+            self.stats.record("evictions", evicted)
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        with self._lock:
+            if self._lookup(key, time.monotonic()) is not None:
+                return False
+            evicted = self._store(key, value, ttl)
+        if evicted:
+            self.stats.record("evictions", evicted)
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def size(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+
+class RedisBackend:
+    """
+    Redis (oder kompatibler Client) als gemeinsamer Cache aller Worker.
+
+    Verdrängung übernimmt Redis selbst (``maxmemory-policy allkeys-lru``
+    setzen), die Zähler für ``evictions`` bleiben hier deshalb 0.
+    """
+
+    blocking = True
+
+    def __init__(self, client, prefix: str = "rc:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> bytes | None:
+        return self.client.get(self.prefix + key)
+
+    def get_many(self, keys: list[str]) -> list[bytes | None]:
+        return self.client.mget([self.prefix + key for key in keys])
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self.client.set(self.prefix + key, value, px=max(1, int(ttl * 1000)))
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        return bool(self.client.set(self.prefix + key, value, px=max(1, int(ttl * 1000)), nx=True))
+
+    def size(self) -> dict:
+        return {"backend": "redis"}
+
+
+class ResponseCache:
+    """
+    Cache für serialisierte Responses mit Tag-basierter Invalidierung.
+
+    Args:
+        backend: Speicher (None = Cache aus)
+        ttl: Lebensdauer eines Eintrags in Sekunden
+        stats: Zähler (für /system/cache und Prometheus)
+    """
+
+    def __init__(self, backend: CacheBackend | None, ttl: float, stats: CacheStats | None = None):
+        self.backend = backend
+        self.ttl = ttl
+        self.stats = stats or CacheStats()
+        # Tag-Versionen müssen jeden Eintrag überleben, der sie referenziert
+        self.tag_ttl = max(ttl * 2, 3600.0)
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    @staticmethod
+    def _tag_key(tag: str) -> str:
+        return f"tag:{tag}"
+
+    @staticmethod
+    def key(route: str, params: dict[str, Any]) -> str:
+        """
+        Schlüssel aus Route und Parametern.
+
+        Parameter werden sortiert, Enums auf ihren Wert und ``None``
+        weggelassen - ``?a=1&b=2`` und ``?b=2&a=1`` treffen denselben Eintrag.
+        """
+        normalized = {
+            name: value.value if isinstance(value, Enum) else value
+            for name, value in sorted(params.items())
+            if value is not None
+        }
+        digest = hashlib.sha1(
+            json.dumps(normalized, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return f"resp:{route}:{digest}"
+
+    def _encode(self, body: bytes, headers: dict[str, str], tags: dict[str, str]) -> bytes:
+        meta = json.dumps({"headers": headers, "tags": tags}, separators=(",", ":"))
+        return meta.encode() + b"\n" + body
+
+    def lookup(self, key: str) -> tuple[bytes, dict[str, str]] | None:
+        """Gültiger Eintrag als (Body, Header) oder None."""
+        try:
+            raw = self.backend.get(key)
+            if raw is None:
+                self.stats.record("misses")
+                return None
+            meta_line, body = raw.split(b"\n", 1)
+            meta = json.loads(meta_line)
+            tags = meta["tags"]
+            if tags:
+                current = self.backend.get_many([self._tag_key(tag) for tag in tags])
+                if any(
+                    version is None or version.decode() != tags[tag]
+                    for tag, version in zip(tags, current)
+                ):
+                    self.stats.record("misses")
+                    return None
+        except Exception:
+            # Ein ausgefallener Cache darf die API nicht mitreißen
+            logger.exception("Response-Cache: Lesen fehlgeschlagen")
+            self.stats.record("errors")
+            return None
+        self.stats.record("hits")
+        return body, meta["headers"]
+
+    def store(self, key: str, body: bytes, headers: dict[str, str], tags: list[str], started: float):
+        """
+        Legt einen Eintrag mit den aktuellen Versionen seiner Tags ab.
+
+        Wurde ein Tag nach ``started`` (Beginn des Requests) invalidiert,
+        kann die Antwort schon veraltet sein - dann wird nicht gespeichert.
+        Mit Read-Replicas gilt das zusätzlich für DB_READ_YOUR_WRITES_SECONDS
+        davor, weil das Replica den Schreibzugriff evtl. noch nicht kennt.
+
+        Fehlt eine Tag-Version, wird sie nur angelegt, falls sie weiterhin
+        fehlt (``add``) - ein paralleles :meth:`invalidate` wird so nie
+        überschrieben, der Eintrag dann einfach nicht gespeichert.
+        """
+        try:
+            tag_keys = [self._tag_key(tag) for tag in tags]
+            current = self.backend.get_many(tag_keys) if tags else []
+            not_before = started - _replica_grace()
+            versions = {}
+            for tag, tag_key, version in zip(tags, tag_keys, current):
+                if version is None:
+                    version = repr(time.time()).encode()
+                    if not self.backend.add(tag_key, version, self.tag_ttl):
+                        return
+                elif float(version) >= not_before:
+                    return
+                versions[tag] = version.decode()
+            self.backend.set(key, self._encode(body, headers, versions), self.ttl)
+        except Exception:
+            logger.exception("Response-Cache: Schreiben fehlgeschlagen")
+            self.stats.record("errors")
+            return
+        self.stats.record("stores")
+
+    def invalidate(self, *tags: str):
+        """
+        Macht alle Einträge mit einem der Tags ungültig.
+
+        Nach dem COMMIT aufrufen, sonst kann ein paralleler Request den
+        alten Stand wieder einlagern.
+        """
+        if not self.enabled or not tags:
+            return
+        # Neue Version = Zeitstempel (zeigt zugleich, wie frisch die Änderung ist)
+        version = repr(time.time()).encode()
+        try:
+            for tag in tags:
+                self.backend.set(self._tag_key(tag), version, self.tag_ttl)
+        except Exception:
+            logger.exception("Response-Cache: Invalidierung fehlgeschlagen")
+            self.stats.record("errors")
+            return
+        self.stats.record("invalidations", len(tags))
+
+    def status(self) -> dict:
+        """Zähler und Füllstand für ``/system/cache``."""
+        return {
+            "backend": settings.CACHE_BACKEND,
+            "enabled": self.enabled,
+            "ttl_seconds": self.ttl,
+            **self.stats.snapshot(),
+            **(self.backend.size() if self.enabled else {}),
+        }
+
+
+def _replica_grace() -> float:
+    from app.database import read_engines
+
+    return float(settings.DB_READ_YOUR_WRITES_SECONDS) if read_engines else 0.0
+
+
+def _create_backend(stats: CacheStats) -> CacheBackend | None:
+    if settings.CACHE_BACKEND == "memory":
+        if settings.WEB_CONCURRENCY > 1:
+            logger.warning(
+                "CACHE_BACKEND=memory mit %d Workern: Invalidierung gilt nur je Worker, "
+                "andere Worker liefern bis zu %ss alte Daten (CACHE_BACKEND=redis nutzen)",
+                settings.WEB_CONCURRENCY, settings.CACHE_TTL_SECONDS
+            )
+        return MemoryBackend(settings.CACHE_MAX_ENTRIES, settings.CACHE_MAX_BYTES, stats)
+    if settings.CACHE_BACKEND == "redis":
+        import redis  # optionale Abhängigkeit
+
+        return RedisBackend(redis.Redis.from_url(settings.CACHE_REDIS_URL))
+    return None
+
+
+_stats = CacheStats()
+response_cache = ResponseCache(_create_backend(_stats), settings.CACHE_TTL_SECONDS, _stats)
+
+
+# Requests ohne Cache (Diagnose-Läufe, die wirklich die Datenbank messen sollen)
+_bypass: ContextVar[bool] = ContextVar("response_cache_bypass", default=False)
+
+
+@contextmanager
+def bypass_cache() -> Iterator[None]:
+    """Gecachte Endpunkte im Block lesen und schreiben den Cache nicht."""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def _cache_params(kwargs: dict[str, Any]) -> dict[str, Any]:
+    # Sessions, Request/Response usw. gehören nicht in den Schlüssel
+    return {
+        name: value for name, value in kwargs.items()
+        if name not in _CONDITIONAL_PARAMS
+        and not isinstance(value, (Session, AsyncSession, Request, Response))
+    }
+
+
+def _sub_response(kwargs: dict[str, Any]) -> Response | None:
+    return next((value for value in kwargs.values() if isinstance(value, Response)), None)
+
+
+def cached(model, tags: Callable[[dict[str, Any], Any], list[str]]):
+    """
+    Decorator für GET-Endpunkte: Antwort cachen.
+
+    Bei einem Treffer wird die gespeicherte JSON-Antwort direkt
+    zurückgegeben, der Endpunkt läuft nicht. Fehler (z.B. 404) werden
+    nicht gecacht. Gibt der Endpunkt selbst eine Response zurück, wird
+    sie nur bei Status 200 gespeichert (z.B. Projektionen, siehe
+    ``app/core/projection.py``) - ein 304 geht unverändert raus. Hat der
+    Endpunkt einen Parameter ``if_none_match`` und passt er zum
+    gespeicherten ETag, beantwortet schon der Cache den Request mit 304.
+
+    Args:
+        model: Response-Model des Endpunkts (wie ``response_model``)
+        tags: ``(params, ergebnis) -> [tag, ...]`` für die Invalidierung
+
+    Example:
+        @router.get("/{post_id}", response_model=PostReadWithAuthor)
+        @cached(PostReadWithAuthor, tags=lambda params, post: [f"post:{post.id}", f"user:{post.user_id}"])
+        def get_post(post_id: int, session: Session = Depends(get_read_session)):
+            ...
+    """
+    adapter = TypeAdapter(model)
+    serializer = serializer_for(model)
+
+    def respond(body: bytes, headers: dict[str, str], kwargs) -> Response:
+        etag = headers.get("etag")
+        if etag is not None and none_match(kwargs.get("if_none_match"), etag):
+            return not_modified(etag)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def header_dict(response: Response | None) -> dict[str, str]:
+        if response is None:
+            return {}
+        return {name: value for name, value in response.headers.items() if name not in _SKIP_HEADERS}
+
+    def prepare(result, kwargs) -> tuple[bytes, dict[str, str]] | None:
+        """(Body, Header) zum Speichern oder None (nicht cachebar)."""
+        headers = header_dict(_sub_response(kwargs))
+        if isinstance(result, Response):
+            if result.status_code != 200:
+                return None
+            return result.body, {**headers, **header_dict(result)}
+        if settings.FAST_JSON:
+            return serializer.dump(result), headers
+        # from_attributes: ORM-Objekte (inkl. Lazy Loads) solange die Session offen ist
+        return adapter.dump_json(adapter.validate_python(result, from_attributes=True)), headers
+
+    def decorator(func):
+        route = f"{func.__module__}.{func.__qualname__}"
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not response_cache.enabled or _bypass.get():
+                    return await func(*args, **kwargs)
+                params = _cache_params(kwargs)
+                key = response_cache.key(route, params)
+                call = run_in_threadpool if response_cache.backend.blocking else _call
+                hit = await call(response_cache.lookup, key)
+                if hit is not None:
+                    return respond(*hit, kwargs)
+                started = time.time()
+                result = await func(*args, **kwargs)
+                prepared = prepare(result, kwargs)
+                if prepared is None:
+                    return result
+                await call(response_cache.store, key, *prepared, tags(params, result), started)
+                return respond(*prepared, kwargs)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not response_cache.enabled or _bypass.get():
+                return func(*args, **kwargs)
+            params = _cache_params(kwargs)
+            key = response_cache.key(route, params)
+            hit = response_cache.lookup(key)
+            if hit is not None:
+                return respond(*hit, kwargs)
+            started = time.time()
+            result = func(*args, **kwargs)
+            prepared = prepare(result, kwargs)
+            if prepared is None:
+                return result
+            response_cache.store(key, *prepared, tags(params, result), started)
+            return respond(*prepared, kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+async def _call(func, *args):
+    return func(*args)
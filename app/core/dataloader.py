@@ -0,0 +1,136 @@
+"""
+Batch Loading
+=============
+Bündelt Lazy Loads von Relationships über den ganzen Request - nach dem
+Vorbild von DataLoader.
+
+Ohne Bündelung kostet jeder erste Zugriff auf ``post.author`` eine eigene
+Query (N+1), z.B. beim Serialisieren von ``PostReadWithAuthor``.
+``selectinload`` löst das für ein Statement; hier passiert dasselbe für
+alle Objekte der Session - also des Requests, denn jeder Request hat
+seine eigene Session:
+
+1. Der erste Lazy Load von ``Post.author`` wird abgefangen
+   (``do_orm_execute``).
+2. Stattdessen eine Query für *alle* Posts der Session, deren ``author``
+   noch fehlt: ``SELECT users ... WHERE id IN (...)`` (PostgreSQL:
+   ``= ANY(:ids)``).
+3. Die übrigen Posts bekommen ihren Author direkt gesetzt, der
+   abgefangene Load sein Ergebnis aus derselben Query.
+
+Geladene Objekte bleiben bis zum Ende der Session referenziert - spätere
+Zugriffe auf denselben User (z.B. über ein Many-to-One) kommen aus der
+Identity Map, ohne Query. Funktioniert für jede Relationship mit einem
+Fremdschlüssel in beide Richtungen, also auch für ``User.posts`` in
+verschachtelten Modellen wie ``UserReadWithPosts``.
+
+Abschalten: ``BATCH_LOADING=False`` (dann wieder eine Query pro Objekt).
+
+Async: Lazy Loads sind nur innerhalb von ``run_sync`` erlaubt - siehe
+:func:`load_related_async`.
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable
+
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.orm import ORMExecuteState, RelationshipProperty, Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.multiget import id_filter
+
+# Schlüssel in ``session.info``: per Batch geladene Objekte (Memo für den Request)
+_MEMO_KEY = "batch_loading_memo"
+
+
+def _batched_relationship(state: ORMExecuteState) -> RelationshipProperty | None:
+    """Die Relationship eines abgefangenen Lazy Loads, falls sie sich bündeln lässt."""
+    if not settings.BATCH_LOADING or not state.is_relationship_load or state.lazy_loaded_from is None:
+        return None
+    path = state.loader_strategy_path
+    prop = path[-1] if path is not None else None
+    if not isinstance(prop, RelationshipProperty):
+        return None
+    # Nur ein Fremdschlüssel, keine Zwischentabelle (Many-to-Many)
+    if prop.secondary is not None or len(prop.local_remote_pairs) != 1:
+        return None
+    return prop
+
+
+def _pending_parents(session: Session, prop: RelationshipProperty, current, local_key: str) -> list:
+    """``current`` plus alle Objekte der Session, denen ``prop`` noch fehlt (max. BATCH_LOADING_MAX_KEYS)."""
+    parents = [current]
+    for obj in session.identity_map.values():
+        if len(parents) >= settings.BATCH_LOADING_MAX_KEYS:
+            break
+        if obj is current or not isinstance(obj, prop.parent.class_):
+            continue
+        loaded = sa_inspect(obj).dict
+        # Auch den Schlüssel nur nehmen, wenn er geladen ist - sonst kostet er selbst eine Query
+        if prop.key not in loaded and local_key in loaded:
+            parents.append(obj)
+    return parents
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _batch_lazy_load(state: ORMExecuteState):
+    prop = _batched_relationship(state)
+    if prop is None:
+        return None
+
+    ((local_column, remote_column),) = prop.local_remote_pairs
+    local_key = prop.parent.get_property_by_column(local_column).key
+    remote_key = prop.mapper.get_property_by_column(remote_column).key
+    session = state.session
+    current = state.lazy_loaded_from.obj()
+    if current is None:
+        return None
+
+    parents = _pending_parents(session, prop, current, local_key)
+    keys = list(dict.fromkeys(
+        key for key in (getattr(parent, local_key) for parent in parents) if key is not None
+    ))
+    dialect_name = session.get_bind(mapper=prop.mapper).dialect.name
+    target = prop.mapper.class_
+    statement = select(target).where(id_filter(getattr(target, remote_key), keys, dialect_name))
+    if prop.order_by:
+        statement = statement.order_by(*prop.order_by)
+
+    # Statt des Lazy Loads für ein Objekt: eine Query für alle
+    frozen = state.invoke_statement(statement=statement).freeze()
+    rows_by_key = defaultdict(list)
+    related_by_key = defaultdict(list)
+    for data in frozen.data:
+        # Ein-Entity-Ergebnisse speichert SQLAlchemy als Objekte, sonst als Rows
+        row = (data,) if isinstance(data, target) else data
+        key = getattr(row[0], remote_key)
+        rows_by_key[key].append(row)
+        related_by_key[key].append(row[0])
+    session.info.setdefault(_MEMO_KEY, []).extend(obj for objs in related_by_key.values() for obj in objs)
+
+    for parent in parents[1:]:
+        related = related_by_key.get(getattr(parent, local_key), [])
+        set_committed_value(parent, prop.key, related if prop.uselist else next(iter(related), None))
+
+    # Der abgefangene Load bekommt nur seine eigenen Zeilen
+    return frozen.with_new_rows(rows_by_key.get(getattr(current, local_key), []))()
+
+
+def load_related(objects: Iterable, attribute_names: Iterable[str]):
+    """
+    Lädt Relationships für alle ``objects`` vorab (gebündelt: eine Query
+    pro Relationship), z.B. bevor die Session geschlossen wird.
+    """
+    attribute_names = list(attribute_names)
+    for obj in objects:
+        for name in attribute_names:
+            getattr(obj, name)
+
+
+async def load_related_async(session: AsyncSession, objects: Iterable, attribute_names: Iterable[str]):
+    """Async-Variante von :func:`load_related` - Lazy Loads laufen per ``run_sync``."""
+    objects = list(objects)
+    await session.run_sync(lambda _: load_related(objects, attribute_names))
@@ -0,0 +1,90 @@
+"""
+ETags
+=====
+Bedingte Requests für User und Posts auf Basis einer Zeilen-Version.
+
+- ``GET`` mit ``If-None-Match``: Stimmt das ETag, antwortet der Endpunkt
+  mit ``304 Not Modified`` - ohne Body und ohne Pydantic-Serialisierung.
+- ``PATCH`` mit ``If-Match``: Optimistic Concurrency. Hat sich die
+  Ressource seit dem Lesen geändert, gibt es ``412 Precondition Failed``
+  statt eines stillen Überschreibens.
+
+Zeilen-Versionen:
+- Post: Spalte ``posts.version``, von SQLAlchemy bei jedem UPDATE
+  hochgezählt (``version_id_col``). Das UPDATE prüft die gelesene
+  Version mit (``WHERE version = ...``) - parallele Änderungen fallen
+  so auch zwischen Prüfung und COMMIT auf.
+- User: ``updated_at`` (bzw. ``created_at``, solange nie geändert).
+
+Das ETag eines Posts enthält auch die Version des Autors, weil
+``GET /posts/{id}`` den Autor mit ausliefert.
+"""
+
+import hashlib
+
+from fastapi import HTTPException, Response, status
+
+from app.models import Post, User
+
+
+def make_etag(*parts) -> str:
+    """Starkes, opakes ETag aus den Versions-Bestandteilen."""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+def user_version(user: User):
+    return user.updated_at or user.created_at
+
+
+def user_etag(user: User) -> str:
+    """ETag für ``GET /users/{id}``."""
+    return make_etag("user", user.id, user_version(user))
+
+
+def post_etag(post: Post, author: User) -> str:
+    """ETag für ``GET /posts/{id}`` (Post inkl. eingebettetem Autor)."""
+    return make_etag("post", post.id, post.version, author.id, user_version(author))
+
+
+def _parse(header: str) -> list[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def _strip_weak(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def none_match(if_none_match: str | None, etag: str) -> bool:
+    """
+    Trifft ``If-None-Match`` das aktuelle ETag? (Dann 304 senden.)
+
+    Schwacher Vergleich nach RFC 9110: ``W/"x"`` und ``"x"`` sind gleich.
+    """
+    if not if_none_match:
+        return False
+    tags = _parse(if_none_match)
+    return "*" in tags or _strip_weak(etag) in {_strip_weak(tag) for tag in tags}
+
+
+def check_if_match(if_match: str | None, etag: str):
+    """
+    Prüft ``If-Match`` (starker Vergleich, schwache ETags passen nie).
+
+    Raises:
+        HTTPException 412: ETag passt nicht - Ressource wurde inzwischen geändert
+    """
+    if if_match is None:
+        return
+    tags = _parse(if_match)
+    if "*" in tags or etag in tags:
+        return
+    raise HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="Ressource wurde inzwischen geändert (If-Match passt nicht) - neu laden und erneut versuchen"
+    )
+
+
+def not_modified(etag: str) -> Response:
+    """Leere 304-Antwort mit dem aktuellen ETag."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
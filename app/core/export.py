@@ -0,0 +1,131 @@
+"""
+Streaming-Export
+================
+Große Ergebnismengen als NDJSON oder CSV streamen, statt sie Seite für
+Seite per OFFSET abzuholen.
+
+Die Abfrage läuft als serverseitiger Cursor (``yield_per`` ->
+``stream_results``): PostgreSQL liefert die Zeilen blockweise, jeder
+Block wird sofort kodiert und an den Client geschickt. Der Speicher
+bleibt so unabhängig von der Tabellengröße konstant.
+
+Hinweise:
+- Der Export öffnet seine eigene Verbindung, denn die Session aus den
+  Dependencies ist schon geschlossen, wenn der Body gestreamt wird.
+  Die Verbindung ist bis zum Ende des Downloads belegt (Pool-Größe!).
+- Ein Export ist ein einziger Snapshot (eine Transaktion) - auf dem
+  Primary hält ein stundenlanger Export VACUUM auf; große Exporte
+  besser über ein Read-Replica laufen lassen.
+"""
+
+import csv
+import datetime
+import io
+from collections.abc import AsyncIterator, Iterator
+from enum import StrEnum
+from typing import Any
+
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Zeilen pro Block (ein Fetch vom Server-Cursor, ein Chunk an den Client)
+EXPORT_BATCH_SIZE = 1_000
+
+
+class ExportFormatEnum(StrEnum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormatEnum.ndjson: "application/x-ndjson",
+    ExportFormatEnum.csv: "text/csv; charset=utf-8",
+}
+
+# Für ``responses=`` der Export-Routen (OpenAPI)
+EXPORT_RESPONSES = {
+    200: {
+        "description": "Stream mit einer Zeile pro Datensatz",
+        "content": {"application/x-ndjson": {}, "text/csv": {}},
+    }
+}
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return value
+
+
+def _csv_lines(rows: list[list[Any]]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def encode_rows(rows, fields: list[str], export_format: ExportFormatEnum) -> bytes:
+    """Kodiert einen Block Rows als NDJSON- bzw. CSV-Zeilen."""
+    if export_format == ExportFormatEnum.csv:
+        return _csv_lines([[_csv_value(row._mapping[name]) for name in fields] for row in rows])
+    return b"".join(
+        to_json({name: row._mapping[name] for name in fields}) + b"\n" for row in rows
+    )
+
+
+def _header(fields: list[str], export_format: ExportFormatEnum) -> bytes:
+    return _csv_lines([fields]) if export_format == ExportFormatEnum.csv else b""
+
+
+def stream_export(
+        bind: Engine,
+        statement,
+        fields: list[str],
+        export_format: ExportFormatEnum
+) -> Iterator[bytes]:
+    """
+    Führt das Statement per Server-Cursor aus und liefert kodierte Blöcke.
+
+    Args:
+        bind: Engine (Primary oder Replica)
+        statement: select() über die Spalten von ``fields`` (plus Filter/Sortierung)
+        fields: Spalten in Ausgabe-Reihenfolge
+        export_format: ndjson oder csv
+    """
+    header = _header(fields, export_format)
+    if header:
+        yield header
+    with bind.connect() as connection:
+        result = connection.execution_options(yield_per=EXPORT_BATCH_SIZE).execute(statement)
+        for rows in result.partitions():
+            yield encode_rows(rows, fields, export_format)
+
+
+async def stream_export_async(
+        bind: AsyncEngine,
+        statement,
+        fields: list[str],
+        export_format: ExportFormatEnum
+) -> AsyncIterator[bytes]:
+    """Async-Variante von :func:`stream_export` (asyncpg-Cursor)."""
+    header = _header(fields, export_format)
+    if header:
+        yield header
+    async with bind.connect() as connection:
+        result = await connection.stream(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            yield encode_rows(rows, fields, export_format)
+
+
+def export_response(content, export_format: ExportFormatEnum, filename: str) -> StreamingResponse:
+    """StreamingResponse mit Content-Type und Download-Dateiname (``<filename>.<format>``)."""
+    return StreamingResponse(
+        content,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'}
+    )
@@ -0,0 +1,144 @@
+"""
+Health Checks
+=============
+Zeitgemessene Datenbank-Probe, Pool-Auslastung und Replikations-Verzug
+für ``/health`` und ``/ready``.
+
+Das Ergebnis wird HEALTH_CACHE_SECONDS lang zwischengespeichert: Ein
+Load Balancer, der jede Sekunde von mehreren Knoten aus pollt, löst so
+höchstens eine Probe pro Intervall und Worker aus.
+"""
+
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from time import perf_counter
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.pool import pool_status
+
+
+# Auf einem idle Primary steht pg_last_xact_replay_timestamp() still -
+# sind alle empfangenen WAL-Daten eingespielt, gilt der Verzug als 0.
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+@dataclass
+class HealthReport:
+    """Ergebnis einer Health-Probe."""
+
+    status: str  # healthy | degraded | unhealthy
+    ready: bool
+    reasons: list[str] = field(default_factory=list)
+    database: dict = field(default_factory=dict)
+    replicas: dict[str, dict] = field(default_factory=dict)
+    pools: dict[str, dict] = field(default_factory=dict)
+    checked_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "age_seconds": round(time.time() - self.checked_at, 3)}
+
+
+_cache_lock = threading.Lock()
+_cached_report: HealthReport | None = None
+
+
+def probe_engine(engine: Engine, with_lag: bool = False) -> dict:
+    """
+    Misst einen ``SELECT 1`` Round Trip (inkl. Checkout aus dem Pool).
+
+    Args:
+        engine: Zu prüfende Engine
+        with_lag: Zusätzlich den Replikations-Verzug abfragen (nur PostgreSQL)
+
+    Returns:
+        dict: status ("ok"/"error"), latency_ms, optional lag_seconds/error
+    """
+    start = perf_counter()
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            latency = perf_counter() - start
+            lag = None
+            if with_lag and engine.dialect.name == "postgresql":
+                lag = float(connection.execute(REPLICA_LAG_SQL).scalar_one())
+    except SQLAlchemyError as e:
+        # Nur der Fehlertyp - die Meldung kann Hostnamen/Zugangsdaten enthalten
+        return {"status": "error", "error": type(e).__name__, "latency_ms": (perf_counter() - start) * 1000}
+
+    result = {"status": "ok", "latency_ms": round(latency * 1000, 3)}
+    if with_lag:
+        result["lag_seconds"] = lag
+    return result
+
+
+def run_health_checks(engines: dict[str, Engine]) -> HealthReport:
+    """
+    Prüft Primary, Replicas und alle Pools (ohne Cache).
+
+    - Primary nicht erreichbar oder langsamer als HEALTH_DB_MAX_LATENCY_MS
+      -> ``unhealthy``, nicht bereit
+    - Pool-Auslastung >= HEALTH_POOL_MAX_SATURATION -> nicht bereit
+    - Replica nicht erreichbar oder Verzug > DB_REPLICA_MAX_LAG_SECONDS
+      -> ``degraded`` (Lesen fällt nicht aus, liefert aber evtl. alte Daten)
+
+    Args:
+        engines: Alle Engines (siehe ``app.database.named_engines``)
+    """
+    report = HealthReport(status="healthy", ready=True)
+    report.pools = {name: pool_status(engine) for name, engine in engines.items()}
+
+    for name, pool in report.pools.items():
+        saturation = pool.get("saturation")
+        if saturation is not None and saturation >= settings.HEALTH_POOL_MAX_SATURATION:
+            report.ready = False
+            report.reasons.append(f"pool {name} saturated ({pool['checked_out']} connections checked out)")
+
+    # Ist der Pool erschöpft, würde die Probe bis DB_POOL_TIMEOUT warten
+    if (report.pools["primary"].get("saturation") or 0) >= 1:
+        report.database = {"status": "skipped", "reason": "pool exhausted"}
+    else:
+        report.database = probe_engine(engines["primary"])
+        if report.database["status"] != "ok":
+            report.reasons.append(f"database unreachable ({report.database['error']})")
+            report.status, report.ready = "unhealthy", False
+        elif report.database["latency_ms"] > settings.HEALTH_DB_MAX_LATENCY_MS:
+            report.reasons.append(f"database slow ({report.database['latency_ms']:.0f} ms)")
+            report.status, report.ready = "unhealthy", False
+
+    for name, engine in engines.items():
+        if not name.startswith("replica_"):
+            continue
+        replica = probe_engine(engine, with_lag=True)
+        report.replicas[name] = replica
+        if replica["status"] != "ok":
+            report.reasons.append(f"{name} unreachable ({replica['error']})")
+        elif (replica["lag_seconds"] or 0) > settings.DB_REPLICA_MAX_LAG_SECONDS:
+            report.reasons.append(f"{name} lagging ({replica['lag_seconds']:.1f} s)")
+        else:
+            continue
+        if report.status == "healthy":
+            report.status = "degraded"
+
+    if report.status == "healthy" and not report.ready:
+        report.status = "degraded"
+    return report
+
+
+def get_health_report(engines: dict[str, Engine]) -> HealthReport:
+    """Gecachter Health-Report (höchstens eine Probe pro HEALTH_CACHE_SECONDS)."""
+    global _cached_report
+    with _cache_lock:
+        if _cached_report is None or time.time() - _cached_report.checked_at >= settings.HEALTH_CACHE_SECONDS:
+            _cached_report = run_health_checks(engines)
+        return _cached_report
@@ -0,0 +1,196 @@
+"""
+Loading-Strategien
+==================
+Wählt pro Route, wie Relationships geladen werden - statt sich auf
+implizites Lazy Loading (N+1) zu verlassen.
+
+Welche Relationships geladen werden, ergibt sich aus dem
+Response-Modell: ``PostReadWithAuthor`` hat ein Feld ``author``, also
+braucht die Route ``Post.author``. Die Strategie dafür:
+
+- ``joined``: ein JOIN, eine Query. Gut für einzelne Objekte und kleine
+  Seiten einer Many-to-One-Beziehung.
+- ``selectin``: zweite Query mit ``IN (...)``. Besser für große Seiten
+  (jeder Author wird nur einmal übertragen statt in jeder Zeile) und
+  immer für Listen-Beziehungen (ein JOIN würde die Eltern-Zeilen
+  vervielfachen).
+- ``lazy``: Laden beim ersten Zugriff. Mit BATCH_LOADING (Default) eine
+  Query für alle Objekte des Requests (``app/core/dataloader.py``), ohne
+  eine Query pro Objekt (N+1).
+
+``auto`` entscheidet nach obigen Regeln (Grenze: LOADING_JOINED_MAX_ROWS).
+Feste Vorgaben pro Response-Modell stehen in :data:`LOADING_DEFAULTS`
+und lassen sich per LOADING_STRATEGY_OVERRIDES überschreiben, z.B.
+``PostReadWithAuthor.author=selectin``.
+
+Die gewählte Strategie steht im Response-Header ``X-Loading-Strategy``.
+:func:`compare_strategies` führt einen Request mit jeder Strategie aus
+und vergleicht Queries, Zeilen und Laufzeit (``GET /system/loading``).
+"""
+
+import statistics
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from time import perf_counter
+from typing import NamedTuple
+
+import httpx
+from fastapi import HTTPException, status
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import joinedload, lazyload, selectinload
+
+from app.core.cache import bypass_cache
+from app.core.config import settings
+from app.core.query_stats import collect_queries
+
+
+class LoadingStrategyEnum(str, Enum):
+    auto = "auto"
+    lazy = "lazy"
+    selectin = "selectin"
+    joined = "joined"
+
+
+# Vorgaben pro Response-Modell: Relationship -> Strategie
+LOADING_DEFAULTS: dict[str, dict[str, LoadingStrategyEnum]] = {
+    "PostReadWithAuthor": {"author": LoadingStrategyEnum.auto},
+    "UserReadWithPosts": {"posts": LoadingStrategyEnum.selectin},
+}
+
+_LOADERS = {
+    LoadingStrategyEnum.lazy: lazyload,
+    LoadingStrategyEnum.selectin: selectinload,
+    LoadingStrategyEnum.joined: joinedload,
+}
+
+# Erzwungene Strategie für alle Relationships (nur Diagnose, siehe compare_strategies)
+_forced_strategy: ContextVar[LoadingStrategyEnum | None] = ContextVar("forced_loading_strategy", default=None)
+
+
+@contextmanager
+def force_strategy(strategy: LoadingStrategyEnum) -> Iterator[None]:
+    """Alle Routen im Block laden Relationships mit ``strategy``."""
+    token = _forced_strategy.set(strategy)
+    try:
+        yield
+    finally:
+        _forced_strategy.reset(token)
+
+
+def _overrides() -> dict[tuple[str, str], LoadingStrategyEnum]:
+    """LOADING_STRATEGY_OVERRIDES ("Modell.relationship=strategie,...") als Dict."""
+    result = {}
+    for entry in filter(None, (part.strip() for part in settings.LOADING_STRATEGY_OVERRIDES.split(","))):
+        target, _, strategy = entry.partition("=")
+        model, _, relationship = target.strip().partition(".")
+        result[(model, relationship)] = LoadingStrategyEnum(strategy.strip())
+    return result
+
+
+def choose_strategy(relationship, expected_rows: int) -> LoadingStrategyEnum:
+    """
+    ``auto``: joined für Many-to-One bei bis zu LOADING_JOINED_MAX_ROWS
+    Zeilen, sonst selectin.
+    """
+    if relationship.uselist or expected_rows > settings.LOADING_JOINED_MAX_ROWS:
+        return LoadingStrategyEnum.selectin
+    return LoadingStrategyEnum.joined
+
+
+class LoadingPlan(NamedTuple):
+    """Loader-Options für ein Statement plus die gewählten Strategien."""
+
+    options: list
+    strategies: dict[str, LoadingStrategyEnum]
+
+    @property
+    def lazy(self) -> list[str]:
+        """Relationships, die per Lazy Load kommen (async: selbst per ``refresh`` laden)."""
+        return [name for name, strategy in self.strategies.items() if strategy == LoadingStrategyEnum.lazy]
+
+    def header(self) -> str:
+        """Wert für ``X-Loading-Strategy``, z.B. ``author=joined``."""
+        return ",".join(f"{name}={strategy.value}" for name, strategy in self.strategies.items())
+
+
+def plan_loading(
+        entity,
+        response_model,
+        expected_rows: int,
+        strategy: LoadingStrategyEnum = LoadingStrategyEnum.auto
+) -> LoadingPlan:
+    """
+    Loader-Options für alle Relationships, die ``response_model`` ausliefert.
+
+    Args:
+        entity: Tabellen-Modell des Statements (z.B. ``Post``)
+        response_model: Response-Modell der Route (z.B. ``PostReadWithAuthor``)
+        expected_rows: Erwartete Anzahl Objekte (1 für Detail-Routen, sonst ``limit``)
+        strategy: Vom Client gewählte Strategie (``auto`` = Vorgaben/Regeln)
+
+    Reihenfolge: erzwungene Strategie (Diagnose) > ``strategy`` >
+    LOADING_STRATEGY_OVERRIDES > :data:`LOADING_DEFAULTS` > ``auto``.
+    """
+    relationships = sa_inspect(entity).relationships
+    defaults = LOADING_DEFAULTS.get(response_model.__name__, {})
+    overrides = _overrides()
+    options = []
+    strategies = {}
+    for name in response_model.model_fields:
+        relationship = relationships.get(name)
+        if relationship is None:
+            continue
+        chosen = _forced_strategy.get() or strategy
+        if chosen == LoadingStrategyEnum.auto:
+            chosen = overrides.get((response_model.__name__, name)) or defaults.get(name, LoadingStrategyEnum.auto)
+        if chosen == LoadingStrategyEnum.auto:
+            chosen = choose_strategy(relationship, expected_rows)
+        options.append(_LOADERS[chosen](getattr(entity, name)))
+        strategies[name] = chosen
+    return LoadingPlan(options=options, strategies=strategies)
+
+
+async def compare_strategies(app, path: str, repeat: int = 3) -> dict:
+    """
+    Führt ``GET path`` mit jeder Strategie ``repeat``-mal aus (ohne Response-Cache).
+
+    Returns:
+        dict: Pro Strategie Status, Queries, Zeilen, Bytes und Median-Zeiten
+            sowie die schnellste Strategie als ``recommended``
+    """
+    if not path.startswith(settings.API_V1_PREFIX + "/") or path.startswith(settings.API_V1_PREFIX + "/system"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Nur API-Pfade unter {settings.API_V1_PREFIX}/ (außer /system) können verglichen werden"
+        )
+
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://diagnostics") as client:
+        for strategy in (LoadingStrategyEnum.lazy, LoadingStrategyEnum.selectin, LoadingStrategyEnum.joined):
+            runs = []
+            with force_strategy(strategy), bypass_cache():
+                for _ in range(repeat):
+                    with collect_queries() as stats:
+                        start = perf_counter()
+                        response = await client.get(path)
+                        total = perf_counter() - start
+                    runs.append((stats, total))
+            results[strategy.value] = {
+                "status_code": response.status_code,
+                "loading": response.headers.get("X-Loading-Strategy"),
+                "queries": runs[-1][0].queries,
+                "rows": runs[-1][0].rows,
+                "bytes": len(response.content),
+                "db_ms": round(statistics.median(stats.db_time for stats, _ in runs) * 1000, 2),
+                "total_ms": round(statistics.median(total for _, total in runs) * 1000, 2),
+            }
+
+    successful = {name: result for name, result in results.items() if result["status_code"] == 200}
+    return {
+        "path": path,
+        "repeat": repeat,
+        "strategies": results,
+        "recommended": min(successful, key=lambda name: successful[name]["total_ms"]) if successful else None,
+    }
@@ -0,0 +1,210 @@
+"""
+Prometheus-Metriken
+===================
+Latenz je Route, Requests nach Status, Connection-Pool-Zustand,
+Query-Zeiten je Statement-Fingerprint und Response-Cache-Ereignisse
+für den ``/metrics``-Endpunkt.
+
+Aggregiert wird im Prozess mit ``prometheus_client`` (Zähler und
+Histogramme, keine Einzelwerte). Mit mehreren uvicorn-Workern
+PROMETHEUS_MULTIPROC_DIR setzen: Jeder Worker schreibt dann in eigene
+Dateien, und ``/metrics`` summiert alle Worker - egal welcher antwortet.
+Das Verzeichnis muss vor dem Start leer sein.
+"""
+
+import hashlib
+import os
+import re
+from functools import lru_cache
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+
+# Muss vor dem Import von prometheus_client gesetzt sein (wird dort beim Import gelesen)
+if settings.PROMETHEUS_MULTIPROC_DIR:
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", settings.PROMETHEUS_MULTIPROC_DIR)
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from app.core.cache import CacheStats, response_cache  # noqa: E402
+from app.core.query_stats import QueryStats, add_statement_listener  # noqa: E402
+
+
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+# Statement-Zeiten liegen meist im (Sub-)Millisekundenbereich
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERIES_PER_REQUEST_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 500)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Dauer der HTTP-Requests je Route",
+    ["method", "route"],
+)
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP-Requests je Route und Status",
+    ["method", "route", "status"],
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL-Statements pro Request je Route",
+    ["method", "route"],
+    buckets=QUERIES_PER_REQUEST_BUCKETS,
+)
+QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Dauer der SQL-Statements je Fingerprint",
+    ["statement"],
+    buckets=QUERY_BUCKETS,
+)
+POOL_SIZE = Gauge(
+    "db_pool_size", "Konfigurierte Pool-Größe", ["engine"], multiprocess_mode="livesum"
+)
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Aktuell ausgeliehene Verbindungen", ["engine"], multiprocess_mode="livesum"
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Aktuell offene Overflow-Verbindungen", ["engine"], multiprocess_mode="livesum"
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Wartezeit auf eine freie Verbindung (inkl. Verbindungsaufbau)",
+    ["engine"],
+    buckets=QUERY_BUCKETS,
+)
+POOL_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts",
+    "Checkouts, die nach DB_POOL_TIMEOUT abgebrochen wurden",
+    ["engine"],
+)
+CACHE_EVENTS = Counter(
+    "response_cache_events",
+    "Response-Cache: hits, misses, stores, evictions, expirations, invalidations, errors",
+    ["event"],
+)
+
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|\$\d+|(?<![:\w]):[A-Za-z_]\w*|\?")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUES_LIST = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+_known_statements: set[str] = set()
+_pools: dict[str, QueuePool] = {}
+
+
+@lru_cache(maxsize=2048)
+def statement_fingerprint(statement: str) -> str:
+    """
+    Normalisiert ein SQL-Statement zu einem stabilen Label.
+
+    Platzhalter und Literale werden zu ``?``, Listen wie ``IN (?, ?, ?)``
+    und mehrzeilige ``VALUES`` zu ``(...)`` - sonst ergäbe jede
+    Listenlänge (selectinload, Bulk-Inserts) ein eigenes Label.
+    """
+    fingerprint = _PLACEHOLDER.sub("?", statement)
+    fingerprint = _LITERAL.sub("?", fingerprint)
+    fingerprint = _PLACEHOLDER_LIST.sub("(...)", fingerprint)
+    fingerprint = _VALUES_LIST.sub("(...)", fingerprint)
+    fingerprint = _WHITESPACE.sub(" ", fingerprint).strip()
+    if len(fingerprint) > 200:
+        # Lange SELECTs unterscheiden sich oft erst hinter den Spalten (WHERE, JOIN)
+        digest = hashlib.sha1(fingerprint.encode()).hexdigest()[:10]
+        fingerprint = f"{fingerprint[:180]}... #{digest}"
+    return fingerprint
+
+
+def _observe_statement(statement: str, elapsed: float):
+    fingerprint = statement_fingerprint(statement)
+    if fingerprint not in _known_statements:
+        # Label-Anzahl begrenzen (z.B. bei dynamisch gebautem SQL)
+        if len(_known_statements) >= settings.METRICS_MAX_STATEMENTS:
+            fingerprint = "other"
+        else:
+            _known_statements.add(fingerprint)
+    QUERY_DURATION.labels(fingerprint).observe(elapsed)
+
+
+def _refresh_pool_gauges():
+    # Nach jedem Request und bei jedem Scrape - so sind die Werte auch im
+    # Multiprozess-Modus (ein Wert pro Worker) aktuell
+    for name, pool in _pools.items():
+        POOL_CHECKED_OUT.labels(name).set(pool.checkedout())
+        # overflow() ist negativ, solange der Pool noch nicht voll ist
+        POOL_OVERFLOW.labels(name).set(max(0, pool.overflow()))
+
+
+def observe_request(method: str, route: str, status_code: int, duration: float, stats: QueryStats):
+    """Verbucht einen abgeschlossenen Request (Aufruf aus der Middleware in ``main.py``)."""
+    REQUEST_DURATION.labels(method, route).observe(duration)
+    REQUESTS.labels(method, route, str(status_code)).inc()
+    REQUEST_QUERIES.labels(method, route).observe(stats.queries)
+    _refresh_pool_gauges()
+
+
+def instrument_pool(name: str, engine: Engine):
+    """Hängt Pool-Metriken an eine Engine (NullPool hat keinen Zustand -> nur Statements)."""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return
+
+    POOL_SIZE.labels(name).set(pool.size())
+    _pools[name] = pool
+    _refresh_pool_gauges()
+
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        def record_checkout(wait: float, timed_out: bool):
+            if timed_out:
+                POOL_TIMEOUTS.labels(name).inc()
+            else:
+                POOL_CHECKOUT_WAIT.labels(name).observe(wait)
+
+        stats.listeners.append(record_checkout)
+
+
+def instrument_cache(stats: CacheStats):
+    """Zählt die Ereignisse des Response-Caches mit."""
+    stats.listeners.append(lambda event, count: CACHE_EVENTS.labels(event).inc(count))
+
+
+def setup_metrics(engines: dict[str, Engine]):
+    """Registriert Statement-, Pool- und Cache-Metriken."""
+    add_statement_listener(_observe_statement)
+    for name, engine in engines.items():
+        instrument_pool(name, engine)
+    instrument_cache(response_cache.stats)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Metriken im Prometheus-Textformat.
+
+    Returns:
+        tuple[bytes, str]: (Body, Content-Type)
+    """
+    _refresh_pool_gauges()
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead():
+    """Entfernt die Live-Gauges dieses Workers (beim Herunterfahren aufrufen)."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
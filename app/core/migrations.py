@@ -0,0 +1,128 @@
+"""
+Migrationen
+===========
+Schema-Änderungen laufen über Alembic (Verzeichnis ``migrations/``).
+
+``create_all()`` legt nur fehlende Tabellen an - neue Spalten oder
+Indizes auf bestehenden Tabellen kommen so nie in die Datenbank.
+Hier liegen der programmatische Einstieg (``upgrade_database``) und
+Helfer für Migrationen, die auf einer laufenden Datenbank sicher sind.
+"""
+
+from pathlib import Path
+
+from alembic import command, context, op
+from alembic.config import Config
+from sqlalchemy import inspect, text
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations"
+
+
+def alembic_config(url: str | None = None) -> Config:
+    """
+    Alembic-Konfiguration ohne alembic.ini (unabhängig vom Arbeitsverzeichnis).
+
+    Args:
+        url: Datenbank-URL (None = ``settings.database_url``)
+    """
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    config.attributes["configure_logger"] = False
+    if url is not None:
+        config.attributes["url"] = url
+    return config
+
+
+def upgrade_database(url: str | None = None, revision: str = "head"):
+    """Bringt die Datenbank auf den Stand ``revision`` (Default: neueste Migration)."""
+    command.upgrade(alembic_config(url), revision)
+
+
+def table_exists(name: str) -> bool:
+    """
+    Existiert die Tabelle schon? (Für Migrationen auf per create_all angelegten DBs.)
+
+    Im Offline-Modus (``--sql``) gibt es keine Datenbank - dann False.
+    """
+    if context.is_offline_mode():
+        return False
+    return inspect(op.get_bind()).has_table(name)
+
+
+def column_exists(table: str, column: str) -> bool:
+    """Hat die Tabelle die Spalte schon? (Offline-Modus: False, wie ``table_exists``.)"""
+    if context.is_offline_mode():
+        return False
+    return any(col["name"] == column for col in inspect(op.get_bind()).get_columns(table))
+
+
+def _drop_invalid_index(name: str):
+    # Ein abgebrochenes CREATE INDEX CONCURRENTLY hinterlässt einen INVALID Index,
+    # den IF NOT EXISTS für vorhanden hält - vorher entfernen.
+    if context.is_offline_mode():
+        return
+    invalid = op.get_bind().execute(text(
+        "SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid "
+        "WHERE pg_class.relname = :name AND NOT pg_index.indisvalid"
+    ), {"name": name}).first()
+    if invalid is not None:
+        with op.get_context().autocommit_block():
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def create_index_online(
+        name: str,
+        table: str,
+        columns: list[str],
+        *,
+        unique: bool = False,
+        postgresql_only: bool = False,
+        **dialect_kwargs
+):
+    """
+    Legt einen Index an, ohne die Tabelle für Schreibzugriffe zu sperren.
+
+    PostgreSQL: ``CREATE INDEX CONCURRENTLY IF NOT EXISTS`` außerhalb der
+    Migrations-Transaktion (Autocommit). Dauert länger, blockiert aber
+    keine INSERTs/UPDATEs - sicher auf einer Datenbank unter Last.
+    Andere Datenbanken: normales ``CREATE INDEX IF NOT EXISTS``.
+
+    Args:
+        name: Indexname
+        table: Tabellenname
+        columns: Spalten (oder SQL-Ausdrücke)
+        unique: UNIQUE-Index?
+        postgresql_only: Nur auf PostgreSQL anlegen (z.B. GIN/Trigram)
+        **dialect_kwargs: z.B. ``postgresql_using="gin"``, ``postgresql_ops={...}``,
+            ``postgresql_where``/``sqlite_where`` für partielle Indizes
+    """
+    dialect = op.get_bind().dialect.name
+    if postgresql_only and dialect != "postgresql":
+        return
+    if dialect != "postgresql":
+        # Nur die Optionen des eigenen Dialekts (z.B. sqlite_where für partielle Indizes)
+        own_kwargs = {key: value for key, value in dialect_kwargs.items() if key.startswith(f"{dialect}_")}
+        op.create_index(name, table, columns, unique=unique, if_not_exists=True, **own_kwargs)
+        return
+
+    _drop_invalid_index(name)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            name, table, columns,
+            unique=unique,
+            if_not_exists=True,
+            postgresql_concurrently=True,
+            **dialect_kwargs
+        )
+
+
+def drop_index_online(name: str, table: str, *, postgresql_only: bool = False):
+    """Gegenstück zu :func:`create_index_online` (``DROP INDEX CONCURRENTLY``)."""
+    dialect = op.get_bind().dialect.name
+    if postgresql_only and dialect != "postgresql":
+        return
+    if dialect != "postgresql":
+        op.drop_index(name, table_name=table, if_exists=True)
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
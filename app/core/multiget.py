@@ -0,0 +1,93 @@
+"""
+Multi-Get
+=========
+Mehrere Objekte per ID mit einem Request und einer Query laden -
+statt ``GET /users/{id}`` einmal pro Author eines Feeds.
+
+- ``GET /users?ids=1,2,3`` bzw. ``GET /posts?ids=...``: Liste in der
+  angefragten Reihenfolge, nicht gefundene IDs im Header ``X-Missing-Ids``
+- ``POST /users/batch`` bzw. ``POST /posts/batch`` mit ``{"ids": [...]}``
+  für lange Listen (URL-Länge): ``{"items": [...], "missing": [...]}``
+
+Auf PostgreSQL wird die Liste als ein Array-Parameter übergeben
+(``WHERE id = ANY(:ids)``): dasselbe Statement für jede Anzahl IDs, also
+auch nur ein Eintrag im Prepared-Statement-Cache von asyncpg und in
+``pg_stat_statements``. Andere Datenbanken bekommen ``IN (...)``.
+"""
+
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import Integer, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.core.config import settings
+
+IDS_DESCRIPTION = "Komma-getrennte IDs, z.B. 1,2,3 (ersetzt die Pagination)"
+
+
+def parse_ids(raw: str) -> list[int]:
+    """
+    ``"3,1,2"`` -> ``[3, 1, 2]`` (siehe :func:`check_ids`).
+
+    Raises:
+        HTTPException 400: Keine Ganzzahl in der Liste
+    """
+    try:
+        ids = [int(part) for part in raw.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids muss eine Komma-getrennte Liste von Ganzzahlen sein"
+        )
+    return check_ids(ids)
+
+
+def check_ids(ids: Iterable[int]) -> list[int]:
+    """
+    Doppelte IDs entfernen (erste Position zählt) und Anzahl prüfen.
+
+    Raises:
+        HTTPException 400: Keine oder mehr als MULTI_GET_MAX_IDS IDs
+    """
+    unique = list(dict.fromkeys(ids))
+    if not unique:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Mindestens eine ID angeben"
+        )
+    if len(unique) > settings.MULTI_GET_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Höchstens {settings.MULTI_GET_MAX_IDS} IDs pro Request"
+        )
+    return unique
+
+
+def id_filter(column, ids: list[int], dialect_name: str):
+    """``column = ANY(:ids)`` auf PostgreSQL, sonst ``column IN (...)``."""
+    if dialect_name == "postgresql":
+        return column == any_(bindparam("ids", ids, type_=ARRAY(Integer)))
+    return column.in_(ids)
+
+
+def in_requested_order(
+        rows: Iterable[Any],
+        ids: list[int],
+        key: Callable[[Any], int] = lambda row: row.id
+) -> tuple[list[Any], list[int]]:
+    """
+    Ergebnis-Zeilen in die Reihenfolge von ``ids`` bringen.
+
+    Returns:
+        tuple: (gefundene Zeilen in angefragter Reihenfolge, fehlende IDs)
+    """
+    by_id = {key(row): row for row in rows}
+    return [by_id[id_] for id_ in ids if id_ in by_id], [id_ for id_ in ids if id_ not in by_id]
+
+
+def set_missing_header(response: Response, missing: list[int]):
+    """Nicht gefundene IDs als ``X-Missing-Ids`` (nur falls welche fehlen)."""
+    if missing:
+        response.headers["X-Missing-Ids"] = ",".join(map(str, missing))
@@ -0,0 +1,290 @@
+"""
+Keyset-Pagination
+=================
+Cursor-basierte Pagination ("Seek Method") für beliebige Statements.
+
+Statt ``OFFSET n`` merkt sich der Cursor den Sortierwert und die ID
+des letzten Eintrags einer Seite. Die nächste Seite wird dann mit
+``WHERE (sort_col, id) > (:wert, :id)`` gelesen - das kann die
+Datenbank direkt über einen Index beantworten, Seite 5.000 ist also
+genauso schnell wie Seite 1.
+
+Der Cursor ist für den Client opak: JSON-Payload, base64url-kodiert
+und per HMAC signiert, damit er nicht manipuliert werden kann. Er gilt
+nur für die Sortierung und die Filter (``scope``), mit denen er erzeugt
+wurde, und läuft nach CURSOR_MAX_AGE_SECONDS ab.
+"""
+
+import base64
+import datetime
+import hashlib
+import hmac
+import json
+import time
+from enum import StrEnum
+from typing import Any, NamedTuple
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import tuple_
+from sqlmodel import Session, asc, desc
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+
+
+class PaginationModeEnum(StrEnum):
+    offset = "offset"
+    cursor = "cursor"
+
+
+class CursorPage(NamedTuple):
+    """Ergebnis einer Keyset-Abfrage."""
+
+    items: list
+    next_cursor: str | None
+    prev_cursor: str | None
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _scope_hash(scope: dict[str, Any] | None) -> str | None:
+    """Kurzer Fingerabdruck der Filter (None-Werte zählen nicht)."""
+    normalized = {name: value for name, value in sorted((scope or {}).items()) if value is not None}
+    if not normalized:
+        return None
+    digest = hashlib.sha256(json.dumps(normalized, sort_keys=True, default=str).encode("utf-8"))
+    return _b64encode(digest.digest()[:8])
+
+
+def _sign(payload: bytes) -> bytes:
+    key = settings.CURSOR_SECRET_KEY.encode("utf-8")
+    return hmac.new(key, payload, hashlib.sha256).digest()[:16]
+
+
+def encode_cursor(
+        sort_key: str,
+        descending: bool,
+        value: Any,
+        last_id: int,
+        direction: str = "next",
+        scope: dict[str, Any] | None = None
+) -> str:
+    """
+    Erzeugt einen signierten Cursor.
+
+    Args:
+        sort_key: Name der Sortierspalte (z.B. "created_at")
+        descending: Absteigende Sortierung?
+        value: Sortierwert des Grenz-Eintrags
+        last_id: ID des Grenz-Eintrags (Tiebreaker)
+        direction: "next" oder "prev"
+        scope: Filter der Abfrage - der Cursor gilt nur mit denselben Filtern
+
+    Returns:
+        str: Opaker Cursor-String
+    """
+    data = {
+        "k": sort_key, "o": "desc" if descending else "asc", "id": last_id, "d": direction,
+        "iat": int(time.time()),
+    }
+    scope_hash = _scope_hash(scope)
+    if scope_hash is not None:
+        data["f"] = scope_hash
+    if isinstance(value, datetime.datetime):
+        data["v"] = value.isoformat()
+        data["t"] = "dt"
+    else:
+        data["v"] = value
+
+    payload = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
+
+
+def decode_cursor(
+        cursor: str,
+        sort_key: str,
+        descending: bool,
+        scope: dict[str, Any] | None = None
+) -> dict:
+    """
+    Prüft Signatur, Alter und Kontext eines Cursors und gibt die Payload zurück.
+
+    Raises:
+        HTTPException 400: Cursor ist ungültig, abgelaufen oder gehört zu
+            einer anderen Sortierung bzw. anderen Filtern
+    """
+    try:
+        payload_part, signature_part = cursor.split(".", 1)
+        payload = _b64decode(payload_part)
+        if not hmac.compare_digest(_sign(payload), _b64decode(signature_part)):
+            raise ValueError("Signatur ungültig")
+        data = json.loads(payload)
+        if data.get("t") == "dt":
+            data["v"] = datetime.datetime.fromisoformat(data["v"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Ungültiger Cursor"
+        ) from exc
+
+    if data["k"] != sort_key or data["o"] != ("desc" if descending else "asc"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor passt nicht zur gewählten Sortierung"
+        )
+    if data.get("f") != _scope_hash(scope):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor passt nicht zu den gewählten Filtern"
+        )
+    max_age = settings.CURSOR_MAX_AGE_SECONDS
+    if max_age > 0 and time.time() - data.get("iat", 0) > max_age:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor abgelaufen - bitte von der ersten Seite neu beginnen"
+        )
+    return data
+
+
+class _KeysetQuery(NamedTuple):
+    """Vorbereitete Keyset-Abfrage (intern, für sync und async)."""
+
+    statement: Any
+    sort_key: str
+    id_key: str
+    descending: bool
+    direction: str
+    limit: int
+    has_cursor: bool
+    scope: dict[str, Any] | None
+
+
+def _build_keyset_query(statement, sort_column, id_column, descending, limit, cursor, scope) -> _KeysetQuery:
+    """Ergänzt das Statement um Keyset-Bedingung, Sortierung und LIMIT."""
+    sort_key = sort_column.key
+    direction = "next"
+
+    if cursor is not None:
+        data = decode_cursor(cursor, sort_key, descending, scope)
+        direction = data["d"]
+        boundary = (data["v"], data["id"])
+        keys = tuple_(sort_column, id_column)
+        # Rückwärts blättern = in umgekehrter Richtung vom Grenz-Eintrag aus suchen
+        if descending == (direction == "next"):
+            statement = statement.where(keys < tuple_(*boundary))
+        else:
+            statement = statement.where(keys > tuple_(*boundary))
+
+    scan_descending = descending if direction == "next" else not descending
+    order = desc if scan_descending else asc
+    statement = statement.order_by(order(sort_column), order(id_column)).limit(limit + 1)
+
+    return _KeysetQuery(
+        statement=statement,
+        sort_key=sort_key,
+        id_key=id_column.key,
+        descending=descending,
+        direction=direction,
+        limit=limit,
+        has_cursor=cursor is not None,
+        scope=scope
+    )
+
+
+def _finish_keyset_page(query: _KeysetQuery, rows: list) -> CursorPage:
+    """Schneidet den Extra-Eintrag ab und erzeugt die Nachbar-Cursor."""
+    has_more = len(rows) > query.limit
+    rows = rows[:query.limit]
+
+    if query.direction == "prev":
+        rows.reverse()
+
+    def cursor_for(row, cursor_direction: str) -> str:
+        return encode_cursor(
+            query.sort_key, query.descending, getattr(row, query.sort_key),
+            getattr(row, query.id_key), cursor_direction, query.scope
+        )
+
+    next_cursor = prev_cursor = None
+    if rows:
+        # Vorwärts: weitere Seite nur wenn has_more; rückwärts: es gibt immer eine
+        if has_more or query.direction == "prev":
+            next_cursor = cursor_for(rows[-1], "next")
+        if query.has_cursor and (has_more or query.direction == "next"):
+            prev_cursor = cursor_for(rows[0], "prev")
+
+    return CursorPage(items=rows, next_cursor=next_cursor, prev_cursor=prev_cursor)
+
+
+def paginate_keyset(
+        session: Session,
+        statement,
+        *,
+        sort_column,
+        id_column,
+        descending: bool,
+        limit: int,
+        cursor: str | None = None,
+        scope: dict[str, Any] | None = None
+) -> CursorPage:
+    """
+    Führt ein Statement als Keyset-Abfrage aus.
+
+    Das Statement darf Filter enthalten, aber noch keine Sortierung
+    und kein LIMIT/OFFSET - beides wird hier gesetzt. Es wird ein
+    Eintrag mehr als ``limit`` gelesen, um zu wissen, ob es eine
+    weitere Seite gibt (kein COUNT nötig).
+
+    Args:
+        session: Datenbank-Session
+        statement: Gefiltertes select()-Statement
+        sort_column: Spalte, nach der sortiert wird
+        id_column: Eindeutige Spalte als Tiebreaker (meist die ID)
+        descending: Absteigende Sortierung?
+        limit: Einträge pro Seite
+        cursor: Cursor aus einer vorherigen Antwort (None = erste Seite)
+        scope: Filter-Parameter des Requests (z.B. ``{"user_id": 5}``) -
+            ein Cursor wird nur mit denselben Filtern angenommen
+
+    Returns:
+        CursorPage: Einträge plus Cursor für nächste/vorherige Seite
+    """
+    query = _build_keyset_query(statement, sort_column, id_column, descending, limit, cursor, scope)
+    rows = list(session.exec(query.statement).all())
+    return _finish_keyset_page(query, rows)
+
+
+async def paginate_keyset_async(
+        session: AsyncSession,
+        statement,
+        *,
+        sort_column,
+        id_column,
+        descending: bool,
+        limit: int,
+        cursor: str | None = None,
+        scope: dict[str, Any] | None = None
+) -> CursorPage:
+    """Async-Variante von :func:`paginate_keyset` für ``AsyncSession``."""
+    query = _build_keyset_query(statement, sort_column, id_column, descending, limit, cursor, scope)
+    rows = list((await session.exec(query.statement)).all())
+    return _finish_keyset_page(query, rows)
+
+
+def set_cursor_headers(response: Response, page: CursorPage):
+    """
+    Schreibt die Cursor einer Seite in die Response-Header.
+
+    Für Listen-Endpunkte, deren Response-Modell eine reine Liste ist
+    und deshalb keine Cursor-Felder hat.
+    """
+    if page.next_cursor is not None:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    if page.prev_cursor is not None:
+        response.headers["X-Prev-Cursor"] = page.prev_cursor
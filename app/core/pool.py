@@ -0,0 +1,111 @@
+"""
+Connection-Pool
+===============
+Pool-Klassen mit Wartezeit-Messung und Pool-Statistiken.
+
+SQLAlchemy kennt kein Event "vor dem Checkout", deshalb messen die
+Pool-Klassen hier direkt in ``_do_get()``, wie lange ein Request auf
+eine freie Verbindung warten musste (inkl. Aufbau neuer Verbindungen).
+"""
+
+import threading
+from collections.abc import Callable
+from time import perf_counter
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolStats:
+    """Thread-sichere Zähler für Checkouts und Wartezeiten eines Pools."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        # Callbacks (wait, timed_out), z.B. für Prometheus-Histogramme
+        self.listeners: list[Callable[[float, bool], None]] = []
+
+    def record(self, wait: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+        for listener in self.listeners:
+            listener(wait, timed_out)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts_total": self.checkouts,
+                "checkout_timeouts_total": self.timeouts,
+                "wait_seconds_total": self.wait_total,
+                "wait_seconds_avg": self.wait_total / attempts if attempts else 0.0,
+                "wait_seconds_max": self.wait_max,
+            }
+
+
+class _TimedCheckoutMixin:
+    """Misst die Dauer jedes Checkouts und schreibt sie in ``self.stats``."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        start = perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record(perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record(perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    """QueuePool mit Wartezeit-Statistik (sync Engine)."""
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool mit Wartezeit-Statistik (async Engine)."""
+
+
+def pool_status(engine: Engine) -> dict:
+    """
+    Liefert den aktuellen Zustand des Pools einer Engine.
+
+    Für QueuePools: Größe, belegte/freie Verbindungen und Overflow.
+    NullPool hält keine Verbindungen und liefert nur den Klassennamen.
+
+    Returns:
+        dict: Pool-Kennzahlen
+    """
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            # overflow() ist negativ, solange der Pool noch nicht voll ist
+            overflow=max(0, pool.overflow()),
+            max_overflow=pool._max_overflow,
+        )
+        # Anteil belegter Verbindungen am Maximum (1.0 = neue Requests müssen warten)
+        capacity = pool.size() + pool._max_overflow
+        status["saturation"] = pool.checkedout() / capacity if pool._max_overflow >= 0 and capacity else None
+
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(stats.snapshot())
+
+    return status
@@ -0,0 +1,175 @@
+"""
+Post-Zähler
+===========
+Hält ``users.post_count`` per Datenbank-Trigger aktuell.
+
+Trigger statt ORM-Events, weil nicht jeder Schreibzugriff über die
+Session läuft: Bulk-Endpunkte schreiben per ``insert()``, der
+Testdaten-Generator per COPY. Die Trigger erfassen alles.
+
+- PostgreSQL: Statement-Trigger mit Transition Tables - ein Bulk-Insert
+  von 10.000 Posts macht ein UPDATE je betroffenem User, nicht 10.000.
+- SQLite: Zeilen-Trigger (SQLite kennt keine Statement-Trigger).
+
+Weicht der Zähler trotzdem ab (Trigger fehlten, TRUNCATE, manuelle
+Eingriffe), korrigiert ``python -m app.rebuild_post_counts`` ihn.
+"""
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import Connection
+
+POSTGRES_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION posts_count_insert() RETURNS trigger AS $$
+    BEGIN
+        UPDATE users SET post_count = users.post_count + changed.n
+        FROM (SELECT user_id, count(*) AS n FROM new_posts GROUP BY user_id) AS changed
+        WHERE users.id = changed.user_id;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION posts_count_delete() RETURNS trigger AS $$
+    BEGIN
+        UPDATE users SET post_count = users.post_count - changed.n
+        FROM (SELECT user_id, count(*) AS n FROM old_posts GROUP BY user_id) AS changed
+        WHERE users.id = changed.user_id;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION posts_count_move() RETURNS trigger AS $$
+    BEGIN
+        UPDATE users SET post_count = post_count - 1 WHERE id = OLD.user_id;
+        UPDATE users SET post_count = post_count + 1 WHERE id = NEW.user_id;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS posts_count_insert ON posts",
+    "DROP TRIGGER IF EXISTS posts_count_delete ON posts",
+    "DROP TRIGGER IF EXISTS posts_count_move ON posts",
+    """
+    CREATE TRIGGER posts_count_insert AFTER INSERT ON posts
+    REFERENCING NEW TABLE AS new_posts
+    FOR EACH STATEMENT EXECUTE FUNCTION posts_count_insert()
+    """,
+    """
+    CREATE TRIGGER posts_count_delete AFTER DELETE ON posts
+    REFERENCING OLD TABLE AS old_posts
+    FOR EACH STATEMENT EXECUTE FUNCTION posts_count_delete()
+    """,
+    # Autorwechsel ist selten - Zeilen-Trigger, der nur bei geänderter user_id feuert
+    """
+    CREATE TRIGGER posts_count_move AFTER UPDATE OF user_id ON posts
+    FOR EACH ROW WHEN (OLD.user_id IS DISTINCT FROM NEW.user_id)
+    EXECUTE FUNCTION posts_count_move()
+    """,
+]
+
+SQLITE_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_count_insert AFTER INSERT ON posts
+    BEGIN
+        UPDATE users SET post_count = post_count + 1 WHERE id = NEW.user_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_count_delete AFTER DELETE ON posts
+    BEGIN
+        UPDATE users SET post_count = post_count - 1 WHERE id = OLD.user_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_count_move AFTER UPDATE OF user_id ON posts
+    WHEN OLD.user_id IS NOT NEW.user_id
+    BEGIN
+        UPDATE users SET post_count = post_count - 1 WHERE id = OLD.user_id;
+        UPDATE users SET post_count = post_count + 1 WHERE id = NEW.user_id;
+    END
+    """,
+]
+
+TRIGGER_DDL = {
+    "postgresql": POSTGRES_DDL,
+    "sqlite": SQLITE_DDL,
+}
+
+# Tatsächliche Anzahl je User; UPDATE ... FROM können PostgreSQL und SQLite (>= 3.33)
+RECONCILE_SQL = """
+    UPDATE users SET post_count = actual.n
+    FROM (
+        SELECT users.id, count(posts.id) AS n
+        FROM users LEFT JOIN posts ON posts.user_id = users.id
+        GROUP BY users.id
+    ) AS actual
+    WHERE users.id = actual.id AND users.post_count <> actual.n
+"""
+
+DRIFT_SQL = """
+    SELECT count(*) FROM (
+        SELECT users.id
+        FROM users LEFT JOIN posts ON posts.user_id = users.id
+        GROUP BY users.id, users.post_count
+        HAVING users.post_count <> count(posts.id)
+    ) AS drift
+"""
+
+
+def install_post_count_triggers(connection: Connection) -> bool:
+    """
+    Legt die Zähler-Trigger an (idempotent).
+
+    Returns:
+        bool: False, wenn der Datenbank-Dialekt nicht unterstützt wird
+    """
+    statements = TRIGGER_DDL.get(connection.dialect.name)
+    if statements is None:
+        return False
+    for statement in statements:
+        connection.execute(text(statement))
+    return True
+
+
+def ensure_post_count_column(connection: Connection) -> bool:
+    """
+    Ergänzt ``users.post_count`` in bestehenden Datenbanken.
+
+    Returns:
+        bool: True, wenn die Spalte neu angelegt wurde
+    """
+    columns = {column["name"] for column in inspect(connection).get_columns("users")}
+    if "post_count" in columns:
+        return False
+    connection.execute(text("ALTER TABLE users ADD COLUMN post_count INTEGER NOT NULL DEFAULT 0"))
+    connection.execute(text("CREATE INDEX IF NOT EXISTS ix_users_post_count_id ON users (post_count, id)"))
+    return True
+
+
+def count_post_count_drift(connection: Connection) -> int:
+    """Anzahl User, deren ``post_count`` nicht zur posts-Tabelle passt."""
+    return connection.execute(text(DRIFT_SQL)).scalar_one()
+
+
+def reconcile_post_counts(connection: Connection) -> int:
+    """
+    Setzt ``post_count`` aller abweichenden User auf den tatsächlichen Wert.
+
+    Auf PostgreSQL wird ``posts`` dafür kurz gegen Schreibzugriffe gesperrt
+    (Lesen bleibt möglich), sonst könnte ein paralleler Insert zwischen
+    Zählen und Schreiben verloren gehen.
+
+    Returns:
+        int: Anzahl korrigierter User
+    """
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("LOCK TABLE posts IN SHARE MODE"))
+    return connection.execute(text(RECONCILE_SQL)).rowcount
+
+
+def _after_posts_create(target, connection: Connection, **kw):
+    install_post_count_triggers(connection)
+
+
+def register_post_count_triggers(posts_table):
+    """Installiert die Trigger automatisch bei ``create_all()`` der posts-Tabelle."""
+    event.listen(posts_table, "after_create", _after_posts_create)
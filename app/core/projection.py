@@ -0,0 +1,85 @@
+"""
+Projektionen und Sparse Fieldsets
+=================================
+Listen-Endpunkte lesen nur die benötigten Spalten als einfache Zeilen.
+
+``select(Post)`` baut für jede Zeile ein ORM-Objekt, trägt es in die
+Identity Map der Session ein und validiert es danach noch einmal in
+das Response-Modell - bei Listen der größte Teil der CPU-Zeit, und
+``content`` wird gelesen, auch wenn die Liste ihn gar nicht anzeigt.
+
+Hier stattdessen:
+- ``?fields=id,title,created_at`` wählt die Felder (Default: alle Felder
+  des Response-Modells)
+- ``select(Post.id, Post.title, ...)`` liefert schlanke Row-Tupel ohne
+  ORM-Objekte und ohne Identity Map
+- die Rows werden direkt zu JSON serialisiert (``app.core.serialization.dumps``)
+"""
+
+from typing import Any
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import select
+
+from app.core.serialization import dumps
+
+
+class FieldSet:
+    """
+    Erlaubte Felder eines Lese-Modells und ihre Spalten in der Tabelle.
+
+    Args:
+        table_model: SQLModel-Tabelle (z.B. ``Post``)
+        read_model: Response-Modell (z.B. ``PostRead``) - legt erlaubte
+            Felder und ihre Reihenfolge in der Antwort fest
+    """
+
+    def __init__(self, table_model, read_model):
+        self.table_model = table_model
+        self.names = list(read_model.model_fields)
+
+    def parse(self, fields: str | None) -> list[str]:
+        """
+        Prüft den ``fields``-Parameter.
+
+        Returns:
+            list[str]: Feldnamen in der Reihenfolge des Response-Modells
+
+        Raises:
+            HTTPException 400: Unbekanntes oder kein Feld angegeben
+        """
+        if fields is None:
+            return self.names
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested - set(self.names)
+        if unknown or not requested:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Ungültige Felder: {', '.join(sorted(unknown)) or '(leer)'}. "
+                       f"Erlaubt: {', '.join(self.names)}"
+            )
+        return [name for name in self.names if name in requested]
+
+    def select(self, fields: list[str], *required: str):
+        """
+        ``select()`` nur über die Spalten der Felder.
+
+        Args:
+            fields: Felder aus :meth:`parse`
+            *required: Zusätzlich benötigte Spalten, z.B. Sortierspalte und
+                ID für die Keyset-Pagination (landen nicht in der Antwort)
+        """
+        names = dict.fromkeys([*fields, *required])
+        # sqlalchemy.select statt sqlmodel.select: liefert auch bei nur
+        # einer Spalte Rows statt Skalare
+        return select(*(getattr(self.table_model, name) for name in names))
+
+    @staticmethod
+    def rows(rows, fields: list[str]) -> list[dict[str, Any]]:
+        """Rows -> Dicts mit genau den angeforderten Feldern."""
+        return [{name: row._mapping[name] for name in fields} for row in rows]
+
+
+def json_response(content: Any, headers: dict[str, str] | None = None) -> Response:
+    """Serialisiert Dicts/Listen direkt zu JSON (ohne Response-Modell)."""
+    return Response(content=dumps(content), media_type="application/json", headers=headers)
@@ -0,0 +1,131 @@
+"""
+Query-Statistiken
+=================
+Zählt SQL-Statements, Datenbank-Zeit und gelieferte Zeilen pro
+Arbeitseinheit (z.B. pro Request oder Benchmark-Aufruf).
+
+Die Zähler hängen an einer ContextVar: Jeder Request bekommt seinen
+eigenen Sammler, auch bei paralleler Verarbeitung. FastAPI kopiert den
+Context in den Threadpool (sync Routen) und SQLAlchemy in die Greenlets
+der async Engine - die Event-Hooks sehen also immer den richtigen Sammler.
+
+Sammler lassen sich verschachteln (z.B. Benchmark um einen Request, der
+selbst von der Middleware gezählt wird) - jedes Statement zählt in allen
+aktiven Sammlern.
+
+Zeilen stammen aus ``cursor.rowcount``. PostgreSQL liefert dort auch
+für SELECTs die Anzahl, SQLite nicht (-1) - dort bleibt ``rows`` bei 0.
+"""
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@dataclass
+class QueryStats:
+    """Gesammelte Kennzahlen einer Arbeitseinheit."""
+
+    queries: int = 0
+    rows: int = 0
+    db_time: float = 0.0
+
+
+_active_stats: ContextVar[tuple[QueryStats, ...]] = ContextVar("query_stats", default=())
+
+# Callbacks (statement, dauer) für jedes ausgeführte Statement, z.B. Metriken
+_statement_listeners: list[Callable[[str, float], None]] = []
+
+
+@contextmanager
+def collect_queries() -> Iterator[QueryStats]:
+    """
+    Sammelt alle Statements, die innerhalb des Blocks ausgeführt werden.
+
+    Verwendung:
+    ```python
+    with collect_queries() as stats:
+        session.exec(select(Post)).all()
+    print(stats.queries, stats.db_time)
+    ```
+    """
+    stats = QueryStats()
+    token = _active_stats.set(_active_stats.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active_stats.reset(token)
+
+
+def current_query_stats() -> QueryStats | None:
+    """Der innerste aktive Sammler (oder None außerhalb von :func:`collect_queries`)."""
+    active = _active_stats.get()
+    return active[-1] if active else None
+
+
+def add_statement_listener(listener: Callable[[str, float], None]):
+    """
+    Registriert einen Callback, der nach jedem Statement mit SQL-Text
+    und Dauer (Sekunden) aufgerufen wird - unabhängig von :func:`collect_queries`.
+    """
+    if listener not in _statement_listeners:
+        _statement_listeners.append(listener)
+
+
+def server_timing(stats: QueryStats, total: float) -> str:
+    """
+    Baut den ``Server-Timing``-Header (Browser-DevTools zeigen ihn im Timing-Tab).
+
+    Args:
+        stats: Gesammelte Query-Kennzahlen des Requests
+        total: Gesamtdauer des Requests in Sekunden
+    """
+    return (
+        f'db;dur={stats.db_time * 1000:.2f};desc="{stats.queries} queries, {stats.rows} rows", '
+        f"app;dur={max(total - stats.db_time, 0.0) * 1000:.2f}, "
+        f"total;dur={total * 1000:.2f}"
+    )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = perf_counter() - conn.info["query_start_time"].pop()
+    for listener in _statement_listeners:
+        listener(statement, elapsed)
+    active = _active_stats.get()
+    if not active:
+        return
+    rows = cursor.rowcount if cursor.description is not None and cursor.rowcount > 0 else 0
+    for stats in active:
+        stats.queries += 1
+        stats.db_time += elapsed
+        stats.rows += rows
+
+
+def _handle_error(exception_context):
+    # Fehlgeschlagene Statements erreichen after_cursor_execute nie
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+
+def instrument_engine(engine: Engine):
+    """
+    Hängt die Zähl-Hooks an eine (sync) Engine.
+
+    Für async Engines ``async_engine.sync_engine`` übergeben.
+    Mehrfacher Aufruf ist unschädlich.
+    """
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,186 @@
+"""
+Volltextsuche
+=============
+Suche über Titel und Inhalt der Posts mit Ranking und Hervorhebung.
+
+Zwei Backends, je nach Datenbank:
+- PostgreSQL: generierte ``tsvector``-Spalte ``posts.search_vector``
+  (Titel Gewicht A, Inhalt Gewicht B) mit GIN-Index, Ranking per
+  ``ts_rank_cd``, Hervorhebung per ``ts_headline``.
+- SQLite: FTS5-Tabelle ``posts_fts`` (External Content auf ``posts``,
+  per Trigger synchron), Ranking per ``bm25``, Hervorhebung per
+  ``highlight``/``snippet`` - damit funktioniert die Suche auch lokal.
+
+Die Suchspalten stehen bewusst nicht im SQLModel: ``select(Post)``
+soll den tsvector nicht bei jeder Abfrage mitladen.
+
+Hervorhebungen sind HTML (siehe :func:`render_hits`): der Post-Text wird
+escaped, nur die ``<mark>``-Tags kommen von hier. Die Datenbank markiert
+dafür mit Steuerzeichen statt direkt mit Tags.
+"""
+
+import html
+import re
+from collections.abc import Iterable
+
+from sqlalchemy import func, literal_column, table, column
+from sqlmodel import select
+
+from app.models import Post
+
+# Text-Suchkonfiguration ohne Stemming - sprachneutral für gemischte Inhalte.
+# Änderung braucht eine Migration (die generierte Spalte nutzt sie fest).
+SEARCH_CONFIG = "simple"
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+
+# Marker in der Datenbank-Ausgabe (STX/ETX), erst nach dem Escapen zu <mark>
+_MARK_START = "\x02"
+_MARK_STOP = "\x03"
+
+# Von den Migrationen angelegt, nicht im SQLModel-Metadata (für Alembic-Autogenerate)
+SEARCH_SCHEMA_OBJECTS = {
+    "search_vector", "ix_posts_search_vector",
+    "posts_fts", "posts_fts_data", "posts_fts_idx", "posts_fts_docsize", "posts_fts_config",
+}
+
+POSTGRES_DDL = [
+    f"""
+    ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(content, '')), 'B')
+    ) STORED
+    """,
+]
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+        title, content,
+        content='posts', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_insert AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_fts(rowid, title, content) VALUES (NEW.id, NEW.title, NEW.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_delete AFTER DELETE ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', OLD.id, OLD.title, OLD.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_update AFTER UPDATE OF title, content ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', OLD.id, OLD.title, OLD.content);
+        INSERT INTO posts_fts(rowid, title, content) VALUES (NEW.id, NEW.title, NEW.content);
+    END
+    """,
+    # Bestehende Posts indizieren
+    "INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')",
+]
+
+SEARCH_DDL = {
+    "postgresql": POSTGRES_DDL,
+    "sqlite": SQLITE_DDL,
+}
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+_posts_fts = table("posts_fts", column("rowid"))
+
+
+def _fts5_query(query: str) -> str:
+    """
+    Übersetzt freie Eingabe in eine sichere FTS5-Abfrage.
+
+    Jedes Wort wird als String-Literal gequotet (alle müssen vorkommen),
+    damit Eingaben wie ``AND``, ``"`` oder ``-`` keine Syntaxfehler auslösen.
+    """
+    return " ".join(f'"{token}"' for token in _TOKEN.findall(query))
+
+
+def _post_columns():
+    return (Post.id, Post.title, Post.content, Post.published, Post.created_at, Post.user_id)
+
+
+def search_statement(dialect: str, query: str):
+    """
+    Baut die Suchabfrage für den Datenbank-Dialekt.
+
+    Die Zeilen enthalten die Post-Spalten plus ``rank`` (höher = besser),
+    ``title_highlight`` und ``content_highlight`` (roh, vor der Ausgabe
+    durch :func:`render_hits`).
+
+    Args:
+        dialect: ``session.get_bind().dialect.name``
+        query: Suchbegriffe des Users
+
+    Returns:
+        tuple: (select-Statement ohne Sortierung, rank-Spalte) oder None,
+            wenn die Anfrage keine suchbaren Wörter enthält
+    """
+    if not _TOKEN.search(query):
+        return None
+
+    if dialect == "postgresql":
+        config = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+        search_vector = literal_column("posts.search_vector")
+        tsquery = func.websearch_to_tsquery(config, query)
+        rank = func.ts_rank_cd(search_vector, tsquery).label("rank")
+        # ts_headline ist teuer; PostgreSQL wertet es erst nach ORDER BY/LIMIT aus
+        statement = select(
+            *_post_columns(),
+            rank,
+            func.ts_headline(
+                config, Post.title, tsquery,
+                f'StartSel="{_MARK_START}", StopSel="{_MARK_STOP}", HighlightAll=true'
+            ).label("title_highlight"),
+            func.ts_headline(
+                config, Post.content, tsquery,
+                f'StartSel="{_MARK_START}", StopSel="{_MARK_STOP}", MaxFragments=2, MaxWords=20, MinWords=8'
+            ).label("content_highlight"),
+        ).where(search_vector.op("@@")(tsquery))
+        return statement, rank
+
+    if dialect == "sqlite":
+        fts = literal_column("posts_fts")
+        # bm25: kleiner = besser, Titel zählt 10x so viel wie der Inhalt
+        rank = (-func.bm25(fts, 10.0, 1.0)).label("rank")
+        statement = (
+            select(
+                *_post_columns(),
+                rank,
+                func.highlight(fts, 0, _MARK_START, _MARK_STOP).label("title_highlight"),
+                func.snippet(fts, 1, _MARK_START, _MARK_STOP, "…", 24).label("content_highlight"),
+            )
+            .join(_posts_fts, _posts_fts.c.rowid == Post.id)
+            .where(fts.match(_fts5_query(query)))
+        )
+        return statement, rank
+
+    raise NotImplementedError(f"Volltextsuche für Dialekt '{dialect}' nicht verfügbar")
+
+
+def render_highlight(text: str) -> str:
+    """Text HTML-escapen, danach die Treffer-Marker durch ``<mark>``-Tags ersetzen."""
+    return (
+        html.escape(text)
+        .replace(_MARK_START, HIGHLIGHT_START)
+        .replace(_MARK_STOP, HIGHLIGHT_STOP)
+    )
+
+
+def render_hits(rows: Iterable) -> list[dict]:
+    """Zeilen aus :func:`search_statement` mit sicheren HTML-Hervorhebungen."""
+    return [
+        {
+            **row._mapping,
+            "title_highlight": render_highlight(row.title_highlight),
+            "content_highlight": render_highlight(row.content_highlight),
+        }
+        for row in rows
+    ]
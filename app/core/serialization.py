@@ -0,0 +1,166 @@
+"""
+Schnelle JSON-Serialisierung
+============================
+Vorkompilierte Serializer für die Response-Modelle (opt-in über
+``FAST_JSON=True``).
+
+Der Standardweg von FastAPI bei ``response_model=list[PostRead]``:
+1. jedes ORM-Objekt wird gegen das Modell validiert (``from_attributes``),
+2. das Ergebnis wird in JSON-kompatible Python-Objekte umgewandelt,
+3. ``json.dumps`` erzeugt daraus den Body.
+
+Bei 100 Zeilen pro Seite kostet das mehr CPU als die Abfrage selbst.
+Die Serializer hier lesen die Felder des Response-Modells direkt von
+den ORM-Objekten (ohne Validierung - die Daten kommen aus der eigenen
+Datenbank) und schreiben sie in einem Schritt mit ``orjson`` (falls
+installiert, ``uv sync --extra fast-json``) bzw. ``pydantic_core.to_json``.
+
+Die Ausgabe ist Byte für Byte dieselbe wie auf dem Standardweg
+(Feld-Reihenfolge des Modells, Datumswerte als ISO 8601, UTC als ``Z``).
+
+Hinweis: Ohne Validierung fallen Modell-Validatoren und Umwandlungen
+weg - nur für Modelle verwenden, deren Felder 1:1 Spalten bzw.
+Relationships sind.
+"""
+
+import types
+from collections.abc import Callable, Mapping
+from functools import cache
+from typing import Any, Union, get_args, get_origin
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json, to_jsonable_python
+
+from app.core.config import settings
+from app.models import PostRead, PostReadWithAuthor, ProductRead, UserRead
+from app.models.post import PaginatedPostResponse, PostPageWithAuthors
+from app.models.user import UserBatchResponse
+
+try:
+    import orjson
+except ImportError:  # optionale Abhängigkeit
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """JSON-Body: orjson bei ``FAST_JSON`` (falls installiert), sonst pydantic_core."""
+    if orjson is not None and settings.FAST_JSON:
+        # default: alles, was orjson nicht kennt (Decimal, Pydantic-Modelle, ...)
+        return orjson.dumps(content, default=to_jsonable_python, option=orjson.OPT_UTC_Z)
+    return to_json(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` mit :func:`dumps` statt ``json.dumps``."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _optional_inner(annotation):
+    """``X | None`` bzw. ``Optional[X]`` -> ``X`` (sonst unverändert)."""
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _compile(annotation) -> Callable[[Any], Any] | None:
+    """
+    Umwandlung für einen Feldtyp oder None (Wert unverändert übernehmen).
+
+    Verschachtelte Modelle werden zu Dicts, Listen bzw. Dict-Werte von
+    Modellen zu Listen bzw. Dicts von Dicts - alles andere (int, str,
+    datetime, ...) kann der JSON-Encoder direkt.
+    """
+    annotation = _optional_inner(annotation)
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _compile_model(annotation)
+    if get_origin(annotation) is list:
+        (item,) = get_args(annotation) or (Any,)
+        convert = _compile(item)
+        if convert is not None:
+            return lambda values: [convert(value) for value in values]
+    if get_origin(annotation) is dict:
+        _, item = get_args(annotation) or (Any, Any)
+        convert = _compile(item)
+        if convert is not None:
+            return lambda values: {key: convert(value) for key, value in values.items()}
+    return None
+
+
+def _compile_model(model: type[BaseModel]) -> Callable[[Any], dict[str, Any]]:
+    fields = [(name, _compile(field.annotation)) for name, field in model.model_fields.items()]
+
+    def convert(obj) -> dict[str, Any]:
+        get = obj.__getitem__ if isinstance(obj, dict) else obj.__getattribute__
+        result = {}
+        for name, nested in fields:
+            value = get(name)
+            if nested is not None and value is not None:
+                value = nested(value)
+            result[name] = value
+        return result
+
+    return convert
+
+
+class Serializer:
+    """
+    Vorkompilierter Serializer für ein Response-Modell.
+
+    Args:
+        annotation: Modell oder Typ wie bei ``response_model``,
+            z.B. ``PostRead`` oder ``list[PostReadWithAuthor]``
+
+    Example:
+        posts = session.exec(select(Post)).all()
+        return serializer_for(list[PostRead]).respond(posts)
+    """
+
+    def __init__(self, annotation):
+        self.annotation = annotation
+        self._convert = _compile(annotation) or (lambda value: value)
+
+    def to_python(self, content) -> Any:
+        """ORM-Objekte -> Dicts/Listen mit den Feldern des Modells."""
+        return self._convert(content)
+
+    def dump(self, content) -> bytes:
+        """ORM-Objekte -> JSON-Body."""
+        return dumps(self._convert(content))
+
+    def respond(self, content, headers: Mapping[str, str] | None = None):
+        """
+        Fertige JSON-Response bei ``FAST_JSON``, sonst ``content``
+        unverändert (FastAPI validiert und serialisiert wie gewohnt).
+
+        ``headers`` landen nur in der fertigen Response - Header für den
+        Standardweg auf der injizierten ``Response`` setzen und hier
+        ``response.headers`` übergeben.
+        """
+        if not settings.FAST_JSON:
+            return content
+        return Response(content=self.dump(content), media_type="application/json", headers=headers)
+
+
+@cache
+def serializer_for(annotation) -> Serializer:
+    """Serializer pro Modell/Typ (wird nur einmal kompiliert)."""
+    return Serializer(annotation)
+
+
+# Beim Import kompiliert - die Modelle der Listen- und Detail-Endpunkte
+POST_SERIALIZER = serializer_for(PostRead)
+POST_LIST_SERIALIZER = serializer_for(list[PostRead])
+POST_WITH_AUTHOR_SERIALIZER = serializer_for(PostReadWithAuthor)
+POST_WITH_AUTHOR_LIST_SERIALIZER = serializer_for(list[PostReadWithAuthor])
+PAGINATED_POSTS_SERIALIZER = serializer_for(PaginatedPostResponse)
+POST_PAGE_WITH_AUTHORS_SERIALIZER = serializer_for(PostPageWithAuthors)
+USER_SERIALIZER = serializer_for(UserRead)
+USER_LIST_SERIALIZER = serializer_for(list[UserRead])
+USER_BATCH_SERIALIZER = serializer_for(UserBatchResponse)
+PRODUCT_SERIALIZER = serializer_for(ProductRead)
@@ -0,0 +1,276 @@
+"""
+SKU-Cache
+=========
+Prozess-lokaler Cache für ``GET /products/sku/{sku}`` - der mit Abstand
+häufigste Katalog-Read.
+
+- Kompakt: pro SKU nur der fertige JSON-Body (``bytes``), keine
+  ORM- oder Pydantic-Objekte. Ein Treffer kostet weder Datenbank noch
+  Serialisierung.
+- Begrenzt: LRU mit höchstens SKU_CACHE_MAX_ENTRIES Einträgen.
+- Vorgewärmt: Beim Start werden die SKU_CACHE_WARM_ENTRIES zuletzt
+  geänderten Produkte geladen.
+- Invalidierung: Die Schreib-Routen invalidieren im eigenen Prozess
+  sofort. Auf PostgreSQL melden zusätzlich Trigger jede Änderung per
+  ``NOTIFY product_changes`` (auch Änderungen an der API vorbei, z.B.
+  per psql oder Import-Skript); jeder Worker hört mit einer eigenen
+  Verbindung zu (``LISTEN``). Reißt diese Verbindung ab, wird der Cache
+  geleert - verpasste Meldungen lassen sich nicht nachholen.
+
+Ohne PostgreSQL (SQLite) gibt es nur die lokale Invalidierung - bei
+mehreren Workern liefern die anderen Worker dann alte Stände.
+"""
+
+import logging
+import select
+import threading
+from collections import OrderedDict
+
+from sqlalchemy import func, select as sa_select
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session, create_engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "product_changes"
+
+# SKUs pro NOTIFY (Payload max. 8000 Bytes, SKU max. 50 Zeichen + Trenner)
+NOTIFY_BATCH_SIZE = 150
+
+# So lange wartet der Start höchstens auf das erste LISTEN
+LISTEN_READY_TIMEOUT_SECONDS = 10.0
+
+# So lange wartet der Shutdown höchstens auf das Ende des Listeners
+LISTEN_STOP_TIMEOUT_SECONDS = 5.0
+
+# Trigger für migrations/versions/0006_product_notify.py (nur PostgreSQL).
+# Statement-Trigger mit Transition Table: ein Bulk-Upsert über 1.000
+# Zeilen schickt 7 NOTIFYs statt 1.000.
+POSTGRES_NOTIFY_DDL = [
+    f"""
+    CREATE OR REPLACE FUNCTION products_notify_change() RETURNS trigger AS $$
+    DECLARE
+        batch text;
+    BEGIN
+        FOR batch IN
+            SELECT string_agg(sku, E'\\n')
+            FROM (SELECT sku, (row_number() OVER () - 1) / {NOTIFY_BATCH_SIZE} AS grp FROM old_products) AS numbered
+            GROUP BY grp
+        LOOP
+            PERFORM pg_notify('{NOTIFY_CHANNEL}', batch);
+        END LOOP;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS products_notify_update ON products",
+    "DROP TRIGGER IF EXISTS products_notify_delete ON products",
+    """
+    CREATE TRIGGER products_notify_update AFTER UPDATE ON products
+    REFERENCING OLD TABLE AS old_products
+    FOR EACH STATEMENT EXECUTE FUNCTION products_notify_change()
+    """,
+    """
+    CREATE TRIGGER products_notify_delete AFTER DELETE ON products
+    REFERENCING OLD TABLE AS old_products
+    FOR EACH STATEMENT EXECUTE FUNCTION products_notify_change()
+    """,
+]
+
+POSTGRES_NOTIFY_DROP_DDL = [
+    "DROP TRIGGER IF EXISTS products_notify_delete ON products",
+    "DROP TRIGGER IF EXISTS products_notify_update ON products",
+    "DROP FUNCTION IF EXISTS products_notify_change()",
+]
+
+
+class SkuCache:
+    """
+    Thread-sicherer LRU-Cache ``sku -> JSON-Body``.
+
+    Gegen das Einlagern veralteter Stände: :meth:`put` bekommt die
+    :attr:`generation` von *vor* dem Datenbank-Read. Wurde seitdem
+    irgendetwas invalidiert, wird nicht gespeichert.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = self.misses = self.invalidations = self.clears = 0
+
+    def get(self, sku: str) -> bytes | None:
+        with self._lock:
+            body = self._entries.get(sku)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(sku)
+            self.hits += 1
+            return body
+
+    def put(self, sku: str, body: bytes, generation: int):
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[sku] = body
+            self._entries.move_to_end(sku)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *skus: str):
+        with self._lock:
+            self.generation += 1
+            for sku in skus:
+                if self._entries.pop(sku, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self.clears += 1
+
+    def status(self) -> dict:
+        """Zähler und Füllstand für ``/system/sku-cache``."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": settings.SKU_CACHE_ENABLED,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": sum(len(body) for body in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "clears": self.clears,
+            }
+
+
+sku_cache = SkuCache(settings.SKU_CACHE_MAX_ENTRIES)
+
+
+def warm(engine: Engine, limit: int) -> int:
+    """Lädt die ``limit`` zuletzt geänderten Produkte in den Cache."""
+    from app.core.serialization import PRODUCT_SERIALIZER
+    from app.models import Product
+
+    generation = sku_cache.generation
+    statement = (
+        sa_select(Product)
+        .order_by(func.coalesce(Product.updated_at, Product.created_at).desc())
+        .limit(limit)
+    )
+    with Session(engine) as session:
+        products = session.scalars(statement).all()
+        # Älteste zuerst einlagern - die neuesten sollen zuletzt aus dem LRU fallen
+        for product in reversed(products):
+            sku_cache.put(product.sku, PRODUCT_SERIALIZER.dump(product), generation)
+    return len(products)
+
+
+class ChangeListener(threading.Thread):
+    """
+    Hört auf ``NOTIFY product_changes`` (PostgreSQL) und invalidiert die SKUs.
+
+    Eigene Verbindung außerhalb des Pools, Autocommit. Nach einem
+    Verbindungsabbruch: Cache leeren, kurz warten, neu verbinden.
+
+    :attr:`ready` wird gesetzt, sobald das erste LISTEN steht und der
+    Cache danach geleert ist - erst dann lohnt sich das Vorwärmen.
+    """
+
+    def __init__(self, url: str, reconnect_seconds: float = 5.0):
+        super().__init__(name="sku-cache-listener", daemon=True)
+        self.engine = create_engine(url, poolclass=NullPool)
+        self.reconnect_seconds = reconnect_seconds
+        self._stop_event = threading.Event()
+        self.ready = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("SKU-Cache: LISTEN-Verbindung verloren, Cache wird geleert")
+            # Was zwischen Abbruch und neuem LISTEN geändert wurde, kommt nie an
+            sku_cache.clear()
+            self._stop_event.wait(self.reconnect_seconds)
+        self.engine.dispose()
+
+    def _listen(self):
+        connection = self.engine.raw_connection()
+        try:
+            dbapi_connection = connection.driver_connection
+            dbapi_connection.autocommit = True
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+            # Erst ab jetzt ist jede Änderung garantiert gemeldet
+            sku_cache.clear()
+            self.ready.set()
+            while not self._stop_event.is_set():
+                if select.select([dbapi_connection], [], [], 1.0) == ([], [], []):
+                    continue
+                dbapi_connection.poll()
+                while dbapi_connection.notifies:
+                    notify = dbapi_connection.notifies.pop(0)
+                    sku_cache.invalidate(*notify.payload.split("\n"))
+        finally:
+            connection.close()
+
+
+_listener: ChangeListener | None = None
+
+
+def start(engine: Engine):
+    """
+    Startet Listener (PostgreSQL) und Vorwärmen - aus dem Lifespan der App.
+
+    Erst LISTEN, dann vorwärmen: so geht keine Änderung zwischen Lesen
+    und Zuhören verloren. Das ``clear()`` nach dem LISTEN würde ein
+    früheres Vorwärmen wieder verwerfen - steht das LISTEN nicht
+    rechtzeitig, wird deshalb nicht vorgewärmt.
+    """
+    global _listener
+    if not settings.SKU_CACHE_ENABLED:
+        return
+    if engine.dialect.name == "postgresql":
+        _listener = ChangeListener(engine.url.render_as_string(hide_password=False))
+        _listener.start()
+    elif settings.WEB_CONCURRENCY > 1:
+        logger.warning(
+            "SKU-Cache ohne PostgreSQL-NOTIFY mit %d Workern: Änderungen werden nur im "
+            "jeweiligen Worker invalidiert", settings.WEB_CONCURRENCY
+        )
+    if settings.SKU_CACHE_WARM_ENTRIES > 0:
+        if _listener is not None and not _listener.ready.wait(LISTEN_READY_TIMEOUT_SECONDS):
+            logger.warning(
+                "SKU-Cache: LISTEN nach %ss nicht bereit, Vorwärmen übersprungen",
+                LISTEN_READY_TIMEOUT_SECONDS
+            )
+            return
+        try:
+            count = warm(engine, settings.SKU_CACHE_WARM_ENTRIES)
+            logger.info("SKU-Cache: %d Produkte vorgewärmt", count)
+        except Exception:
+            logger.exception("SKU-Cache: Vorwärmen fehlgeschlagen")
+
+
+def stop():
+    """Beendet den Listener (Shutdown) und wartet, bis seine Verbindung zu ist."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener.join(LISTEN_STOP_TIMEOUT_SECONDS)
+    if _listener.is_alive():
+        logger.warning("SKU-Cache: Listener nach %ss nicht beendet", LISTEN_STOP_TIMEOUT_SECONDS)
+    _listener = None
+
@@ -1,54 +1,360 @@
 """
-Script zum Erstellen von vielen Testdaten für Performance-Tests.
+Performance Test Data Generator
+===============================
+Erzeugt große synthetische Datenmengen (Users, Posts, Products) für
+Performance-Tests - bis in den Millionenbereich.
+
+- PostgreSQL: ``COPY ... FROM STDIN`` (um Größenordnungen schneller als INSERT)
+- Andere Datenbanken (z.B. SQLite): gebündeltes ``executemany``
+- Deterministisch: gleicher ``--seed`` = gleiche Daten, unabhängig von ``--workers``
+- Parallel: Blöcke werden auf mehrere Prozesse verteilt
+
+Usage:
+    python -m app.create_performance_testdata --users 100000 --posts-per-user 0:50
+
+    Weitere Beispiele:
+    uv run python -m app.create_performance_testdata --users 1000000 --workers 8 --yes
+    uv run python -m app.create_performance_testdata --users 10000 --posts-skew 1.2 --products 500000
+    uv run python -m app.create_performance_testdata --url sqlite:///bench.db --users 5000
 """
-from sqlmodel import Session, select
-from app.database import engine
-from app.models.user import User
-from app.models.post import Post
+
+import argparse
+import csv
+import datetime
+import io
 import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from time import perf_counter
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.pool import NullPool
+from sqlmodel import create_engine
+
+from app.core.config import settings
+from app.core.migrations import upgrade_database
+from app.models import Post, Product, User
+
+# Users pro Block - ein Block ist die Einheit für Seed und Parallelisierung
+USERS_PER_CHUNK = 10_000
+PRODUCTS_PER_CHUNK = 50_000
+
+_WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua enim ad minim veniam quis nostrud "
+    "exercitation ullamco laboris nisi aliquip ex ea commodo consequat duis aute irure "
+    "in reprehenderit voluptate velit esse cillum fugiat nulla pariatur excepteur sint "
+    "occaecat cupidatat non proident sunt culpa qui officia deserunt mollit anim id est laborum"
+).split()
+
+# Großer Textvorrat: Titel/Inhalte sind Ausschnitte daraus (schneller als Wort für Wort)
+_TEXT = " ".join(random.Random(0).choices(_WORDS, k=200_000))
+
+
+@dataclass(frozen=True)
+class GeneratorConfig:
+    """Alle Parameter eines Generator-Laufs (picklebar für Worker-Prozesse)."""
+
+    url: str
+    seed: int
+    batch_size: int
+    posts_min: int
+    posts_max: int
+    posts_skew: float
+    published_ratio: float
+    title_min: int
+    title_max: int
+    content_min: int
+    content_max: int
+    length_skew: float
+    days: int
+    in_stock_ratio: float
+
+
+def skewed_int(rng: random.Random, low: int, high: int, skew: float) -> int:
+    """
+    Zufallszahl in [low, high].
+
+    skew = 0: gleichverteilt. skew > 0: Pareto-verteilt mit Exponent
+    ``skew`` - die meisten Werte liegen nahe ``low``, wenige sehr hoch
+    (wie in echten Daten: wenige Power-User schreiben die meisten Posts).
+    """
+    if skew <= 0 or high <= low:
+        return rng.randint(low, high)
+    value = low + int((rng.paretovariate(skew) - 1) * (high - low) / 10)
+    return min(value, high)
+
+
+def random_text(rng: random.Random, length: int) -> str:
+    """Ausschnitt der Länge ``length`` aus dem Textvorrat."""
+    start = rng.randrange(0, len(_TEXT) - length - 1)
+    return _TEXT[start:start + length].strip() or "x"
+
+
+def _chunk_rng(config: GeneratorConfig, phase: str, chunk_index: int) -> random.Random:
+    # String-Seeds sind in Python deterministisch (nicht von PYTHONHASHSEED abhängig)
+    return random.Random(f"{config.seed}:{phase}:{chunk_index}")
+
+
+def _engine(url: str):
+    return create_engine(url, poolclass=NullPool)
+
+
+def _copy_rows(engine, table, columns: list[str], rows, batch_size: int) -> int:
+    """
+    Schreibt Zeilen blockweise in eine Tabelle.
+
+    PostgreSQL (psycopg2): COPY im CSV-Format.
+    Sonst: executemany über ein INSERT-Statement.
+
+    Returns:
+        int: Anzahl geschriebener Zeilen
+    """
+    written = 0
+    use_copy = engine.dialect.name == "postgresql"
+
+    def flush(batch):
+        if use_copy:
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(batch)
+            buffer.seek(0)
+            raw = engine.raw_connection()
+            try:
+                with raw.cursor() as cursor:
+                    cursor.copy_expert(
+                        f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                        buffer
+                    )
+                raw.commit()
+            finally:
+                raw.close()
+        else:
+            with engine.begin() as conn:
+                conn.execute(insert(table), [dict(zip(columns, row)) for row in batch])
+
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            flush(batch)
+            written += len(batch)
+            batch = []
+    if batch:
+        flush(batch)
+        written += len(batch)
+    return written
+
+
+def _created_at(rng: random.Random, now: datetime.datetime, days: int) -> datetime.datetime:
+    return now - datetime.timedelta(seconds=rng.randrange(0, max(1, days * 86_400)))
+
 
+def generate_users_chunk(config: GeneratorConfig, chunk_index: int, first_id: int, count: int) -> int:
+    """Erzeugt ``count`` User mit fortlaufenden IDs ab ``first_id``."""
+    rng = _chunk_rng(config, "users", chunk_index)
+    now = datetime.datetime.now(datetime.UTC)
 
-def create_large_dataset():
-    """Erstellt 100 User mit jeweils 5-10 Posts."""
-    with Session(engine) as session:
-        # Zuerst prüfen ob schon viele User existieren
-        existing_count = len(session.exec(select(User)).all())
-        if existing_count > 50:
-            print(f"⚠️  Es existieren bereits {existing_count} User.")
-            response = input("Trotzdem fortfahren? (y/n): ")
-            if response.lower() != 'y':
-                return
-
-        print("📝 Erstelle 100 User mit Posts...")
-
-        for i in range(100):
-            # User erstellen
-            user = User(
-                name=f"user_{i}",
-                email=f"user{i}@test.com"
+    def rows():
+        for user_id in range(first_id, first_id + count):
+            yield (
+                user_id,
+                f"user_{user_id}",
+                f"user{user_id}@example.com",
+                rng.random() < 0.95,
+                _created_at(rng, now, config.days),
             )
-            session.add(user)
-            session.commit()
-            session.refresh(user)
-
-            # 5-10 Posts pro User
-            num_posts = random.randint(5, 10)
-            for j in range(num_posts):
-                post = Post(
-                    title=f"Post {j} von {user.name}",
-                    content=f"Das ist Post Nummer {j}",
-                    published=random.choice([True, False]),
-                    user_id=user.id
+
+    table = User.__table__
+    return _copy_rows(_engine(config.url), table, ["id", "name", "email", "is_active", "created_at"],
+                      rows(), config.batch_size)
+
+
+def generate_posts_chunk(config: GeneratorConfig, chunk_index: int, first_user_id: int, count: int) -> int:
+    """Erzeugt die Posts für die User ``first_user_id`` bis ``first_user_id + count - 1``."""
+    rng = _chunk_rng(config, "posts", chunk_index)
+    now = datetime.datetime.now(datetime.UTC)
+
+    def rows():
+        for user_id in range(first_user_id, first_user_id + count):
+            for _ in range(skewed_int(rng, config.posts_min, config.posts_max, config.posts_skew)):
+                title_length = skewed_int(rng, config.title_min, config.title_max, config.length_skew)
+                content_length = skewed_int(rng, config.content_min, config.content_max, config.length_skew)
+                yield (
+                    random_text(rng, title_length),
+                    random_text(rng, content_length),
+                    rng.random() < config.published_ratio,
+                    _created_at(rng, now, config.days),
+                    user_id,
                 )
-                session.add(post)
 
-            session.commit()
+    table = Post.__table__
+    return _copy_rows(_engine(config.url), table, ["title", "content", "published", "created_at", "user_id"],
+                      rows(), config.batch_size)
+
+
+def generate_products_chunk(config: GeneratorConfig, chunk_index: int, first_id: int, count: int) -> int:
+    """Erzeugt ``count`` Produkte mit fortlaufenden IDs und SKUs ab ``first_id``."""
+    rng = _chunk_rng(config, "products", chunk_index)
+    now = datetime.datetime.now(datetime.UTC)
+
+    def rows():
+        for product_id in range(first_id, first_id + count):
+            created_at = _created_at(rng, now, config.days)
+            yield (
+                product_id,
+                random_text(rng, rng.randint(5, 60)).title()[:100],
+                random_text(rng, rng.randint(20, 400)) if rng.random() < 0.8 else None,
+                round(rng.lognormvariate(3, 1) + 0.01, 2),
+                rng.random() < config.in_stock_ratio,
+                f"SKU-{product_id:010d}",
+                created_at,
+                created_at if rng.random() < 0.5 else None,
+            )
+
+    table = Product.__table__
+    columns = ["id", "name", "description", "price", "in_stock", "sku", "created_at", "updated_at"]
+    return _copy_rows(_engine(config.url), table, columns, rows(), config.batch_size)
+
+
+def _run_chunks(executor, function, config: GeneratorConfig, first_id: int, total: int, chunk_size: int) -> int:
+    """Verteilt ``total`` Einträge in Blöcken auf die Worker und summiert die Zeilen."""
+    jobs = [
+        (config, chunk_index, first_id + start, min(chunk_size, total - start))
+        for chunk_index, start in enumerate(range(0, total, chunk_size))
+    ]
+    if executor is None:
+        return sum(function(*job) for job in jobs)
+    return sum(executor.map(function, *zip(*jobs)))
+
+
+def _reset_sequence(engine, table_name: str):
+    """Setzt die ID-Sequenz nach expliziten IDs hinter das Maximum (nur PostgreSQL)."""
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table_name}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table_name}), 1))"
+        ))
+
+
+def generate(config: GeneratorConfig, users: int, products: int, workers: int):
+    """
+    Erzeugt den kompletten Datensatz.
+
+    Reihenfolge: erst alle User (Posts brauchen existierende Autoren),
+    dann Posts und Produkte. IDs werden im Voraus vergeben, damit die
+    Worker ohne Rückfrage an die Datenbank Fremdschlüssel setzen können.
+    """
+    engine = _engine(config.url)
+    upgrade_database(config.url)
+
+    with engine.connect() as conn:
+        first_user_id = (conn.execute(select(func.max(User.id))).scalar() or 0) + 1
+        first_product_id = (conn.execute(select(func.max(Product.id))).scalar() or 0) + 1
+
+    if engine.dialect.name == "sqlite" and workers > 1:
+        print("ℹ️  SQLite erlaubt nur einen Schreiber - verwende 1 Worker.")
+        workers = 1
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        t0 = perf_counter()
+        created = _run_chunks(executor, generate_users_chunk, config, first_user_id, users, USERS_PER_CHUNK)
+        _reset_sequence(engine, "users")
+        print(f"✅ {created:,} User in {perf_counter() - t0:.1f}s")
+
+        t0 = perf_counter()
+        created = _run_chunks(executor, generate_posts_chunk, config, first_user_id, users, USERS_PER_CHUNK)
+        elapsed = perf_counter() - t0
+        print(f"✅ {created:,} Posts in {elapsed:.1f}s ({created / max(elapsed, 1e-9):,.0f} Zeilen/s)")
+
+        if products:
+            t0 = perf_counter()
+            created = _run_chunks(executor, generate_products_chunk, config, first_product_id, products,
+                                  PRODUCTS_PER_CHUNK)
+            _reset_sequence(engine, "products")
+            print(f"✅ {created:,} Produkte in {perf_counter() - t0:.1f}s")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if engine.dialect.name == "postgresql":
+        # Statistiken für den Query-Planner aktualisieren
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("ANALYZE users, posts, products"))
+
+
+def _range(value: str) -> tuple[int, int]:
+    """Parst 'MIN:MAX' (oder eine einzelne Zahl) für argparse."""
+    low, _, high = value.partition(":")
+    low, high = int(low), int(high or low)
+    if low < 0 or high < low:
+        raise argparse.ArgumentTypeError(f"Ungültiger Bereich: {value}")
+    return low, high
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Erzeugt synthetische Testdaten für Performance-Tests.")
+    parser.add_argument("--url", default=settings.database_url, help="Datenbank-URL (Default: aus Settings)")
+    parser.add_argument("--users", type=int, default=100, help="Anzahl User")
+    parser.add_argument("--posts-per-user", type=_range, default=(5, 10), metavar="MIN:MAX")
+    parser.add_argument("--posts-skew", type=float, default=0.0,
+                        help="0 = gleichverteilt, >0 = Pareto-Exponent (kleiner = extremer)")
+    parser.add_argument("--published-ratio", type=float, default=0.5, help="Anteil veröffentlichter Posts")
+    parser.add_argument("--title-len", type=_range, default=(10, 80), metavar="MIN:MAX")
+    parser.add_argument("--content-len", type=_range, default=(50, 2000), metavar="MIN:MAX")
+    parser.add_argument("--length-skew", type=float, default=1.5, help="Pareto-Exponent für Textlängen (0 = gleich)")
+    parser.add_argument("--products", type=int, default=0, help="Anzahl Produkte")
+    parser.add_argument("--in-stock-ratio", type=float, default=0.8, help="Anteil Produkte auf Lager")
+    parser.add_argument("--days", type=int, default=365, help="created_at verteilt über die letzten n Tage")
+    parser.add_argument("--seed", type=int, default=42, help="Seed für reproduzierbare Daten")
+    parser.add_argument("--workers", type=int, default=1, help="Anzahl paralleler Prozesse")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="Zeilen pro COPY/executemany")
+    parser.add_argument("--yes", action="store_true", help="Nicht nachfragen, wenn schon Daten existieren")
+    return parser.parse_args(argv)
+
+
+def config_from_args(args: argparse.Namespace) -> GeneratorConfig:
+    """Baut die Generator-Konfiguration aus den CLI-Argumenten."""
+    return GeneratorConfig(
+        url=args.url,
+        seed=args.seed,
+        batch_size=args.batch_size,
+        posts_min=args.posts_per_user[0],
+        posts_max=args.posts_per_user[1],
+        posts_skew=args.posts_skew,
+        published_ratio=args.published_ratio,
+        title_min=max(1, args.title_len[0]),
+        title_max=min(200, args.title_len[1]),
+        content_min=max(1, args.content_len[0]),
+        content_max=args.content_len[1],
+        length_skew=args.length_skew,
+        days=args.days,
+        in_stock_ratio=args.in_stock_ratio,
+    )
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = config_from_args(args)
 
-            if (i + 1) % 10 == 0:
-                print(f"✅ {i + 1}/100 User erstellt...")
+    engine = _engine(config.url)
+    upgrade_database(config.url)
+    with engine.connect() as conn:
+        # COUNT statt alle User zu laden
+        existing_count = conn.execute(select(func.count(User.id))).scalar()
+    if existing_count > 50 and not args.yes:
+        print(f"⚠️  Es existieren bereits {existing_count:,} User.")
+        response = input("Trotzdem fortfahren? (y/n): ")
+        if response.lower() != 'y':
+            return
 
-        print("🎉 Fertig! 100 User mit Posts erstellt.")
+    print(f"📝 Erzeuge {args.users:,} User, {args.products:,} Produkte (Seed {args.seed}, {args.workers} Worker)...")
+    t0 = perf_counter()
+    generate(config, users=args.users, products=args.products, workers=args.workers)
+    print(f"🎉 Fertig in {perf_counter() - t0:.1f}s")
 
 
 if __name__ == "__main__":
-    create_large_dataset()
\ No newline at end of file
+    main()
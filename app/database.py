@@ -4,19 +4,108 @@ Datenbank-Verbindung
 Setup für SQLModel Engine und Session Management.
 """
 
+import itertools
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
 from sqlmodel import Session, SQLModel, create_engine
-from app.core.config import settings
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core import dataloader  # noqa: F401 - registriert das Batch Loading für alle Sessions
+from app.core.config import settings, to_async_url
+from app.core.migrations import upgrade_database
+from app.core.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+from app.core.query_stats import instrument_engine
+
 
+def engine_options(async_mode: bool = False, engine_count: int = 1) -> dict:
+    """
+    Baut die create_engine()-Optionen aus den Pool-Settings.
+    
+    NullPool (z.B. hinter PgBouncer) hält selbst keine Verbindungen und
+    akzeptiert deshalb keine Größen-Parameter.
+    
+    Args:
+        async_mode: Optionen für die async Engine?
+        engine_count: Anzahl Engines pro Prozess (teilen sich das Budget)
+    
+    Returns:
+        dict: Keyword-Argumente für create_engine/create_async_engine
+    """
+    options = {
+        "echo": settings.db_echo,  # True zeigt alle SQL-Statements in der Console
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,  # Prüft Verbindung vor Nutzung
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    
+    if settings.DB_POOL_CLASS == "null":
+        options["poolclass"] = NullPool
+        return options
+    
+    pool_size, max_overflow = settings.pool_sizing(engine_count)
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool if async_mode else InstrumentedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    return options
+
+
+# Sync und async Engine teilen sich das Verbindungs-Budget
+_engine_count = 2 if settings.DB_ASYNC else 1
 
 # Engine erstellen
-# echo=True zeigt alle SQL-Statements in der Console (gut zum Lernen!)
-engine = create_engine(
-    settings.database_url,
-    echo=settings.DEBUG,
-    pool_pre_ping=True,  # Prüft Verbindung vor Nutzung
-    pool_size=5,         # Max. 5 Verbindungen im Pool
-    max_overflow=10      # Max. 10 zusätzliche Verbindungen bei Bedarf
-)
+engine = create_engine(settings.database_url, **engine_options(engine_count=_engine_count))
+
+# Async Engine (nur wenn DB_ASYNC aktiv ist - sonst kein zweiter Pool)
+# Eine async Route blockiert keinen Threadpool-Worker, während sie auf
+# PostgreSQL wartet - ein Prozess kann so hunderte Queries parallel offen halten.
+async_engine = create_async_engine(
+    settings.async_database_url,
+    **engine_options(async_mode=True, engine_count=_engine_count)
+) if settings.DB_ASYNC else None
+
+# Read-Replicas: eigene Server, also jeweils eigenes Verbindungs-Budget
+read_engines = [
+    create_engine(url, **engine_options(engine_count=_engine_count))
+    for url in settings.read_replica_urls
+]
+async_read_engines = [
+    create_async_engine(to_async_url(url), **engine_options(async_mode=True, engine_count=_engine_count))
+    for url in settings.read_replica_urls
+] if settings.DB_ASYNC else []
+
+# Round-Robin über alle Replicas
+_read_engine_cycle = itertools.cycle(read_engines)
+_async_read_engine_cycle = itertools.cycle(async_read_engines)
+
+
+def named_engines() -> dict[str, Engine]:
+    """
+    Alle Engines dieses Prozesses mit sprechendem Namen.
+    
+    Async Engines werden über ihre ``sync_engine`` geliefert (dort hängen
+    Pool und Events). Namen: primary, async, replica_<n>, async_replica_<n>.
+    """
+    engines = {"primary": engine}
+    if async_engine is not None:
+        engines["async"] = async_engine.sync_engine
+    for index, read_engine in enumerate(read_engines):
+        engines[f"replica_{index}"] = read_engine
+    for index, read_engine in enumerate(async_read_engines):
+        engines[f"async_replica_{index}"] = read_engine.sync_engine
+    return engines
+
+
+# Query-Zähler für alle Engines (siehe app/core/query_stats.py)
+for _engine in named_engines().values():
+    instrument_engine(_engine)
+
+# Cookie, das nach einem Schreibzugriff gesetzt wird (siehe main.py)
+READ_YOUR_WRITES_COOKIE = "db_read_primary"
 
 
 def get_session():
@@ -37,21 +126,105 @@ def get_session():
         yield session
 
 
+def reads_from_primary(request: Request) -> bool:
+    """
+    Soll dieser Lese-Request trotz Replicas vom Primary gelesen werden?
+    
+    Ja, wenn keine Replicas konfiguriert sind oder der Client kürzlich
+    geschrieben hat (Read-your-writes: Replicas hinken dem Primary
+    etwas hinterher, der eigene Schreibzugriff wäre sonst evtl. unsichtbar).
+    """
+    if not read_engines:
+        return True
+    return (
+        settings.DB_READ_YOUR_WRITES_SECONDS > 0
+        and READ_YOUR_WRITES_COOKIE in request.cookies
+    )
 
-def create_db_and_tables():
+
+def read_engine_for(request: Request):
+    """
+    Engine für einen Lese-Request: Replica (Round-Robin) oder Primary.
+    
+    Für Code, der seine Session selbst öffnet (z.B. Streaming-Exporte,
+    die länger laufen als die Dependencies des Requests).
+    """
+    return engine if reads_from_primary(request) else next(_read_engine_cycle)
+
+
+def async_read_engine_for(request: Request):
+    """Async-Variante von :func:`read_engine_for`."""
+    if async_engine is None:
+        raise RuntimeError("Async Engine ist nicht aktiv - DB_ASYNC=True setzen")
+    return async_engine if reads_from_primary(request) else next(_async_read_engine_cycle)
+
+
+def get_read_session(request: Request):
     """
-    Erstellt alle Tabellen in der Datenbank.
+    Session Factory für reine Lese-Endpunkte (GET).
     
-    Durchsucht alle SqlModel-Klassen mit `table=True` und
-    erstellt die entsprechenden Tabellen in PostgreSQL.
+    Verteilt Lese-Zugriffe per Round-Robin auf die Read-Replicas aus
+    DB_READ_REPLICA_URLS. Ohne Replicas (oder direkt nach einem
+    Schreibzugriff des Clients) wird der Primary verwendet.
     
-    Wichtig: Die Modelle müssen importiert sein, damit
-    SQLModel sie finden kann!
+    Achtung: Nur für Routen ohne Schreibzugriffe verwenden!
+    
+    Yields:
+        Session: Eine SQLModel Session auf Replica oder Primary
     """
-    # Import aller Modelle, damit sie in SQLModel.metadata registriert sind
-    from app.models import User, Post, Product  # noqa: F401
+    with Session(read_engine_for(request)) as session:
+        yield session
+
+
+async def get_async_session():
+    """
+    Async Session Factory für Dependency Injection in FastAPI.
     
-    SQLModel.metadata.create_all(engine)
+    Verwendung in FastAPI:
+    ```python
+    @app.get("/items")
+    async def get_items(session: AsyncSession = Depends(get_async_session)):
+        result = await session.exec(select(Item))
+        ...
+    ```
+    
+    expire_on_commit=False, weil Attribute nach einem Commit sonst
+    per (im async Kontext verbotenem) Lazy Load nachgeladen würden.
+    
+    Yields:
+        AsyncSession: Eine SQLModel AsyncSession
+    
+    Raises:
+        RuntimeError: Wenn DB_ASYNC nicht aktiviert ist
+    """
+    if async_engine is None:
+        raise RuntimeError("Async Engine ist nicht aktiv - DB_ASYNC=True setzen")
+    
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
+async def get_async_read_session(request: Request):
+    """
+    Async-Variante von :func:`get_read_session`.
+    
+    Yields:
+        AsyncSession: Eine SQLModel AsyncSession auf Replica oder Primary
+    """
+    async with AsyncSession(async_read_engine_for(request), expire_on_commit=False) as session:
+        yield session
+
+
+
+def create_db_and_tables():
+    """
+    Erstellt alle Tabellen bzw. bringt das Schema auf den neuesten Stand.
+    
+    Führt alle ausstehenden Alembic-Migrationen aus (``migrations/``).
+    Anders als ``SQLModel.metadata.create_all()`` kommen so auch neue
+    Spalten und Indizes in bestehende Tabellen.
+    """
+    upgrade_database(settings.database_url)
     print("Datenbank-Tabellen wurden erstellt!")
 
 
@@ -65,4 +238,7 @@ def drop_db_and_tables():
     from app.models import User, Post, Product  # noqa: F401
     
     SQLModel.metadata.drop_all(engine)
+    with engine.begin() as conn:
+        # Sonst hält Alembic das (leere) Schema noch für aktuell
+        conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
     print("Alle Tabellen wurden geloescht!")
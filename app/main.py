@@ -3,32 +3,147 @@ FastAPI Application Entry Point
 ================================
 Hier wird die FastAPI App initialisiert und gestartet.
 """
+import logging
 from contextlib import asynccontextmanager
+from time import perf_counter
 
-from fastapi import FastAPI
-from app.core.config import settings
-from app.api.routes import users, posts
-from app.database import create_db_and_tables
+from fastapi import APIRouter, FastAPI, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from app.core.config import DEFAULT_CURSOR_SECRET_KEY, settings
+from app.core import sku_cache
+from app.core.health import get_health_report
+from app.core.query_stats import collect_queries, server_timing
+from app.core.serialization import FastJSONResponse
+from app.api.routes import users, posts, users_async, posts_async, products, system
+from app.database import READ_YOUR_WRITES_COOKIE, create_db_and_tables, engine, named_engines, read_engines
 
+if settings.METRICS_ENABLED:
+    from app.core import metrics
 
-# @asynccontextmanager
-# async def lifespan(app: FastAPI):
-#     # Startup
-#     create_db_and_tables()
-#     yield
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup
+    if not settings.DEBUG and settings.CURSOR_SECRET_KEY == DEFAULT_CURSOR_SECRET_KEY:
+        # Mit dem bekannten Platzhalter könnte jeder Cursor fälschen
+        raise RuntimeError("CURSOR_SECRET_KEY setzen (Pflicht mit DEBUG=False)")
+    # create_db_and_tables()
+    if settings.METRICS_ENABLED:
+        metrics.setup_metrics(named_engines())
+    # Vorwärmen blockiert - im Threadpool statt im Event-Loop
+    await run_in_threadpool(sku_cache.start, engine)
+    yield
+    # Shutdown
+    await run_in_threadpool(sku_cache.stop)
+    if settings.METRICS_ENABLED:
+        metrics.mark_worker_dead()
 
 # FastAPI App erstellen
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     description="Ein Lernprojekt für SqlModel mit PostgreSQL",
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    # FAST_JSON: auch Routen ohne eigenen Serializer rendern mit orjson
+    default_response_class=FastJSONResponse if settings.FAST_JSON else JSONResponse,
+    lifespan=lifespan
 )
 
 
-# API Router einbinden
-app.include_router(users.router, prefix="/api/v1")
-app.include_router(posts.router, prefix="/api/v1/posts", tags=["posts"])
+if read_engines and settings.DB_READ_YOUR_WRITES_SECONDS > 0:
+    @app.middleware("http")
+    async def read_your_writes(request: Request, call_next):
+        """
+        Markiert Clients nach einem erfolgreichen Schreibzugriff.
+        
+        Das Cookie sorgt dafür, dass get_read_session für diesen Client
+        DB_READ_YOUR_WRITES_SECONDS lang vom Primary liest.
+        """
+        response = await call_next(request)
+        if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+            response.set_cookie(
+                READ_YOUR_WRITES_COOKIE,
+                "1",
+                max_age=settings.DB_READ_YOUR_WRITES_SECONDS,
+                httponly=True,
+                samesite="lax"
+            )
+        return response
+
+
+@app.middleware("http")
+async def request_stats(request: Request, call_next):
+    """
+    Zählt SQL-Statements, DB-Zeit und Zeilen pro Request.
+    
+    Die Werte landen in den Headern ``X-DB-Queries`` und ``Server-Timing``
+    sowie (METRICS_ENABLED) in den Prometheus-Metriken der Route.
+    Requests über DB_QUERY_BUDGET werden als Warnung geloggt - typischerweise
+    ein N+1-Problem (z.B. Lazy Loading beim Serialisieren).
+    """
+    start = perf_counter()
+    with collect_queries() as stats:
+        response = await call_next(request)
+    total = perf_counter() - start
+
+    if settings.METRICS_ENABLED:
+        # Routen-Template statt Pfad, sonst wird jede ID zu einem eigenen Label
+        route = request.scope.get("route")
+        metrics.observe_request(
+            request.method, getattr(route, "path", "unmatched"), response.status_code, total, stats
+        )
+
+    if settings.QUERY_STATS_HEADERS:
+        response.headers["X-DB-Queries"] = str(stats.queries)
+        response.headers["Server-Timing"] = server_timing(stats, total)
+    if 0 < settings.DB_QUERY_BUDGET < stats.queries:
+        logger.warning(
+            "Query-Budget überschritten: %s %s -> %d Queries (Budget %d), DB-Zeit %.1f ms, Gesamt %.1f ms",
+            request.method, request.url.path, stats.queries, settings.DB_QUERY_BUDGET,
+            stats.db_time * 1000, total * 1000
+        )
+    return response
+
+
+def prefer_async_routes(sync_router: APIRouter, async_router: APIRouter) -> APIRouter:
+    """
+    Kombiniert einen sync und einen async Router.
+    
+    Routen, die es async gibt, ersetzen ihre sync Gegenstücke
+    (gleicher Pfad + Methode). Endpunkte ohne async Variante bleiben
+    sync erhalten, damit im async Modus keine API verloren geht.
+    """
+    def route_keys(route):
+        return {(route.path, method) for method in getattr(route, "methods", None) or ()}
+
+    # Reihenfolge des sync Routers beibehalten - sonst würde z.B. ein
+    # sync-only "/search" hinter dem async "/{post_id}" landen und nie greifen
+    async_by_key = {key: route for route in async_router.routes for key in route_keys(route)}
+    combined = APIRouter()
+    used = set()
+    for route in sync_router.routes:
+        replacement = next((async_by_key[key] for key in route_keys(route) if key in async_by_key), None)
+        if replacement is None:
+            combined.routes.append(route)
+        elif id(replacement) not in used:
+            combined.routes.append(replacement)
+            used.add(id(replacement))
+    combined.routes.extend(route for route in async_router.routes if id(route) not in used)
+    return combined
+
+
+# API Router einbinden (DB_ASYNC wählt die async Varianten)
+if settings.DB_ASYNC:
+    app.include_router(prefer_async_routes(users.router, users_async.router), prefix="/api/v1")
+    app.include_router(prefer_async_routes(posts.router, posts_async.router), prefix="/api/v1/posts", tags=["posts"])
+else:
+    app.include_router(users.router, prefix="/api/v1")
+    app.include_router(posts.router, prefix="/api/v1/posts", tags=["posts"])
+# Produkte nur sync - im async Modus laufen sie im Threadpool
+app.include_router(products.router, prefix="/api/v1")
+app.include_router(system.router, prefix="/api/v1")
 
 
 @app.get("/")
@@ -47,17 +162,51 @@ async def root():
 
 
 @app.get("/health")
-async def health_check():
+def health_check(response: Response):
     """
     Gesundheitscheck der Anwendung
     
+    Prüft Primary (zeitgemessener ``SELECT 1``), Replicas inkl.
+    Replikations-Verzug und die Auslastung aller Connection-Pools.
+    Das Ergebnis wird HEALTH_CACHE_SECONDS lang gecacht.
+    
     Returns:
-        dict: Health Status
+        dict: Health Status (503, wenn die Datenbank nicht erreichbar oder zu langsam ist)
     """
-    return {
-        "status": "healthy",
-        "database": "not connected yet"  # Wird in Modul 3 erweitert
-    }
+    report = get_health_report(named_engines())
+    if report.status == "unhealthy":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return report.to_dict()
+
+
+@app.get("/ready")
+def readiness_check(response: Response):
+    """
+    Readiness-Check für den Load Balancer
+    
+    Wie ``/health``, liefert aber auch 503, wenn ein Connection-Pool
+    erschöpft ist - neue Requests würden dort nur auf eine Verbindung warten.
+    
+    Returns:
+        dict: ready + Gründe
+    """
+    report = get_health_report(named_engines())
+    if not report.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"ready": report.ready, "status": report.status, "reasons": report.reasons}
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def get_metrics():
+        """
+        Prometheus-Metriken (Latenz je Route, Status, Pool, Query-Zeiten)
+        
+        Returns:
+            Response: Metriken im Prometheus-Textformat
+        """
+        body, content_type = metrics.render_metrics()
+        return Response(content=body, media_type=content_type)
 
 
 if __name__ == "__main__":
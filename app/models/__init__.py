@@ -7,6 +7,7 @@ Hier werden alle Datenbank-Modelle definiert.
 from app.models.user import User, UserCreate, UserRead, UserUpdate, UserReadWithPosts, rebuild_models as rebuild_user_models
 from app.models.post import Post, PostCreate, PostRead, PostUpdate, PostReadWithAuthor, rebuild_models as rebuild_post_models
 from app.models.product import Product, ProductCreate, ProductRead, ProductUpdate
+from app.models.bulk import BulkCreateResult, BulkItemError, BulkUpsertResult, IdsRequest
 
 rebuild_user_models()
 rebuild_post_models()
@@ -29,4 +30,9 @@ __all__ = [
     "ProductCreate",
     "ProductRead",
     "ProductUpdate",
+    # Bulk Models
+    "BulkCreateResult",
+    "BulkItemError",
+    "BulkUpsertResult",
+    "IdsRequest",
 ]
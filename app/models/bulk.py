@@ -0,0 +1,48 @@
+"""
+Bulk Models
+===========
+Request- und Antwort-Modelle für Bulk- und Batch-Endpunkte.
+"""
+
+from sqlmodel import Field, SQLModel
+
+
+class IdsRequest(SQLModel):
+    """ID-Liste für die Batch-Endpunkte (``POST /users/batch``, ``POST /posts/batch``)."""
+
+    ids: list[int] = Field(min_length=1, description="IDs in gewünschter Reihenfolge")
+
+
+class BulkItemError(SQLModel):
+    """Fehler zu einem einzelnen Eintrag eines Bulk-Requests."""
+
+    index: int
+    detail: str
+
+
+class BulkCreateResult(SQLModel):
+    """
+    Ergebnis eines Bulk-Inserts.
+
+    ``ids`` enthält die neuen IDs in der Reihenfolge der erfolgreich
+    angelegten Einträge; fehlgeschlagene Einträge stehen mit ihrem
+    Index im Request in ``errors``.
+    """
+
+    created: int
+    ids: list[int]
+    errors: list[BulkItemError] = []
+
+
+class BulkUpsertResult(SQLModel):
+    """
+    Ergebnis eines Bulk-Upserts.
+
+    ``unchanged`` zählt Einträge, die schon genau so in der Datenbank
+    standen (kein UPDATE, keine neue Zeilenversion).
+    """
+
+    inserted: int
+    updated: int
+    unchanged: int
+    errors: list[BulkItemError] = []
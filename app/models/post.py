@@ -12,8 +12,11 @@ Demonstriert:
 import datetime
 from typing import Optional, TYPE_CHECKING
 
+from sqlalchemy import Column, Index, Integer
 from sqlmodel import Field, Relationship, SQLModel
 
+from app.core.post_counts import register_post_count_triggers
+
 if TYPE_CHECKING:
     from .user import User, UserRead
 
@@ -37,6 +40,10 @@ class PostBase(SQLModel):
     )
 
 
+# Zeilen-Version für ETags und Optimistic Locking (siehe app/core/etag.py)
+_version_column = Column("version", Integer, nullable=False, server_default="1")
+
+
 class Post(PostBase, table=True):
     """
     Post-Tabelle in der Datenbank.
@@ -45,6 +52,21 @@ class Post(PostBase, table=True):
     """
     
     __tablename__ = "posts"
+    __table_args__ = (
+        # Angelegt per Migration (migrations/versions/0002_post_query_indexes.py)
+        Index("ix_posts_user_id_created_at", "user_id", "created_at", "id"),
+        Index("ix_posts_published_created_at", "published", "created_at", "id"),
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        Index("ix_posts_title_id", "title", "id"),
+        Index(
+            "ix_posts_title_trgm", "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
+    # SQLAlchemy zählt die Version bei jedem UPDATE hoch und prüft sie
+    # dabei (WHERE version = ...) -> StaleDataError bei parallelen Änderungen
+    __mapper_args__ = {"version_id_col": _version_column}
     
     id: Optional[int] = Field(
         default=None,
@@ -61,10 +83,20 @@ class Post(PostBase, table=True):
         description="ID des Post-Autors"
     )
     
+    version: int = Field(
+        default=1,
+        sa_column=_version_column,
+        description="Zeilen-Version (steigt mit jeder Änderung)"
+    )
+    
     # Relationship zum User (bidirektional)
     author: "User" = Relationship(back_populates="posts")
 
 
+# Trigger für users.post_count beim Anlegen der Tabelle mit installieren
+register_post_count_triggers(Post.__table__)
+
+
 class PostCreate(PostBase):
     """
     Modell für Post-Erstellung.
@@ -97,6 +129,46 @@ class PostUpdate(SQLModel):
     published: Optional[bool] = None
 
 
+class PostFilter(SQLModel):
+    """Filter wie bei ``GET /posts/filtered`` (für Bulk-Operationen)."""
+
+    published: Optional[bool] = None
+    user_id: Optional[int] = None
+    title: Optional[str] = Field(default=None, description="Titel enthält...")
+
+
+class PostBulkUpdate(SQLModel):
+    """
+    Request für ``PATCH /posts/bulk``: entweder ``ids`` oder ``filter``,
+    dazu die Änderungen in ``update``.
+    """
+
+    ids: Optional[list[int]] = Field(default=None, description="IDs der zu ändernden Posts")
+    filter: Optional[PostFilter] = Field(default=None, description="Alle Posts, die dem Filter entsprechen")
+    update: PostUpdate
+    chunk_size: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=10_000,
+        description="Posts pro UPDATE und COMMIT (kürzere Sperren; Default: ein UPDATE für alle)"
+    )
+
+
+class PostBulkUpdateResult(SQLModel):
+    """
+    Ergebnis von ``PATCH /posts/bulk``.
+
+    Posts, die schon genau so in der Datenbank standen, werden nicht
+    geschrieben (keine neue Version). Bei ``ids`` stehen nicht gefundene
+    IDs in ``missing`` und die unveränderten Posts in ``unchanged``.
+    """
+
+    updated: int
+    ids: list[int]
+    unchanged: Optional[int] = None
+    missing: list[int] = []
+
+
 class PostReadWithAuthor(PostRead):
     """
     Modell für Post-Rückgabe MIT Author-Details.
@@ -109,13 +181,69 @@ class PostReadWithAuthor(PostRead):
 
 
 class PaginatedPostResponse(SQLModel):
+    """
+    Modell für paginierte Post-Listen.
+
+    Offset-Modus: page/total/total_pages sind gesetzt.
+    Cursor-Modus: next_cursor/prev_cursor verweisen auf die Nachbarseiten,
+    total ist nur gesetzt, wenn ausdrücklich angefordert.
+    """
+
     items: list[PostRead]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
+    page_size: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+class PostSearchHit(PostRead):
+    """
+    Suchtreffer mit Relevanz und hervorgehobenen Fundstellen.
+
+    Die Hervorhebungen sind HTML: der Post-Text ist escaped, Treffer
+    stehen in ``<mark>...</mark>`` - sicher zum direkten Einbetten.
+    """
+
+    rank: float
+    title_highlight: str = Field(description="Titel als HTML (escaped), Treffer in <mark>...</mark>")
+    content_highlight: str = Field(description="Ausschnitt des Inhalts als HTML (escaped), Treffer in <mark>...</mark>")
+
+
+class PostSearchResponse(SQLModel):
+    """Eine Seite Suchtreffer (nach Relevanz sortiert) mit Cursor für die Nachbarseiten."""
+
+    items: list[PostSearchHit]
     page_size: int
-    total_pages: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+class PostPageWithAuthors(SQLModel):
+    """
+    Normalisierte Seite von Posts mit Authors.
+
+    Jeder Author steht nur einmal in ``authors`` (Schlüssel: User-ID),
+    die Posts verweisen über ``user_id`` darauf - statt einer vollen
+    User-Kopie pro Post.
+    """
+
+    items: list[PostRead]
+    authors: dict[str, "UserRead"]
+    page_size: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+class PostBatchResponse(SQLModel):
+    """Posts zu einer ID-Liste (``POST /posts/batch``) in angefragter Reihenfolge."""
+
+    items: list[PostRead]
+    missing: list[int] = []
 
 
 def rebuild_models():
     from .user import UserRead
     PostReadWithAuthor.model_rebuild()
+    PostPageWithAuthors.model_rebuild()
@@ -1,6 +1,7 @@
 import datetime
 from typing import Optional
 
+from sqlalchemy import Index, text
 from sqlmodel import SQLModel, Field
 
 
@@ -31,6 +32,18 @@ class ProductBase(SQLModel):
 
 class Product(ProductBase, table=True):
     __tablename__ = "products"
+    __table_args__ = (
+        # Angelegt per Migration (migrations/versions/0005_product_indexes.py)
+        # Preisbereich + Keyset-Cursor (price, id)
+        Index("ix_products_price_id", "price", "id"),
+        # Partiell: nur lieferbare Produkte - klein, und genau der Index
+        # für "in_stock=true AND price BETWEEN ..."
+        Index(
+            "ix_products_in_stock_price_id", "price", "id",
+            postgresql_where=text("in_stock"),
+            sqlite_where=text("in_stock = 1")
+        ),
+    )
 
     id: Optional[int] = Field(
         default=None,
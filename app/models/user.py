@@ -8,12 +8,14 @@ Demonstriert:
 - Field-Validierung
 - Indizes
 - Timestamps
+- Denormalisierte Zähler
 - API-Modelle (Create/Read)
 """
 
 import datetime
 from typing import Optional, TYPE_CHECKING
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
@@ -59,6 +61,10 @@ class User(UserBase, table=True):
     """
     
     __tablename__ = "users"
+    __table_args__ = (
+        # Top-N für /users/stats direkt aus dem Index (rückwärts gelesen)
+        Index("ix_users_post_count_id", "post_count", "id"),
+    )
     
     id: Optional[int] = Field(
         default=None,
@@ -76,6 +82,13 @@ class User(UserBase, table=True):
         description="Zeitpunkt der letzten Änderung"
     )
     
+    # Denormalisiert, wird per Trigger gepflegt (siehe app/core/post_counts.py)
+    post_count: int = Field(
+        default=0,
+        sa_column_kwargs={"server_default": "0"},
+        description="Anzahl Posts des Users"
+    )
+    
     # Relationship zu Posts (One-to-Many)
     posts: list["Post"] = Relationship(back_populates="author")
 
@@ -136,6 +149,13 @@ class UserReadWithPosts(UserRead):
     posts: list["PostRead"] = []
 
 
+class UserBatchResponse(SQLModel):
+    """User zu einer ID-Liste (``POST /users/batch``) in angefragter Reihenfolge."""
+
+    items: list[UserRead]
+    missing: list[int] = []
+
+
 class UserStats(SQLModel):
     id: int
     username: str
@@ -0,0 +1,64 @@
+"""
+Post-Zähler neu aufbauen
+========================
+Richtet ``users.post_count`` samt Triggern ein (auch in bestehenden
+Datenbanken) und korrigiert abweichende Zähler.
+
+Usage:
+    python -m app.rebuild_post_counts            # einrichten + korrigieren
+    python -m app.rebuild_post_counts --check    # nur Abweichungen zählen (Exit-Code 1 bei Drift)
+    
+    oder mit uv:
+    uv run python -m app.rebuild_post_counts
+"""
+
+import argparse
+import sys
+from time import perf_counter
+
+from app.core.post_counts import (
+    count_post_count_drift,
+    ensure_post_count_column,
+    install_post_count_triggers,
+    reconcile_post_counts,
+)
+from app.database import engine
+
+
+def rebuild_post_counts(check_only: bool = False) -> int:
+    """
+    Prüft bzw. korrigiert die Post-Zähler.
+
+    Returns:
+        int: Anzahl abweichender (bzw. korrigierter) User
+    """
+    if check_only:
+        with engine.connect() as conn:
+            drift = count_post_count_drift(conn)
+        print(f"{'⚠️ ' if drift else '✅'} {drift:,} User mit abweichendem post_count")
+        return drift
+
+    t0 = perf_counter()
+    with engine.begin() as conn:
+        if ensure_post_count_column(conn):
+            print("➕ Spalte users.post_count angelegt")
+        if install_post_count_triggers(conn):
+            print("✅ Trigger installiert")
+        else:
+            print(f"⚠️  Keine Trigger für Dialekt '{conn.dialect.name}' - Zähler nur per Rebuild aktuell")
+        fixed = reconcile_post_counts(conn)
+    print(f"✅ {fixed:,} User korrigiert in {perf_counter() - t0:.1f}s")
+    return fixed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="users.post_count einrichten und abgleichen.")
+    parser.add_argument("--check", action="store_true", help="Nur prüfen, nichts ändern")
+    args = parser.parse_args(argv)
+
+    drift = rebuild_post_counts(check_only=args.check)
+    return 1 if args.check and drift else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Alembic Environment
+===================
+Verbindet Alembic mit den SQLModel-Modellen und der App-Konfiguration.
+
+Die URL kommt (in dieser Reihenfolge) aus ``config.attributes["url"]``
+(siehe ``app.core.migrations.upgrade_database``), ``sqlalchemy.url`` in
+alembic.ini oder ``settings.database_url``.
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy.pool import NullPool
+from sqlmodel import SQLModel, create_engine
+
+from app.core.config import settings
+from app.core.search import SEARCH_SCHEMA_OBJECTS
+import app.models  # noqa: F401 - registriert alle Tabellen in SQLModel.metadata
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = SQLModel.metadata
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """
+    Dialekt-spezifische Indizes (``ddl_if(dialect=...)``) nur dort vergleichen,
+    Suchspalten/-tabellen (nur per Migration angelegt) ignorieren.
+    """
+    if reflected and compare_to is None and name in SEARCH_SCHEMA_OBJECTS:
+        return False
+    ddl_if = getattr(obj, "_ddl_if", None)
+    if type_ == "index" and ddl_if is not None and ddl_if.dialect:
+        return ddl_if.dialect == context.get_context().dialect.name
+    return True
+
+
+def database_url() -> str:
+    return (
+        config.attributes.get("url")
+        or config.get_main_option("sqlalchemy.url")
+        or settings.database_url
+    )
+
+
+def run_migrations_offline():
+    """Erzeugt nur das SQL (``alembic upgrade head --sql``)."""
+    context.configure(
+        url=database_url(),
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """Führt die Migrationen gegen die Datenbank aus."""
+    engine = create_engine(database_url(), poolclass=NullPool)
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            # SQLite kann ALTER TABLE kaum - Batch-Modus baut die Tabelle dort neu
+            render_as_batch=connection.dialect.name == "sqlite",
+            transaction_per_migration=True,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+    engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,75 @@
+"""
+Baseline: users, posts, products
+================================
+Schema-Stand vor Einführung der Migrationen.
+
+Datenbanken, die noch per ``create_all()`` angelegt wurden, werden
+nicht neu erstellt: vorhandene Tabellen bleiben, nur ``users.post_count``
+und die Zähler-Trigger werden bei Bedarf ergänzt.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.migrations import table_exists
+from app.core.post_counts import TRIGGER_DDL, ensure_post_count_column, reconcile_post_counts
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not table_exists("users"):
+        op.create_table(
+            "users",
+            sa.Column("name", sa.String(length=100), nullable=False),
+            sa.Column("email", sa.String(length=255), nullable=False),
+            sa.Column("is_active", sa.Boolean(), nullable=False),
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+            sa.Column("post_count", sa.Integer(), server_default="0", nullable=False),
+        )
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+        op.create_index("ix_users_post_count_id", "users", ["post_count", "id"])
+    elif ensure_post_count_column(op.get_bind()):
+        reconcile_post_counts(op.get_bind())
+
+    if not table_exists("posts"):
+        op.create_table(
+            "posts",
+            sa.Column("title", sa.String(length=200), nullable=False),
+            sa.Column("content", sa.String(), nullable=False),
+            sa.Column("published", sa.Boolean(), nullable=False),
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        )
+    # op.execute statt Connection, damit auch ``alembic upgrade --sql`` funktioniert
+    for statement in TRIGGER_DDL.get(op.get_context().dialect.name, []):
+        op.execute(statement)
+
+    if not table_exists("products"):
+        op.create_table(
+            "products",
+            sa.Column("name", sa.String(length=100), nullable=False),
+            sa.Column("description", sa.String(), nullable=True),
+            sa.Column("price", sa.Float(), nullable=False),
+            sa.Column("in_stock", sa.Boolean(), nullable=False),
+            sa.Column("sku", sa.String(length=50), nullable=False, unique=True),
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        )
+
+
+def downgrade():
+    op.drop_table("products")
+    op.drop_table("posts")
+    op.drop_table("users")
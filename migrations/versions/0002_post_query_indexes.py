@@ -0,0 +1,50 @@
+"""
+Indizes für die Post-Abfragen
+=============================
+- ``(user_id, created_at, id)``: get_user_posts, filter_posts(user_id),
+  Fremdschlüssel-Joins (PostgreSQL indiziert FKs nicht automatisch)
+- ``(published, created_at, id)``: filter_posts(published) mit Default-Sortierung
+- ``(created_at, id)`` / ``(title, id)``: Sortierung + Keyset-Cursor in filter_posts
+- Trigram-GIN auf ``title`` (nur PostgreSQL): ``title ILIKE '%...%'``
+
+Auf PostgreSQL werden alle Indizes mit CONCURRENTLY angelegt - die
+Migration kann also auf der laufenden Datenbank ausgeführt werden.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+from app.core.migrations import create_index_online, drop_index_online
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    create_index_online("ix_posts_user_id_created_at", "posts", ["user_id", "created_at", "id"])
+    create_index_online("ix_posts_published_created_at", "posts", ["published", "created_at", "id"])
+    create_index_online("ix_posts_created_at_id", "posts", ["created_at", "id"])
+    create_index_online("ix_posts_title_id", "posts", ["title", "id"])
+
+    if op.get_bind().dialect.name == "postgresql":
+        # Braucht CREATE-Recht auf der Datenbank (bzw. pg_trgm ist schon installiert)
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    create_index_online(
+        "ix_posts_title_trgm", "posts", ["title"],
+        postgresql_only=True,
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+
+
+def downgrade():
+    drop_index_online("ix_posts_title_trgm", "posts", postgresql_only=True)
+    drop_index_online("ix_posts_title_id", "posts")
+    drop_index_online("ix_posts_created_at_id", "posts")
+    drop_index_online("ix_posts_published_created_at", "posts")
+    drop_index_online("ix_posts_user_id_created_at", "posts")
@@ -0,0 +1,43 @@
+"""
+Volltextsuche für Posts
+=======================
+- PostgreSQL: generierte Spalte ``posts.search_vector`` + GIN-Index
+  (CONCURRENTLY). Achtung: Das Hinzufügen einer STORED-Spalte schreibt
+  die Tabelle einmal komplett neu und sperrt sie so lange.
+- SQLite: FTS5-Tabelle ``posts_fts`` samt Sync-Triggern.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+from app.core.migrations import create_index_online, drop_index_online
+from app.core.search import SEARCH_DDL
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for statement in SEARCH_DDL.get(op.get_context().dialect.name, []):
+        op.execute(statement)
+    create_index_online(
+        "ix_posts_search_vector", "posts", ["search_vector"],
+        postgresql_only=True,
+        postgresql_using="gin",
+    )
+
+
+def downgrade():
+    dialect = op.get_context().dialect.name
+    if dialect == "postgresql":
+        drop_index_online("ix_posts_search_vector", "posts", postgresql_only=True)
+        op.execute("ALTER TABLE posts DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        for trigger in ("posts_fts_insert", "posts_fts_delete", "posts_fts_update"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS posts_fts")
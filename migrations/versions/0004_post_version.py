@@ -0,0 +1,36 @@
+"""
+Zeilen-Version für Posts
+========================
+Spalte ``posts.version`` für ETags und Optimistic Locking.
+
+PostgreSQL (ab 11) legt eine Spalte mit konstantem Default ohne
+Umschreiben der Tabelle an - nur ein kurzer ACCESS EXCLUSIVE Lock.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.migrations import column_exists
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not column_exists("posts", "version"):
+        op.add_column(
+            "posts",
+            sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+        )
+
+
+def downgrade():
+    # Kein batch_alter_table: der Tabellen-Neubau auf SQLite würde die
+    # Trigger auf posts verwerfen (DROP COLUMN braucht SQLite >= 3.35)
+    op.drop_column("posts", "version")
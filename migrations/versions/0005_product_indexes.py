@@ -0,0 +1,38 @@
+"""
+Indizes für die Produkt-Abfragen
+================================
+- ``(price, id)``: Preisbereich (``min_price``/``max_price``) und
+  Keyset-Cursor bei Sortierung nach Preis
+- ``(price, id) WHERE in_stock`` (partiell): lieferbare Produkte im
+  Preisbereich - enthält nur die lieferbaren Zeilen, bleibt also klein
+
+``sku`` ist schon per UNIQUE-Constraint indiziert (Lookup und
+``ON CONFLICT (sku)`` beim Upsert).
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+
+from sqlalchemy import text
+
+from app.core.migrations import create_index_online, drop_index_online
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    create_index_online("ix_products_price_id", "products", ["price", "id"])
+    create_index_online(
+        "ix_products_in_stock_price_id", "products", ["price", "id"],
+        postgresql_where=text("in_stock"),
+        sqlite_where=text("in_stock = 1"),
+    )
+
+
+def downgrade():
+    drop_index_online("ix_products_in_stock_price_id", "products")
+    drop_index_online("ix_products_price_id", "products")
@@ -0,0 +1,34 @@
+"""
+Änderungs-Meldungen für den SKU-Cache
+=====================================
+PostgreSQL: Statement-Trigger auf ``products`` (UPDATE/DELETE) senden die
+betroffenen SKUs per ``NOTIFY product_changes`` - jeder Worker
+invalidiert damit seinen SKU-Cache (``app/core/sku_cache.py``).
+
+SQLite: nichts zu tun (kein LISTEN/NOTIFY, nur lokale Invalidierung).
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+from app.core.sku_cache import POSTGRES_NOTIFY_DDL, POSTGRES_NOTIFY_DROP_DDL
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_context().dialect.name == "postgresql":
+        for statement in POSTGRES_NOTIFY_DDL:
+            op.execute(statement)
+
+
+def downgrade():
+    if op.get_context().dialect.name == "postgresql":
+        for statement in POSTGRES_NOTIFY_DROP_DDL:
+            op.execute(statement)
@@ -0,0 +1,72 @@
+"""
+Test-Setup
+==========
+Eigene SQLite-Datenbank pro Testlauf. Die Settings werden beim Import
+gelesen - deshalb die Umgebung setzen, bevor ``app`` importiert wird.
+"""
+
+import itertools
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+_tmp_dir = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_tmp_dir.name) / 'test.db'}"
+os.environ["DEBUG"] = "False"
+os.environ["CURSOR_SECRET_KEY"] = "test-cursor-secret"
+os.environ["DB_ASYNC"] = "False"
+os.environ["CACHE_BACKEND"] = "none"
+os.environ["SKU_CACHE_WARM_ENTRIES"] = "0"
+os.environ["METRICS_ENABLED"] = "False"
+os.environ["DB_READ_REPLICA_URLS"] = ""
+
+
+@pytest.fixture(scope="session")
+def engine():
+    from app.core.config import settings
+    from app.core.migrations import upgrade_database
+    from app.database import engine
+
+    upgrade_database(settings.database_url)
+    yield engine
+    engine.dispose()
+    _tmp_dir.cleanup()
+
+
+@pytest.fixture(scope="session")
+def client(engine):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+_unique = itertools.count(1)
+
+
+@pytest.fixture
+def make_user(engine):
+    """Legt einen User mit ``posts`` Posts an -> ``(user_id, [post_ids])``."""
+    from sqlmodel import Session
+
+    from app.models import Post, User
+
+    def make(posts: int = 0, published: bool = False) -> tuple[int, list[int]]:
+        n = next(_unique)
+        with Session(engine) as session:
+            user = User(name=f"Fixture {n}", email=f"fixture{n}@example.com")
+            session.add(user)
+            session.flush()
+            items = [
+                Post(title=f"Fixture {n}-{i}", content="Text", published=published, user_id=user.id)
+                for i in range(posts)
+            ]
+            session.add_all(items)
+            session.commit()
+            return user.id, [post.id for post in items]
+
+    return make
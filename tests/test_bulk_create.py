@@ -0,0 +1,79 @@
+"""
+Tests für POST /posts/bulk und POST /users/bulk
+"""
+
+import asyncio
+
+from sqlmodel import Session, select
+
+from app.core import bulk
+from app.core.bulk import BulkBody
+from app.models import Post, User
+from app.models.bulk import BulkItemError
+
+
+def test_posts_bulk_one_insert_per_chunk(client, engine, make_user):
+    user_id, _ = make_user()
+    body = [{"title": f"Bulk {i}", "content": "Text", "user_id": user_id} for i in range(30)]
+    body.insert(10, {"title": "Ohne Author", "content": "Text", "user_id": 999_999})
+
+    response = client.post("/api/v1/posts/bulk", json=body)
+
+    assert response.status_code == 201
+    result = response.json()
+    assert result["created"] == 30
+    assert [error["index"] for error in result["errors"]] == [10]
+    # Autoren prüfen + ein INSERT ... RETURNING für den ganzen Block
+    assert int(response.headers["X-DB-Queries"]) == 2
+    with Session(engine) as session:
+        titles = dict(session.exec(select(Post.id, Post.title).where(Post.id.in_(result["ids"]))).all())
+    # IDs in der Reihenfolge des Bodys
+    assert [titles[id_] for id_ in result["ids"]] == [f"Bulk {i}" for i in range(30)]
+
+
+def test_users_bulk_ndjson(client, engine):
+    lines = [f'{{"name": "Bulk {i}", "email": "bulk{i}@example.com"}}' for i in range(20)]
+    lines.insert(5, "kein json")
+
+    response = client.post(
+        "/api/v1/users/bulk",
+        content="\n".join(lines).encode(),
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+
+    assert response.status_code == 201
+    result = response.json()
+    assert result["created"] == 20
+    assert [error["index"] for error in result["errors"]] == [5]
+    assert int(response.headers["X-DB-Queries"]) == 2
+    with Session(engine) as session:
+        emails = dict(session.exec(select(User.id, User.email).where(User.id.in_(result["ids"]))).all())
+    assert [emails[id_] for id_ in result["ids"]] == [f"bulk{i}@example.com" for i in range(20)]
+
+
+def test_ndjson_lines_across_chunks():
+    async def chunks():
+        for chunk in (b'{"a": 1}\n{"a"', b': 2}\n\nkaputt\n{"a": ', b"3}"):
+            yield chunk
+
+    async def collect():
+        return [item async for item in BulkBody._iter_ndjson(chunks())]
+
+    items = asyncio.run(collect())
+
+    assert [index for index, _ in items] == [0, 1, 2, 3]
+    assert [items[i][1] for i in (0, 1, 3)] == [{"a": 1}, {"a": 2}, {"a": 3}]
+    assert isinstance(items[2][1], BulkItemError)
+
+
+def test_body_size_limit(client, monkeypatch):
+    monkeypatch.setattr(bulk, "BULK_MAX_BYTES", 100)
+    lines = [f'{{"name": "Zu groß {i}", "email": "gross{i}@example.com"}}' for i in range(10)]
+
+    response = client.post(
+        "/api/v1/users/bulk",
+        content="\n".join(lines).encode(),
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+
+    assert response.status_code == 413
@@ -0,0 +1,87 @@
+"""
+Tests für PATCH /posts/bulk
+"""
+
+import pytest
+from sqlmodel import Session, select
+
+from app.models import Post
+
+
+@pytest.mark.parametrize("field", ["title", "content", "published"])
+def test_null_for_not_nullable_column(client, engine, make_user, field):
+    _, post_ids = make_user(posts=2)
+
+    response = client.patch("/api/v1/posts/bulk", json={"ids": post_ids, "update": {field: None}})
+
+    assert response.status_code == 422
+    assert field in response.json()["detail"]
+    with Session(engine) as session:
+        assert all(getattr(session.get(Post, id_), field) is not None for id_ in post_ids)
+
+
+def post_state(engine, post_ids: list[int]) -> dict[int, tuple[bool, int]]:
+    """``{id: (published, version)}``"""
+    with Session(engine) as session:
+        rows = session.exec(select(Post.id, Post.published, Post.version).where(Post.id.in_(post_ids))).all()
+    return {row.id: (row.published, row.version) for row in rows}
+
+
+def test_update_by_ids(client, engine, make_user):
+    _, post_ids = make_user(posts=4)
+    before = post_state(engine, post_ids)
+    body = {"ids": [*post_ids, 999_999], "update": {"published": True}}
+
+    result = client.patch("/api/v1/posts/bulk", json=body).json()
+
+    assert sorted(result["ids"]) == post_ids
+    assert (result["updated"], result["unchanged"], result["missing"]) == (4, 0, [999_999])
+    assert post_state(engine, post_ids) == {id_: (True, version + 1) for id_, (_, version) in before.items()}
+
+    # Zweiter Lauf: nichts zu ändern, keine neue Version
+    repeat = client.patch("/api/v1/posts/bulk", json=body).json()
+    assert (repeat["updated"], repeat["unchanged"], repeat["ids"]) == (0, 4, [])
+    assert post_state(engine, post_ids) == {id_: (True, version + 1) for id_, (_, version) in before.items()}
+
+
+def test_update_by_ids_in_chunks(client, engine, make_user):
+    _, post_ids = make_user(posts=5)
+
+    response = client.patch(
+        "/api/v1/posts/bulk", json={"ids": post_ids, "update": {"published": True}, "chunk_size": 2}
+    )
+
+    assert sorted(response.json()["ids"]) == post_ids
+    # Pro Block: vorhandene IDs lesen + UPDATE ... RETURNING
+    assert int(response.headers["X-DB-Queries"]) == 3 * 2
+    assert all(published for published, _ in post_state(engine, post_ids).values())
+
+
+@pytest.mark.parametrize("chunk_size", [None, 2])
+def test_update_by_filter(client, engine, make_user, chunk_size):
+    user_id, post_ids = make_user(posts=5)
+    _, other_ids = make_user(posts=2)
+
+    response = client.patch("/api/v1/posts/bulk", json={
+        "filter": {"user_id": user_id, "published": False},
+        "update": {"published": True},
+        "chunk_size": chunk_size,
+    })
+
+    assert response.status_code == 200
+    assert sorted(response.json()["ids"]) == post_ids
+    assert all(published for published, _ in post_state(engine, post_ids).values())
+    assert not any(published for published, _ in post_state(engine, other_ids).values())
+    if chunk_size is not None:
+        # Blöcke 2 + 2 + 1: je SELECT der IDs + UPDATE
+        assert int(response.headers["X-DB-Queries"]) == 3 * 2
+
+
+@pytest.mark.parametrize("body", [
+    {"update": {"published": True}},
+    {"ids": [1], "filter": {"user_id": 1}, "update": {"published": True}},
+    {"filter": {}, "update": {"published": True}},
+    {"ids": [1], "update": {}},
+])
+def test_invalid_requests(client, body):
+    assert client.patch("/api/v1/posts/bulk", json=body).status_code == 400
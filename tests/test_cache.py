@@ -0,0 +1,187 @@
+"""
+Tests für den Response-Cache (app/core/cache.py)
+"""
+
+import time
+
+import pytest
+
+from app.core.cache import CacheStats, MemoryBackend, RedisBackend, ResponseCache, response_cache
+
+
+def memory_cache(max_entries: int = 100, max_bytes: int = 1_000_000, ttl: float = 60.0) -> ResponseCache:
+    stats = CacheStats()
+    return ResponseCache(MemoryBackend(max_entries, max_bytes, stats), ttl, stats)
+
+
+def test_store_does_not_overwrite_concurrent_invalidation():
+    cache = memory_cache()
+    backend = cache.backend
+    get_many = backend.get_many
+
+    def invalidate_after_read(keys):
+        # Zwischen Lesen der (fehlenden) Tag-Version und Speichern schreibt jemand
+        versions = get_many(keys)
+        cache.invalidate("post:1")
+        return versions
+
+    backend.get_many = invalidate_after_read
+    started = time.time()
+    cache.store("resp:a", b"alt", {}, ["post:1"], started)
+    backend.get_many = get_many
+
+    assert cache.lookup("resp:a") is None
+    assert float(backend.get(cache._tag_key("post:1"))) >= started
+
+
+class FakeRedis:
+    """Lokaler Ersatz für redis-py: ``get``/``mget``/``set(px=, nx=)`` im Speicher."""
+
+    def __init__(self):
+        self.data: dict[str, tuple[float, bytes]] = {}
+
+    def get(self, key):
+        entry = self.data.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            self.data.pop(key, None)
+            return None
+        return entry[1]
+
+    def mget(self, keys):
+        return [self.get(key) for key in keys]
+
+    def set(self, key, value, px=None, nx=False):
+        if nx and self.get(key) is not None:
+            return None
+        self.data[key] = (time.monotonic() + px / 1000 if px else float("inf"), value)
+        return True
+
+
+@pytest.fixture(params=["memory", "redis"])
+def cache(request, monkeypatch):
+    """Aktiviert den Response-Cache der App (im Test-Setup sonst aus)."""
+    stats = CacheStats()
+    backend = (
+        MemoryBackend(1000, 10_000_000, stats) if request.param == "memory"
+        else RedisBackend(FakeRedis(), prefix=f"test{time.monotonic_ns()}:")
+    )
+    monkeypatch.setattr(response_cache, "backend", backend)
+    monkeypatch.setattr(response_cache, "stats", stats)
+    return response_cache
+
+
+def get_twice(client, url: str, **params):
+    """Zweimal lesen - der zweite Request muss ein Treffer sein."""
+    first = client.get(url, params=params)
+    hits = cache_hits()
+    second = client.get(url, params=params)
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert cache_hits() == hits + 1
+    return second.json()
+
+
+def cache_hits() -> int:
+    return response_cache.stats.snapshot()["hits"]
+
+
+def test_patch_post_invalidates_get_post(client, cache, make_user):
+    _, (post_id,) = make_user(posts=1)
+    get_twice(client, f"/api/v1/posts/{post_id}")
+
+    assert client.patch(f"/api/v1/posts/{post_id}", json={"title": "Geändert"}).status_code == 200
+
+    assert client.get(f"/api/v1/posts/{post_id}").json()["title"] == "Geändert"
+
+
+def test_delete_post_invalidates_get_post(client, cache, make_user):
+    _, (post_id,) = make_user(posts=1)
+    get_twice(client, f"/api/v1/posts/{post_id}")
+
+    assert client.delete(f"/api/v1/posts/{post_id}").status_code in (200, 204)
+
+    assert client.get(f"/api/v1/posts/{post_id}").status_code == 404
+
+
+def test_patch_user_invalidates_get_user_and_author(client, cache, make_user):
+    user_id, (post_id,) = make_user(posts=1)
+    get_twice(client, f"/api/v1/users/{user_id}")
+    get_twice(client, f"/api/v1/posts/{post_id}")
+
+    assert client.patch(f"/api/v1/users/{user_id}", json={"name": "Neuer Name"}).status_code == 200
+
+    assert client.get(f"/api/v1/users/{user_id}").json()["name"] == "Neuer Name"
+    assert client.get(f"/api/v1/posts/{post_id}").json()["author"]["name"] == "Neuer Name"
+
+
+def test_patch_post_invalidates_lists(client, cache, make_user):
+    user_id, post_ids = make_user(posts=3)
+    ids = ",".join(map(str, post_ids))
+    get_twice(client, "/api/v1/posts/", ids=ids)
+    get_twice(client, "/api/v1/posts/filtered", user_id=user_id)
+
+    assert client.patch(f"/api/v1/posts/{post_ids[0]}", json={"title": "Neu in Listen"}).status_code == 200
+
+    listed = client.get("/api/v1/posts/", params={"ids": ids}).json()
+    filtered = client.get("/api/v1/posts/filtered", params={"user_id": user_id}).json()
+    assert "Neu in Listen" in {post["title"] for post in listed}
+    assert "Neu in Listen" in {post["title"] for post in filtered["items"]}
+
+
+def test_bulk_update_invalidates_get_post(client, cache, make_user):
+    _, post_ids = make_user(posts=2)
+    get_twice(client, f"/api/v1/posts/{post_ids[1]}")
+
+    response = client.patch("/api/v1/posts/bulk", json={"ids": post_ids, "update": {"published": True}})
+    assert response.status_code == 200
+
+    assert client.get(f"/api/v1/posts/{post_ids[1]}").json()["published"] is True
+
+
+@pytest.mark.parametrize("backend", ["memory", "redis"])
+def test_ttl(backend):
+    cache = memory_cache(ttl=0.05) if backend == "memory" else ResponseCache(RedisBackend(FakeRedis()), 0.05)
+    cache.store("resp:a", b"body", {}, [], time.time())
+    assert cache.lookup("resp:a") == (b"body", {})
+
+    time.sleep(0.1)
+
+    assert cache.lookup("resp:a") is None
+
+
+def test_max_entries_evicts_least_recently_used():
+    cache = memory_cache(max_entries=2)
+    cache.store("resp:a", b"a", {}, [], time.time())
+    cache.store("resp:b", b"b", {}, [], time.time())
+    cache.lookup("resp:a")
+
+    cache.store("resp:c", b"c", {}, [], time.time())
+
+    assert cache.lookup("resp:b") is None
+    assert cache.lookup("resp:a") is not None
+    assert cache.lookup("resp:c") is not None
+    assert cache.stats.snapshot()["evictions"] == 1
+
+
+def test_max_bytes():
+    cache = memory_cache(max_bytes=250)
+    for name in "abc":
+        cache.store(f"resp:{name}", b"x" * 100, {}, [], time.time())
+
+    size = cache.backend.size()
+    assert size["bytes"] <= 250
+    assert cache.lookup("resp:a") is None
+    assert cache.lookup("resp:c") is not None
+
+
+def test_invalidate_marks_tagged_entries_stale():
+    cache = memory_cache()
+    cache.store("resp:a", b"a", {}, ["post:1", "posts"], time.time() - 1)
+    cache.store("resp:b", b"b", {}, ["post:2", "posts"], time.time() - 1)
+    cache.store("resp:c", b"c", {}, ["post:3"], time.time() - 1)
+
+    cache.invalidate("posts")
+
+    assert cache.lookup("resp:a") is None
+    assert cache.lookup("resp:b") is None
+    assert cache.lookup("resp:c") is not None
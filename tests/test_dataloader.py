@@ -0,0 +1,63 @@
+"""
+Tests für das Batch Loading (app/core/dataloader.py)
+"""
+
+import pytest
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.query_stats import collect_queries
+from app.models import Post, User, UserReadWithPosts
+
+USERS = 20
+POSTS_PER_USER = 5
+
+
+@pytest.fixture(scope="module")
+def dataset(engine):
+    with Session(engine) as session:
+        users = [User(name=f"User {i}", email=f"user{i}@example.com") for i in range(USERS)]
+        session.add_all(users)
+        session.flush()
+        session.add_all(
+            Post(title=f"Post {user.id}-{n}", content="Text", published=n % 2 == 0, user_id=user.id)
+            for user in users for n in range(POSTS_PER_USER)
+        )
+        session.commit()
+        return [user.id for user in users]
+
+
+@pytest.fixture(params=[True, False], ids=["batched", "unbatched"])
+def batch_loading(request, monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_LOADING", request.param)
+    return request.param
+
+
+def test_with_authors_lazy(client, dataset, batch_loading):
+    # Andere Tests legen auch Posts an - die Seite deckt mindestens den Datensatz ab
+    url = "/api/v1/posts/with-authors"
+    limit = 500
+    expected = client.get(url, params={"strategy": "joined", "limit": limit}).json()
+
+    response = client.get(url, params={"strategy": "lazy", "limit": limit})
+
+    assert response.status_code == 200
+    assert response.json() == expected
+    authors = {post["user_id"] for post in response.json()}
+    assert set(dataset) <= authors
+    # Eine Query für die Posts, dann eine für alle Authors - bzw. eine pro Author
+    assert int(response.headers["X-DB-Queries"]) == (2 if batch_loading else 1 + len(authors))
+
+
+def test_user_posts(engine, dataset, batch_loading):
+    with Session(engine) as session:
+        with collect_queries() as stats:
+            users = session.exec(select(User).where(User.id.in_(dataset)).order_by(User.id)).all()
+            result = [UserReadWithPosts.model_validate(user) for user in users]
+
+    assert stats.queries == (2 if batch_loading else 1 + USERS)
+    assert len(result) == USERS
+    for user in result:
+        assert len(user.posts) == POSTS_PER_USER
+        assert {post.user_id for post in user.posts} == {user.id}
+        assert {post.title for post in user.posts} == {f"Post {user.id}-{n}" for n in range(POSTS_PER_USER)}
@@ -0,0 +1,84 @@
+"""
+Tests für ETags und bedingte Requests (app/core/etag.py)
+"""
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.etag import check_if_match, none_match
+
+
+def test_none_match_weak_comparison():
+    assert none_match('W/"abc"', '"abc"')
+    assert none_match('"x", "abc"', '"abc"')
+    assert none_match("*", '"abc"')
+    assert not none_match('"x"', '"abc"')
+    assert not none_match(None, '"abc"')
+
+
+def test_if_match_strong_comparison():
+    check_if_match(None, '"abc"')
+    check_if_match('"abc"', '"abc"')
+    check_if_match("*", '"abc"')
+    with pytest.raises(HTTPException) as exc_info:
+        check_if_match('W/"abc"', '"abc"')
+    assert exc_info.value.status_code == 412
+
+
+def test_get_post_not_modified(client, make_user):
+    _, (post_id,) = make_user(posts=1)
+    etag = client.get(f"/api/v1/posts/{post_id}").headers["ETag"]
+
+    response = client.get(f"/api/v1/posts/{post_id}", headers={"If-None-Match": f"W/{etag}"})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+
+def test_patch_post_if_match(client, make_user):
+    _, (post_id,) = make_user(posts=1)
+    etag = client.get(f"/api/v1/posts/{post_id}").headers["ETag"]
+
+    first = client.patch(f"/api/v1/posts/{post_id}", json={"title": "Erster"}, headers={"If-Match": etag})
+    second = client.patch(f"/api/v1/posts/{post_id}", json={"title": "Zweiter"}, headers={"If-Match": etag})
+
+    assert first.status_code == 200
+    assert second.status_code == 412
+    current = client.get(f"/api/v1/posts/{post_id}")
+    assert current.json()["title"] == "Erster"
+    assert current.headers["ETag"] != etag
+
+
+def test_bulk_update_changes_post_etag(client, make_user):
+    _, (post_id,) = make_user(posts=1)
+    etag = client.get(f"/api/v1/posts/{post_id}").headers["ETag"]
+
+    client.patch("/api/v1/posts/bulk", json={"ids": [post_id], "update": {"published": True}})
+
+    response = client.patch(f"/api/v1/posts/{post_id}", json={"title": "Zu spät"}, headers={"If-Match": etag})
+    assert response.status_code == 412
+
+
+def test_author_change_changes_post_etag(client, make_user):
+    user_id, (post_id,) = make_user(posts=1)
+    etag = client.get(f"/api/v1/posts/{post_id}").headers["ETag"]
+
+    assert client.patch(f"/api/v1/users/{user_id}", json={"name": "Umbenannt"}).status_code == 200
+
+    response = client.get(f"/api/v1/posts/{post_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["author"]["name"] == "Umbenannt"
+
+
+def test_patch_user_if_match(client, make_user):
+    user_id, _ = make_user()
+    etag = client.get(f"/api/v1/users/{user_id}").headers["ETag"]
+    assert client.get(f"/api/v1/users/{user_id}", headers={"If-None-Match": etag}).status_code == 304
+
+    first = client.patch(f"/api/v1/users/{user_id}", json={"name": "Erster"}, headers={"If-Match": etag})
+    second = client.patch(f"/api/v1/users/{user_id}", json={"name": "Zweiter"}, headers={"If-Match": etag})
+
+    assert first.status_code == 200
+    assert second.status_code == 412
+    assert client.get(f"/api/v1/users/{user_id}").json()["name"] == "Erster"
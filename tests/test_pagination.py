@@ -0,0 +1,107 @@
+"""
+Tests für die Keyset-Pagination (app/core/pagination.py)
+"""
+
+import datetime
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.core import pagination
+from app.core.config import DEFAULT_CURSOR_SECRET_KEY, settings
+from app.core.pagination import decode_cursor, encode_cursor
+
+CREATED_AT = datetime.datetime(2026, 1, 2, 3, 4, 5, tzinfo=datetime.UTC)
+
+
+def assert_rejected(cursor: str, *args, detail: str):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor, *args)
+    assert exc_info.value.status_code == 400
+    assert detail in exc_info.value.detail
+
+
+def test_round_trip():
+    cursor = encode_cursor("created_at", True, CREATED_AT, 42, "prev", scope={"user_id": 5})
+
+    data = decode_cursor(cursor, "created_at", True, {"user_id": 5, "title": None})
+
+    assert (data["v"], data["id"], data["d"]) == (CREATED_AT, 42, "prev")
+
+
+def test_tampered_payload():
+    payload, signature = encode_cursor("id", False, 10, 10).split(".")
+    forged_payload, _ = encode_cursor("id", False, 10_000, 10_000).split(".")
+
+    assert_rejected(f"{forged_payload}.{signature}", "id", False, detail="Ungültig")
+    assert_rejected(f"{payload}.{signature[:-2]}AA", "id", False, detail="Ungültig")
+    assert_rejected("kein-cursor", "id", False, detail="Ungültig")
+
+
+def test_other_secret(monkeypatch):
+    cursor = encode_cursor("id", False, 10, 10)
+    monkeypatch.setattr(settings, "CURSOR_SECRET_KEY", "anderes-secret")
+
+    assert_rejected(cursor, "id", False, detail="Ungültig")
+
+
+def test_expired(monkeypatch):
+    cursor = encode_cursor("id", False, 10, 10)
+    monkeypatch.setattr(settings, "CURSOR_MAX_AGE_SECONDS", 60)
+    monkeypatch.setattr(pagination, "time", SimpleNamespace(time=lambda: time.time() + 61))
+
+    assert_rejected(cursor, "id", False, detail="abgelaufen")
+
+
+def test_sort_mismatch():
+    cursor = encode_cursor("created_at", True, CREATED_AT, 42)
+
+    assert_rejected(cursor, "created_at", False, detail="Sortierung")
+    assert_rejected(cursor, "title", True, detail="Sortierung")
+
+
+def test_filter_mismatch():
+    cursor = encode_cursor("id", False, 10, 10, scope={"user_id": 5})
+
+    assert_rejected(cursor, "id", False, {"user_id": 6}, detail="Filtern")
+    assert_rejected(cursor, "id", False, None, detail="Filtern")
+
+
+def test_filtered_posts_cursor_bound_to_filters(client, make_user):
+    user_id, post_ids = make_user(posts=3)
+    other_id, _ = make_user(posts=1)
+    params = {"user_id": user_id, "pagination": "cursor", "page_size": 2, "sort_by": "id", "order": "asc"}
+
+    first = client.get("/api/v1/posts/filtered", params=params).json()
+    cursor = first["next_cursor"]
+    second = client.get("/api/v1/posts/filtered", params={**params, "cursor": cursor})
+    other = client.get("/api/v1/posts/filtered", params={**params, "user_id": other_id, "cursor": cursor})
+
+    assert [post["id"] for post in first["items"]] == post_ids[:2]
+    assert [post["id"] for post in second.json()["items"]] == post_ids[2:]
+    assert other.status_code == 400
+
+
+def test_user_posts_cursor_bound_to_user(client, make_user):
+    user_id, post_ids = make_user(posts=2)
+    other_id, _ = make_user(posts=2)
+    params = {"pagination": "cursor", "limit": 1}
+
+    cursor = client.get(f"/api/v1/users/{user_id}/posts", params=params).headers["X-Next-Cursor"]
+
+    same = client.get(f"/api/v1/users/{user_id}/posts", params={**params, "cursor": cursor})
+    assert [post["id"] for post in same.json()] == post_ids[1:]
+    assert client.get(f"/api/v1/users/{other_id}/posts", params={**params, "cursor": cursor}).status_code == 400
+
+
+def test_default_secret_refused_without_debug(engine, monkeypatch):
+    from app.main import app
+
+    monkeypatch.setattr(settings, "CURSOR_SECRET_KEY", DEFAULT_CURSOR_SECRET_KEY)
+
+    with pytest.raises(RuntimeError, match="CURSOR_SECRET_KEY"):
+        with TestClient(app):
+            pass
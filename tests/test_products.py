@@ -0,0 +1,57 @@
+"""
+Tests für PUT /products/bulk (Upsert über die SKU)
+"""
+
+import itertools
+
+import pytest
+
+_skus = itertools.count(1)
+
+
+@pytest.fixture
+def sku():
+    return lambda: f"TEST-{next(_skus):06d}"
+
+
+def product(sku: str, price: float = 10.0, **fields) -> dict:
+    return {"sku": sku, "name": f"Produkt {sku}", "price": price, "in_stock": True, **fields}
+
+
+def upsert(client, items: list[dict]) -> dict:
+    response = client.put("/api/v1/products/bulk", json=items)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_upsert_insert_update_unchanged(client, sku):
+    a, b, c = sku(), sku(), sku()
+    assert upsert(client, [product(a), product(b), product(c)]) == {
+        "inserted": 3, "updated": 0, "unchanged": 0, "errors": []
+    }
+
+    result = upsert(client, [product(a, price=12.5), product(b), product(c, in_stock=False), product(sku())])
+
+    assert (result["inserted"], result["updated"], result["unchanged"]) == (1, 2, 1)
+    assert client.get(f"/api/v1/products/sku/{a}").json()["price"] == 12.5
+
+
+def test_upsert_existing_never_updated_row(client, sku):
+    # Per POST angelegt: updated_at ist noch leer
+    existing = sku()
+    assert client.post("/api/v1/products/", json=product(existing)).status_code == 201
+
+    assert (upsert(client, [product(existing)])["unchanged"]) == 1
+    result = upsert(client, [product(existing, price=99.0)])
+
+    assert (result["inserted"], result["updated"], result["unchanged"]) == (0, 1, 0)
+    assert client.get(f"/api/v1/products/sku/{existing}").json()["price"] == 99.0
+
+
+def test_upsert_duplicate_sku_in_request(client, sku):
+    duplicate = sku()
+
+    result = upsert(client, [product(duplicate), product(duplicate, price=1.0)])
+
+    assert result["inserted"] == 1
+    assert [error["index"] for error in result["errors"]] == [1]
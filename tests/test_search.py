@@ -0,0 +1,30 @@
+"""
+Tests für GET /posts/search
+"""
+
+from app.core.search import render_highlight
+
+
+def test_render_highlight_escapes_text():
+    assert render_highlight('<b onclick="x">\x02Treffer\x03</b> & mehr') == (
+        "&lt;b onclick=&quot;x&quot;&gt;<mark>Treffer</mark>&lt;/b&gt; &amp; mehr"
+    )
+
+
+def test_highlights_escape_post_text(client, make_user):
+    user_id, _ = make_user()
+    post = {
+        "title": "<script>alert(1)</script> Xylophon",
+        "content": "Vorher <img src=x onerror=alert(2)> Xylophon danach",
+        "user_id": user_id,
+    }
+    assert client.post("/api/v1/posts/", json=post).status_code == 201
+
+    response = client.get("/api/v1/posts/search", params={"q": "xylophon"})
+
+    assert response.status_code == 200
+    (hit,) = response.json()["items"]
+    assert hit["title"] == post["title"]
+    assert hit["title_highlight"] == "&lt;script&gt;alert(1)&lt;/script&gt; <mark>Xylophon</mark>"
+    assert "<img" not in hit["content_highlight"]
+    assert "&lt;img src=x onerror=alert(2)&gt; <mark>Xylophon</mark>" in hit["content_highlight"]
@@ -0,0 +1,160 @@
+"""
+Tests für den SKU-Cache (app/core/sku_cache.py) und GET /products/sku/{sku}
+"""
+
+import itertools
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import sku_cache as sku_cache_module
+from app.core.sku_cache import ChangeListener, SkuCache, sku_cache
+
+_skus = itertools.count(1)
+
+
+@pytest.fixture
+def product(client):
+    def create(**fields) -> dict:
+        body = {"sku": f"CACHE-{next(_skus):06d}", "name": "Cache-Test", "price": 5.0, "in_stock": True, **fields}
+        response = client.post("/api/v1/products/", json=body)
+        assert response.status_code == 201
+        return response.json()
+
+    return create
+
+
+def test_put_get_and_lru():
+    cache = SkuCache(max_entries=2)
+    for sku in ("a", "b"):
+        cache.put(sku, sku.encode(), cache.generation)
+    cache.get("a")
+
+    cache.put("c", b"c", cache.generation)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (b"a", b"c")
+
+
+def test_put_after_invalidation_is_dropped():
+    cache = SkuCache(max_entries=10)
+    # Request liest die Generation, dann die Datenbank ...
+    generation = cache.generation
+    # ... währenddessen ändert ein anderer Request ein Produkt
+    cache.invalidate("x")
+
+    cache.put("a", b"alt", generation)
+
+    assert cache.get("a") is None
+    cache.put("a", b"neu", cache.generation)
+    assert cache.get("a") == b"neu"
+
+
+def test_clear_drops_entries_and_pending_puts():
+    cache = SkuCache(max_entries=10)
+    cache.put("a", b"a", cache.generation)
+    generation = cache.generation
+
+    cache.clear()
+    cache.put("b", b"b", generation)
+
+    assert (cache.get("a"), cache.get("b")) == (None, None)
+    assert cache.status()["clears"] == 1
+
+
+def test_lookup_served_from_cache(client, product):
+    sku = product()["sku"]
+    first = client.get(f"/api/v1/products/sku/{sku}")
+    hits = sku_cache.hits
+
+    second = client.get(f"/api/v1/products/sku/{sku}")
+
+    assert second.json() == first.json()
+    assert sku_cache.hits == hits + 1
+    assert int(second.headers["X-DB-Queries"]) == 0
+
+
+def test_patch_invalidates_old_and_new_sku(client, product):
+    created = product()
+    old_sku, new_sku = created["sku"], f"{created['sku']}-NEU"
+    client.get(f"/api/v1/products/sku/{old_sku}")
+
+    response = client.patch(f"/api/v1/products/{created['id']}", json={"sku": new_sku, "price": 7.5})
+
+    assert response.status_code == 200
+    assert client.get(f"/api/v1/products/sku/{old_sku}").status_code == 404
+    assert client.get(f"/api/v1/products/sku/{new_sku}").json()["price"] == 7.5
+
+
+def test_delete_invalidates(client, product):
+    created = product()
+    client.get(f"/api/v1/products/sku/{created['sku']}")
+
+    assert client.delete(f"/api/v1/products/{created['id']}").status_code in (200, 204)
+
+    assert client.get(f"/api/v1/products/sku/{created['sku']}").status_code == 404
+
+
+def test_bulk_upsert_invalidates_updated(client, product):
+    created = product()
+    client.get(f"/api/v1/products/sku/{created['sku']}")
+    changed = {**{key: created[key] for key in ("sku", "name", "in_stock")}, "price": 42.0}
+
+    assert client.put("/api/v1/products/bulk", json=[changed]).json()["updated"] == 1
+
+    assert client.get(f"/api/v1/products/sku/{created['sku']}").json()["price"] == 42.0
+
+
+class FakeListener:
+    """Statt ChangeListener (braucht PostgreSQL): ``ready`` nach Belieben."""
+
+    def __init__(self, url, becomes_ready: bool):
+        self.ready = threading.Event()
+        self.becomes_ready = becomes_ready
+
+    def start(self):
+        if self.becomes_ready:
+            self.ready.set()
+
+    def stop(self):
+        pass
+
+    def join(self, timeout=None):
+        pass
+
+    def is_alive(self):
+        return False
+
+
+class PostgresEngine:
+    """Nur was ``start()`` von einer Engine braucht."""
+
+    dialect = SimpleNamespace(name="postgresql")
+    url = SimpleNamespace(render_as_string=lambda hide_password: "postgresql://")
+
+
+@pytest.mark.parametrize("becomes_ready", [True, False])
+def test_start_warms_only_after_listen(monkeypatch, becomes_ready):
+    warmed = []
+    monkeypatch.setattr(sku_cache_module, "ChangeListener", lambda url: FakeListener(url, becomes_ready))
+    monkeypatch.setattr(sku_cache_module, "warm", lambda engine, limit: warmed.append(limit) or 0)
+    monkeypatch.setattr(sku_cache_module, "LISTEN_READY_TIMEOUT_SECONDS", 0.01)
+    monkeypatch.setattr(sku_cache_module.settings, "SKU_CACHE_WARM_ENTRIES", 10)
+
+    sku_cache_module.start(PostgresEngine())
+    sku_cache_module.stop()
+
+    assert warmed == ([10] if becomes_ready else [])
+
+
+def test_listener_stops_and_joins(monkeypatch):
+    # SQLite kann kein LISTEN - der Listener versucht es in einer Schleife neu
+    listener = ChangeListener("sqlite://", reconnect_seconds=0.01)
+    monkeypatch.setattr(sku_cache_module, "_listener", listener)
+    listener.start()
+
+    sku_cache_module.stop()
+
+    assert not listener.is_alive()
+    assert sku_cache_module._listener is None